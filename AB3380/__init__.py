@@ -2,6 +2,13 @@
 # -*- coding: <utf-8> -*-
 
 import usb.core
+from PyApex.Constantes import AB3380_EEPROM_LAYOUT, AB3380_EEPROM_SIZE, AB3380_PID, \
+     AB3380_PTS_NB, AB3380_VID, AB3380_VR_GET_EEPROM_PARAMETERS, AB3380_VR_RESET_ALL, \
+     AB3380_VR_SET_EEPROM_PARAMETERS, AB3380_VR_SET_SWITCH1, AB3380_VR_SET_SWITCH2, \
+     AB3380_VR_SET_VOLTAGE1, AB3380_VR_SET_VOLTAGE2, ABXXXX_EP0_READ_ERROR, \
+     ABXXXX_EP0_WRITE_ERROR, ABXXXX_ERROR_BAD_HANDLE, ABXXXX_NO_EQUIPMENT_FOUND, \
+     APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, SIMU_AB3380_PID, SIMU_AB3380_VID
+from PyApex.Errors import ApexError
 
 
 class AB3380():
@@ -17,8 +24,6 @@ class AB3380():
         Constructor of AB3380 equipment.
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
         '''
-        from PyApex.Constantes import ABXXXX_NO_EQUIPMENT_FOUND, AB3380_PTS_NB
-        from PyApex.Errors import ApexError
         from sys import exit
         from math import fabs, sqrt
         
@@ -27,6 +32,8 @@ class AB3380():
         self.Device = None
         
         self.EEPromOK = False
+        self.EEPromChecksumOK = False
+        self.EEPromImage = None
         self.SerialNumber = "XX-3380-A-XXXXXX"     
         self.EEPromVersion = "0.0"
         
@@ -40,6 +47,9 @@ class AB3380():
             self.DAC[0].append(sqrt(fabs(self.Wavelength[i] - self.WlTransistion[0])) * 15000)
             self.DAC[1].append(sqrt(fabs(self.Wavelength[i] - self.WlTransistion[1])) * 15000)
         
+        self.__TableWavelength = None
+        self.__SequenceRunning = False
+        
         Devices = self.Find()
         if len(Devices) == 0:
             raise ApexError(ABXXXX_NO_EQUIPMENT_FOUND, "AB3380")
@@ -49,7 +59,6 @@ class AB3380():
         
 
     def Find(self):
-        from PyApex.Constantes import AB3380_VID, AB3380_PID
         Devices = []
         if not self.Simulation:
             for dev in usb.core.find(find_all = True, idVendor = AB3380_VID, idProduct = AB3380_PID):
@@ -64,8 +73,6 @@ class AB3380():
         Opens a connexion with an AB3380 equipment.
         This method is called by the constructor of AB3380 class if only 1 board is present
         '''
-        from PyApex.Constantes import ABXXXX_ERROR_BAD_HANDLE
-        from PyApex.Errors import ApexError
         from sys import exit         
         
         if self.Simulation:
@@ -99,7 +106,6 @@ class AB3380():
         '''
         Return values of VID and PID of AB3380 equipment
         '''
-        from PyApex.Constantes import SIMU_AB3380_VID, SIMU_AB3380_PID
         
         if self.Simulation:
             return [SIMU_AB3380_VID, SIMU_AB3380_PID]
@@ -111,8 +117,6 @@ class AB3380():
         '''
         Reset AB3380 equipment
         '''
-        from PyApex.Constantes import AB3380_VR_RESET_ALL, ABXXXX_EP0_WRITE_ERROR
-        from PyApex.Errors import ApexError
         from sys import exit
         
         if not self.Simulation:
@@ -129,9 +133,6 @@ class AB3380():
         Voltage is the binary value of the voltage (from 0 to 65535)
         Filter is the number of the filter 1 (default) or 2
         '''
-        from PyApex.Constantes import AB3380_VR_SET_VOLTAGE1, AB3380_VR_SET_VOLTAGE2, ABXXXX_EP0_WRITE_ERROR
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         from sys import exit
 
         if not isinstance(Voltage, (int, float)):
@@ -167,9 +168,6 @@ class AB3380():
         State is the binary state of the voltage ((0, 1) or (False, True))
         Filter is the number of the filter 1 (default) or 2
         '''
-        from PyApex.Constantes import AB3380_VR_SET_SWITCH1, AB3380_VR_SET_SWITCH2, ABXXXX_EP0_WRITE_ERROR
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         from sys import exit
 
         if not isinstance(State, (int, float, bool)):
@@ -204,9 +202,6 @@ class AB3380():
         Set Data into the EEPROM of AB3380
         Data is a bytes object to write into the EEProm
         '''
-        from PyApex.Constantes import AB3380_VR_SET_EEPROM_PARAMETERS, ABXXXX_EP0_WRITE_ERROR
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         from sys import exit
 
         if not isinstance(Data, bytes):
@@ -232,9 +227,6 @@ class AB3380():
         BytesNumber is the number of bytes to read from the EEProm
         Returns an array of the data bytes
         '''
-        from PyApex.Constantes import AB3380_VR_GET_EEPROM_PARAMETERS, ABXXXX_EP0_READ_ERROR
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         from sys import exit
 
         if not isinstance(BytesNumber, int):
@@ -257,109 +249,98 @@ class AB3380():
     def EEPromData2Parameters(self):
         '''
         Reads the data from the EEProm and converts these data into python variables
+        The checksum of the EEProm data is checked and EEPromChecksumOK is set
         '''
-        from PyApex.Constantes import AB3380_PTS_NB
-        from struct import unpack, calcsize
+        from PyApex import EEProm
         
-        Data = self.GetEEPromData(1200)
+        Data = self.GetEEPromData(AB3380_EEPROM_SIZE)
         
-        if Data == -1:
+        if isinstance(Data, int) and Data == -1:
             return False
         
-        self.SerialNumber = ""
-        for c in Data[:19]:
-            if c != 0:
-                self.SerialNumber += chr(c)
-        I0 = 20
-        
-        Temp = unpack('hh', Data[I0:I0 + calcsize('hh')])
-        self.EEPromVersion = str(Temp[0]) + "." + str(Temp[1])
-        I0 += calcsize('hh')
+        Record, self.EEPromChecksumOK = EEProm.Decode(Data, AB3380_EEPROM_LAYOUT)
+        self.EEPromImage = bytes(Data[:EEProm.Size(AB3380_EEPROM_LAYOUT)])
         
+        self.SerialNumber = EEProm.String(Record["sn"])
+        self.EEPromVersion = str(Record["version"][0]) + "." + str(Record["version"][1])
         self.EEPromOK = "3380" in self.SerialNumber and self.EEPromVersion == "0.0"
         
-        self.WlTransistion[0] = unpack('f', Data[I0:I0 + calcsize('f')])[0] / 1000.0
-        I0 += calcsize('f')
-        self.WlTransistion[1] = unpack('f', Data[I0:I0 + calcsize('f')])[0] / 1000.0
-        I0 += calcsize('f')
-            
-        self.Wavelength = []
-        for i in range(AB3380_PTS_NB):
-            Istart = I0 + i * calcsize('f')
-            Istop = Istart + calcsize('f')
-            self.Wavelength.append(unpack('f', Data[Istart:Istop])[0] / 1000.0)
-        
-        I0 = Istop
-        self.DAC[0] = []
-        for i in range(AB3380_PTS_NB):
-            Istart = I0 + i * calcsize('f')
-            Istop = Istart + calcsize('f')
-            self.DAC[0].append(int(unpack('f', Data[Istart:Istop])[0]))   
-        
-        I0 = Istop
-        self.DAC[1] = []
-        for i in range(AB3380_PTS_NB):
-            Istart = I0 + i * calcsize('f')
-            Istop = Istart + calcsize('f')
-            self.DAC[1].append(int(unpack('f', Data[Istart:Istop])[0]))
+        self.WlTransistion = (Record["wltransition"] / 1000.0).tolist()
+        self.Wavelength = (Record["wavelength"] / 1000.0).tolist()
+        self.DAC = [Record["dac"][0].astype(int).tolist(), Record["dac"][1].astype(int).tolist()]
+        self.BuildTable()
         
         return True
     
     
-    def Parameters2EEPromData(self):
+    def Parameters2EEPromData(self, Partial=True):
         '''
         Converts the python variables into binary data and writes these data to the EEProm
+        If Partial is True and the EEProm data are known (read or written before), the
+        data are not written when they have not changed
         '''
-        from PyApex.Constantes import AB3380_PTS_NB
-        from struct import pack, calcsize
+        from PyApex import EEProm
         
-        format = ""
-        for i in range(20):
-            format += 'c'
-        format += 'hhff'
-        for i in range(3):
-            for k in range(AB3380_PTS_NB):
-                format += 'f'
+        Record = EEProm.Empty(AB3380_EEPROM_LAYOUT)
+        Record["sn"] = self.SerialNumber[:20].encode("latin-1")
+        Record["version"] = [int(v) for v in self.EEPromVersion.split(".")[:2]]
+        Record["wltransition"] = [w * 1000.0 for w in self.WlTransistion]
+        Record["wavelength"] = [w * 1000.0 for w in self.Wavelength]
+        Record["dac"] = self.DAC
+        Image = EEProm.Encode(Record)
         
-        Data = bytes(calcsize(format))
-        
-        for i in range(20):
-            try:
-                Data[i] = (ord(self.SerialNumber[i]))
-            except:
-                pass
-        I0 = 20
-        
-        Temp = pack('hh', int(self.EEPromVersion[0]), int(self.EEPromVersion[2]))
-        for i in range(calcsize('hh')):
-            Data[I0 + i] = Temp[i]
-        I0 += calcsize('hh')
-        
-        Temp = pack('ff', self.WlTransistion[0], self.WlTransistion[1])
-        for i in range(calcsize('ff')):
-            Data[I0 + i] = Temp[i]    
-        I0 += calcsize('ff')
+        if Partial and self.EEPromImage is not None and \
+           len(EEProm.ChangedPages(self.EEPromImage, Image)) == 0:
+            return True
         
-        for i in range(AB3380_PTS_NB):
-            Temp = pack('f', self.Wavelength[i] * 1000.0)
-            for k in range(calcsize('f')):
-                Data[I0 + k] = Temp[k]
-            I0 += calcsize('f')
+        Result = self.SetEEPromData(Image)
+        if Result:
+            self.EEPromImage = Image
+        return Result
+
+    
+    def BuildTable(self):
+        '''
+        Builds the wavelength to DAC interpolation table of the 2 filters from the
+        calibration points (Wavelength and DAC). This method is called after the
+        reading of the EEProm and must be called after a change of these points
+        '''
+        import numpy as np
         
-        for i in range(AB3380_PTS_NB):
-            Temp = pack('f', self.DAC[0][i])
-            for k in range(calcsize('f')):
-                Data[I0 + k] = Temp[k]
-            I0 += calcsize('f')
+        Order = np.argsort(self.Wavelength)
+        self.__TableWavelength = np.asarray(self.Wavelength, dtype=np.float64)[Order]
+        self.__TableSlope = []
+        self.__TableOffset = []
+        for Filter in range(2):
+            DAC = np.asarray(self.DAC[Filter], dtype=np.float64)[Order]
+            Slope = np.diff(DAC) / np.diff(self.__TableWavelength)
+            self.__TableSlope.append(Slope)
+            self.__TableOffset.append(DAC[1:] - self.__TableWavelength[1:] * Slope)
+    
+    
+    def GetDACs(self, Wavelengths, Filter=1):
+        '''
+        Computes the switch states and the DAC codes of the selected filter for the
+        wavelengths Wavelengths (nm)
+        Wavelengths is a number or an array of wavelengths
+        Filter is the number of the filter : 1 (default) or 2
+        Returns a tuple (Switches, DACs) of NumPy arrays (bool and int)
+        '''
+        import numpy as np
         
-        for i in range(AB3380_PTS_NB):
-            Temp = pack('f', self.DAC[1][i])
-            for k in range(calcsize('f')):
-                Data[I0 + k] = Temp[k]
-            I0 += calcsize('f')
+        if Filter not in [1, 2]:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Filter")
+        if self.__TableWavelength is None:
+            self.BuildTable()
         
-        return self.SetEEPromData(Data)
-
+        Wavelengths = np.asarray(Wavelengths, dtype=np.float64)
+        Index = np.searchsorted(self.__TableWavelength, Wavelengths, side="left")
+        Index = np.clip(Index, 1, len(self.__TableWavelength) - 1) - 1
+        DACs = (Wavelengths * self.__TableSlope[Filter - 1][Index] + \
+                self.__TableOffset[Filter - 1][Index]).astype(int)
+        Switches = Wavelengths > self.WlTransistion[Filter - 1]
+        return Switches, DACs
+    
     
     def SetWavelength(self, WavelengthOrder, Filter=1):
         '''
@@ -367,8 +348,6 @@ class AB3380():
         WavelengthOrder is a float expressed in nm
         Filter is the number of the filter : 1 (default) or 2
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         from sys import exit
 
         if not isinstance(WavelengthOrder, (int, float)):
@@ -384,24 +363,106 @@ class AB3380():
             exit()
         
         if self.EEPromOK and not self.Simulation:
-            Error = []
-            for w in self.Wavelength:
-                Error.append((w - WavelengthOrder)**2)
-                
-            Index = Error.index(min(Error))
-            if self.Wavelength[Index] < WavelengthOrder:
-                Index += 1
-            
-            if WavelengthOrder > self.WlTransistion[Filter - 1]:
-                self.SetSwitch(True, Filter)
-            else:
-                self.SetSwitch(False, Filter)
-            
-            DWl = self.Wavelength[Index] - self.Wavelength[Index - 1]
-            DB = self.DAC[Filter - 1][Index] - self.DAC[Filter - 1][Index - 1]
-            C1 = DB / DWl
-            C0 = self.DAC[Filter - 1][Index] - self.Wavelength[Index] * C1 
-            self.SetVoltage(int(WavelengthOrder * C1 + C0), Filter)
+            Switches, DACs = self.GetDACs(WavelengthOrder, Filter)
+            self.SetSwitch(bool(Switches), Filter)
+            self.SetVoltage(int(DACs), Filter)
+    
+    
+    def SetWavelengths(self, Wavelengths, Filter=1):
+        '''
+        Sets the selected filter successively to the wavelengths of a tuning sequence
+        Wavelengths is an array of wavelengths expressed in nm
+        Filter is the number of the filter : 1 (default) or 2
+        The switch is only set when its state changes
+        Returns the NumPy array of the DAC codes of the sequence
+        '''
+        
+        if Filter not in [1, 2]:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Filter")
+        
+        Switches, DACs = self.GetDACs(Wavelengths, Filter)
+        Switches = Switches.ravel()
+        DACs = DACs.ravel()
+        if self.EEPromOK and not self.Simulation:
+            Switch = None
+            for State, DAC in zip(Switches.tolist(), DACs.tolist()):
+                if State != Switch:
+                    self.SetSwitch(State, Filter)
+                    Switch = State
+                self.SetVoltage(DAC, Filter)
+        return DACs
+    
+    
+    def BuildSequence(self, Wavelengths, Filter=1):
+        '''
+        Computes the tuning sequence of the selected filter for the wavelengths Wavelengths (nm)
+        Filter is the number of the filter : 1 (default) or 2
+        Returns a NumPy array of shape (N, 2) of the steps (switch state, DAC code)
+        '''
+        import numpy as np
+        
+        Switches, DACs = self.GetDACs(Wavelengths, Filter)
+        if np.any(DACs < 0) or np.any(DACs > 65535):
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Wavelengths")
+        return np.column_stack((Switches.ravel().astype(int), DACs.ravel()))
+    
+    
+    def RunSequence(self, Sequence, Filter=1, Dwell=0.0):
+        '''
+        Runs a tuning sequence of the selected filter
+        Sequence is an array of shape (N, 2) of the steps (switch state, DAC code) given by
+        BuildSequence
+        Filter is the number of the filter : 1 (default) or 2
+        Dwell is the time in seconds of each step. The steps are scheduled at fixed times
+        (step k starts Dwell * k seconds after the first one)
+        The switch and the voltage are only sent when they change
+        Returns the NumPy array of the timestamps (seconds since the epoch) at which the
+        steps were applied. The sequence can be stopped by StopSequence from another
+        thread: the timestamps of the applied steps are returned
+        '''
+        from time import perf_counter, sleep, time
+        import numpy as np
+        
+        if Filter not in [1, 2]:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Filter")
+        Sequence = np.asarray(Sequence, dtype=int).reshape(-1, 2)
+        VoltageRequest = AB3380_VR_SET_VOLTAGE2 if Filter == 2 else AB3380_VR_SET_VOLTAGE1
+        SwitchRequest = AB3380_VR_SET_SWITCH2 if Filter == 2 else AB3380_VR_SET_SWITCH1
+        
+        self.__SequenceRunning = True
+        Times = np.full(len(Sequence), np.nan)
+        Switch = None
+        Voltage = None
+        Start = perf_counter()
+        for Step, (State, DAC) in enumerate(Sequence.tolist()):
+            if not self.__SequenceRunning:
+                Times = Times[:Step]
+                break
+            Delay = Start + Step * Dwell - perf_counter()
+            if Delay > 0:
+                sleep(Delay)
+            if not self.Simulation:
+                try:
+                    if State != Switch:
+                        self.Device.ctrl_transfer(0x40, SwitchRequest, State, 0)
+                    if DAC != Voltage:
+                        self.Device.ctrl_transfer(0x40, VoltageRequest, DAC, 0)
+                except:
+                    self.__SequenceRunning = False
+                    raise ApexError(ABXXXX_EP0_WRITE_ERROR, VoltageRequest)
+            Switch = State
+            Voltage = DAC
+            Times[Step] = time()
+        
+        self.__SequenceRunning = False
+        return Times
+    
+    
+    def StopSequence(self):
+        '''
+        Stops a running tuning sequence (from another thread)
+        '''
+        self.__SequenceRunning = False
     
             
             
@@ -2,6 +2,17 @@
 # -*- coding: <utf-8> -*-
 
 import usb.core
+import threading
+from time import perf_counter, sleep, time
+from PyApex.Constantes import AB3510_EEPROM_LAYOUT, AB3510_EEPROM_PAGE, AB3510_EEPROM_SIZE, \
+     AB3510_EP_STREAM, AB3510_PID, AB3510_STREAM_BLOCK, AB3510_VID, \
+     AB3510_VR_GET_EEPROM_PARAMETERS, AB3510_VR_GET_SAMPLE, AB3510_VR_GET_TEMPERATURE, \
+     AB3510_VR_RESET_ALL, AB3510_VR_RESET_FIFO, AB3510_VR_SET_EEPROM_PARAMETERS, \
+     AB3510_VR_START_ACQ, AB3510_VR_STOP_ACQ, AB3510_VR_WRITE_EEPROM, ABXXXX_EP0_READ_ERROR, \
+     ABXXXX_EP0_WRITE_ERROR, ABXXXX_ERROR_BAD_HANDLE, ABXXXX_NO_EQUIPMENT_FOUND, \
+     APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, SIMU_AB3510_PID, \
+     SIMU_AB3510_TEMPERATURE, SIMU_AB3510_VID
+from PyApex.Errors import ApexError
 
 '''
 struct AB3510_EmbeddedData
@@ -25,10 +36,11 @@ class AB3510():
         this version can :
             - Get a sample from the four channels
             - Get the temperature value
-        this version cannot :
-            - Get samples in streaming mode
+            - Get samples in streaming mode (blocks of samples read on a bulk endpoint
+              or back-to-back control transfers, stored in a NumPy ring buffer)
+            - Convert raw samples into calibrated powers with a lookup table
     VERSION
-        1.0
+        1.2
     '''
 
     def __init__(self, Simulation=False):
@@ -36,9 +48,8 @@ class AB3510():
         Constructor of AB3510 equipment.
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
         '''
-        from PyApex.Constantes import ABXXXX_NO_EQUIPMENT_FOUND, AB3510_PTS_NB
-        from PyApex.Errors import ApexError
         from sys import exit
+        import numpy as np
         
         self.Simulation = Simulation
         self.Handle = 0
@@ -53,16 +64,25 @@ class AB3510():
         self.InternalData["ch2"] = {}
         self.InternalData["ch3"] = {}
         self.EEPromOK = False
+        self.EEPromChecksumOK = False
+        self.EEPromImage = None
         
+        self.__Stream = None
+        self.__StreamTimes = None
+        self.__StreamLock = threading.Lock()
+        self.__StreamThread = None
+        self.__Streaming = False
+        self.__StreamBulk = True
+        self.__StreamStats = {"Samples": 0, "Blocks": 0, "Dropped": 0, "Start": None, "Stop": None}
+        
+        # Calibration of the 4 channels: power lookup table indexed by the raw sample
+        # value, temperature and wavelength coefficients
+        self.PowerCalib = np.zeros((4, 2**14), dtype=np.float32)
+        self.TempCoeff = np.tile(np.array([1.0, 0.0], dtype=np.float32), (4, 1))
+        self.WaveCoeff = np.tile(np.array([1.0, 0.0], dtype=np.float32), (4, 1))
         self.Channels = []
         for i in range(0, 4):
-            EEPromCalib = []
-            PowerCalib = []
-            for k in range(AB3510_PTS_NB):
-                EEPromCalib.append([0.0, 0])
-            for k in range(0, 2**14):
-                PowerCalib.append(0.0)
-            self.Channels.append([PowerCalib, [1.0, 0.0], [1.0, 0.0]])
+            self.Channels.append([self.PowerCalib[i], self.TempCoeff[i], self.WaveCoeff[i]])
         
         Devices = self.Find()
         if len(Devices) == 0:
@@ -73,7 +93,6 @@ class AB3510():
         
 
     def Find(self):
-        from PyApex.Constantes import AB3510_VID, AB3510_PID
         Devices = []
         if not self.Simulation:
             for dev in usb.core.find(find_all = True, idVendor = AB3510_VID, idProduct = AB3510_PID):
@@ -88,8 +107,6 @@ class AB3510():
         Opens a connexion with an AB3510 equipment.
         This method is called by the constructor of AB3510 class if only 1 board is present
         '''
-        from PyApex.Constantes import ABXXXX_ERROR_BAD_HANDLE
-        from PyApex.Errors import ApexError
         from sys import exit         
         
         if self.Simulation:
@@ -115,6 +132,7 @@ class AB3510():
         '''
         Close connexion with AB3510 equipment
         '''
+        self.StopStreaming()
         self.Device = None
 
 
@@ -122,7 +140,6 @@ class AB3510():
         '''
         Return values of VID and PID of AB3510 equipment
         '''
-        from PyApex.Constantes import SIMU_AB3510_VID, SIMU_AB3510_PID
         
         if self.Simulation:
             return [SIMU_AB3510_VID, SIMU_AB3510_PID]
@@ -134,8 +151,6 @@ class AB3510():
         '''
         Reset AB3510 equipment
         '''
-        from PyApex.Constantes import AB3510_VR_RESET_ALL, ABXXXX_EP0_WRITE_ERROR
-        from PyApex.Errors import ApexError
         from sys import exit
         
         if not self.Simulation:
@@ -150,8 +165,6 @@ class AB3510():
         '''
         Get the temperature on AB3510 equipment in degree Celsius
         '''
-        from PyApex.Constantes import AB3510_VR_GET_TEMPERATURE, ABXXXX_EP0_READ_ERROR, SIMU_AB3510_TEMPERATURE
-        from PyApex.Errors import ApexError
         from random import randint
         from sys import exit
 
@@ -171,8 +184,7 @@ class AB3510():
         '''
         Get one sample from the 4 channels of AB3510
         '''
-        from PyApex.Constantes import AB3510_VR_GET_SAMPLE, ABXXXX_EP0_READ_ERROR
-        from PyApex.Errors import ApexError
+        from random import randint
         from sys import exit
 
         Samples = []
@@ -191,14 +203,218 @@ class AB3510():
         return Samples    
 
 
+    def BuildCalibration(self):
+        '''
+        Builds the power lookup table of the 4 channels from the calibration points
+        read in the EEProm (see EEPromData2Parameters). For each channel, the powers
+        of the 2**14 raw sample values are linearly interpolated between the points
+        '''
+        import numpy as np
+        
+        Raw = np.arange(2**14, dtype=np.float64)
+        for n in range(4):
+            ChKey = "ch" + str(n)
+            if "values" not in self.InternalData[ChKey]:
+                continue
+            Values = np.asarray(self.InternalData[ChKey]["values"], dtype=np.float64)
+            Powers = np.asarray(self.InternalData[ChKey]["powers"], dtype=np.float64)
+            Values, Index = np.unique(Values, return_index=True)
+            if len(Values) >= 2:
+                self.PowerCalib[n] = np.interp(Raw, Values, Powers[Index])
+            if "tempcoeff" in self.InternalData[ChKey]:
+                self.TempCoeff[n] = self.InternalData[ChKey]["tempcoeff"]
+            if "wavecoeff" in self.InternalData[ChKey]:
+                self.WaveCoeff[n] = self.InternalData[ChKey]["wavecoeff"]
+
+
+    def Calibrate(self, Samples):
+        '''
+        Converts raw samples into calibrated powers
+        Samples is an array of shape (N, 4) of raw sample values (GetSample, GetStreamData)
+        Returns an array of shape (N, 4) of float32 powers. The power of the lookup table
+        is corrected by the temperature and wavelength coefficients of each channel:
+        Power = (LUT * TempCoeff[0] + TempCoeff[1]) * WaveCoeff[0] + WaveCoeff[1]
+        '''
+        import numpy as np
+        
+        Samples = np.asarray(Samples).reshape(-1, 4)
+        Gain = self.TempCoeff[:, 0] * self.WaveCoeff[:, 0]
+        Offset = self.TempCoeff[:, 1] * self.WaveCoeff[:, 0] + self.WaveCoeff[:, 1]
+        return self.PowerCalib[np.arange(4), Samples] * Gain + Offset
+
+
+    def StartStreaming(self, BufferSize=1000000, Bulk=True, BlockSize=None):
+        '''
+        Starts the streaming acquisition of the 4 channels in a reader thread
+        The samples are stored in a NumPy ring buffer of shape (BufferSize, 4) and type uint16
+        If Bulk is True, the blocks of samples are read on the bulk endpoint of the board
+        (BlockSize bytes per block, 8 bytes per sample). Otherwise, the samples are read
+        with back-to-back control transfers (1 sample per block)
+        '''
+        from PyApex.RingBuffer import RingBuffer
+        import numpy as np
+        
+        if self.__Streaming:
+            return
+        if BlockSize is None:
+            BlockSize = AB3510_STREAM_BLOCK
+        if not isinstance(BlockSize, int) or BlockSize < 8 or BlockSize % 8 != 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "BlockSize")
+        
+        self.__Stream = RingBuffer(BufferSize, 4, np.uint16)
+        self.__StreamTimes = RingBuffer(BufferSize, 2)
+        self.__StreamStats = {"Samples": 0, "Blocks": 0, "Dropped": 0, "Start": perf_counter(), "Stop": None}
+        if Bulk and not self.Simulation:
+            try:
+                self.Device.ctrl_transfer(0x40, AB3510_VR_RESET_FIFO, 0, 0)
+                self.Device.ctrl_transfer(0x40, AB3510_VR_START_ACQ, 0, 0)
+            except:
+                raise ApexError(ABXXXX_EP0_WRITE_ERROR, AB3510_VR_START_ACQ)
+        
+        self.__Streaming = True
+        Target = self.__ReadBlocks if Bulk else self.__ReadSamples
+        self.__StreamBulk = Bulk
+        self.__StreamThread = threading.Thread(target=Target, args=(BlockSize,), daemon=True)
+        self.__StreamThread.start()
+
+
+    def StopStreaming(self):
+        '''
+        Stops the streaming acquisition
+        '''
+        
+        if not self.__Streaming:
+            return
+        self.__Streaming = False
+        self.__StreamThread.join()
+        self.__StreamThread = None
+        self.__StreamStats["Stop"] = perf_counter()
+        if self.__StreamBulk and not self.Simulation and self.Device is not None:
+            try:
+                self.Device.ctrl_transfer(0x40, AB3510_VR_STOP_ACQ, 0, 0)
+            except:
+                pass
+
+
+    def IsStreaming(self):
+        '''
+        Returns True if the streaming acquisition is running, False otherwise
+        '''
+        return self.__Streaming
+
+
+    def __AddBlock(self, Block):
+        import numpy as np
+        
+        Samples = np.frombuffer(Block, dtype="<u2")
+        Samples = (Samples[:len(Samples) - len(Samples) % 4] >> 2).reshape(-1, 4)
+        with self.__StreamLock:
+            self.__Stream.Extend(Samples)
+            self.__StreamStats["Samples"] += len(Samples)
+            self.__StreamStats["Blocks"] += 1
+            self.__StreamTimes.Append((time(), self.__StreamStats["Samples"]))
+
+
+    def __ReadBlocks(self, BlockSize):
+        import numpy as np
+        
+        while self.__Streaming:
+            if self.Simulation:
+                sleep(0.001)
+                Block = np.random.randint(0, 65536, BlockSize // 2, dtype="<u2").tobytes()
+            else:
+                try:
+                    Block = self.Device.read(AB3510_EP_STREAM, BlockSize, 100)
+                except usb.core.USBError:
+                    self.__StreamStats["Dropped"] += 1
+                    continue
+            if len(Block) != BlockSize:
+                self.__StreamStats["Dropped"] += 1
+                if len(Block) < 8:
+                    continue
+            self.__AddBlock(bytes(Block))
+
+
+    def __ReadSamples(self, BlockSize):
+        import numpy as np
+        
+        while self.__Streaming:
+            if self.Simulation:
+                sleep(0.0001)
+                Block = np.random.randint(0, 65536, 4, dtype="<u2").tobytes()
+            else:
+                try:
+                    Block = self.Device.ctrl_transfer(0xC0, AB3510_VR_GET_SAMPLE, 0, 0, 8)
+                except usb.core.USBError:
+                    self.__StreamStats["Dropped"] += 1
+                    continue
+            if len(Block) != 8:
+                self.__StreamStats["Dropped"] += 1
+                continue
+            self.__AddBlock(bytes(Block))
+
+
+    def GetStreamData(self, Number=None):
+        '''
+        Returns the last 'Number' samples of the streaming acquisition (all the stored
+        samples if Number is None) in a NumPy array of shape (N, 4) and type uint16
+        '''
+        import numpy as np
+        
+        if self.__Stream is None:
+            return np.zeros((0, 4), dtype=np.uint16)
+        return self.__Stream.GetData(Number)
+
+
+    def GetStreamTimedData(self, Number=None):
+        '''
+        Returns the last 'Number' samples of the streaming acquisition (all the stored
+        samples if Number is None) with their timestamps in a tuple (Times, Samples):
+            - Times is an array of shape (N,) of timestamps in seconds since the epoch
+            - Samples is an array of shape (N, 4) and type uint16
+        The reception time of each block of samples is recorded. The timestamps of the
+        samples of a block are interpolated between the reception times of the previous
+        block and of the block
+        '''
+        import numpy as np
+        
+        if self.__Stream is None:
+            return np.zeros(0), np.zeros((0, 4), dtype=np.uint16)
+        with self.__StreamLock:
+            Samples = self.__Stream.GetData(Number)
+            Blocks = self.__StreamTimes.GetData()
+            Count = self.__StreamStats["Samples"]
+        Index = np.arange(Count - len(Samples) + 1, Count + 1, dtype=np.float64)
+        return np.interp(Index, Blocks[:, 1], Blocks[:, 0]), Samples
+
+
+    def GetStreamStats(self):
+        '''
+        Returns a dictionary of statistics of the streaming acquisition:
+            - "Samples": number of acquired samples
+            - "Blocks": number of acquired blocks
+            - "Dropped": number of dropped blocks (transfer errors and incomplete blocks)
+            - "Lost": number of samples overwritten in the ring buffer
+            - "Rate": achieved rate in samples per second
+        '''
+        Stats = self.__StreamStats
+        Rate = None
+        if Stats["Start"] is not None:
+            Stop = Stats["Stop"] if Stats["Stop"] is not None else perf_counter()
+            if Stop > Stats["Start"]:
+                Rate = Stats["Samples"] / (Stop - Stats["Start"])
+        Lost = 0
+        if self.__Stream is not None:
+            Lost = max(0, self.__Stream.GetCount() - self.__Stream.GetSize())
+        return {"Samples": Stats["Samples"], "Blocks": Stats["Blocks"], "Dropped": Stats["Dropped"],
+                "Lost": Lost, "Rate": Rate}
+
+
     def SetEEPromData(self, Data):
         '''
         Set Data into the EEPROM of AB3510
         Data is a bytes object to write into the EEProm
         '''
-        from PyApex.Constantes import AB3510_VR_SET_EEPROM_PARAMETERS, ABXXXX_EP0_WRITE_ERROR,\
-             APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         from sys import exit
 
         if not isinstance(Data, (bytes, bytearray)):
@@ -239,9 +455,6 @@ class AB3510():
         BytesNumber is the number of bytes to read from the EEProm
         Returns an array of the data bytes
         '''
-        from PyApex.Constantes import AB3510_VR_GET_EEPROM_PARAMETERS, ABXXXX_EP0_READ_ERROR,\
-             APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         from sys import exit
 
         if not isinstance(BytesNumber, int):
@@ -264,128 +477,77 @@ class AB3510():
     def EEPromData2Parameters(self):
         '''
         Reads the data from the EEProm and converts these data into python variables
+        The checksum of the EEProm data is checked and EEPromChecksumOK is set
         '''
-        from PyApex.Constantes import AB3510_PTS_NB
-        from struct import unpack, calcsize
+        from PyApex import EEProm
         
-        Data = self.GetEEPromData(3500)
+        Data = self.GetEEPromData(AB3510_EEPROM_SIZE)
         
-        if Data == -1:
+        if isinstance(Data, int) and Data == -1:
             return False
         
-        self.InternalData["sn"] = ""
-        for c in Data[:20]:
-            if c != 0:
-                self.InternalData["sn"] += chr(c)
-        I0 = 20
-        
-        self.InternalData["firmware"] = ""
-        for c in Data[I0:I0 + 7]:
-            if c != 0:
-                self.InternalData["firmware"] += chr(c)
-        I0 += 7
-        
-        self.InternalData["hardware"] = ""
-        for c in Data[I0:I0 + 7]:
-            if c != 0:
-                self.InternalData["hardware"] += chr(c)
-        I0 += 7
+        Record, self.EEPromChecksumOK = EEProm.Decode(Data, AB3510_EEPROM_LAYOUT)
+        self.EEPromImage = bytes(Data[:EEProm.Size(AB3510_EEPROM_LAYOUT)])
         
+        self.InternalData["sn"] = EEProm.String(Record["sn"])
+        self.InternalData["firmware"] = EEProm.String(Record["firmware"])
+        self.InternalData["hardware"] = EEProm.String(Record["hardware"])
         self.EEPromOK = "3510" in self.InternalData["sn"] and self.InternalData["firmware"] == "1.0"
         
         for n in range(4):
             ChKey = "ch" + str(n)
-            
-            self.InternalData[ChKey]["powers"] = []
-            for i in range(AB3510_PTS_NB):
-                Istart = I0 + i * calcsize('f')
-                Istop = Istart + calcsize('f')
-                self.InternalData[ChKey]["powers"].append(unpack('f', Data[Istart:Istop])[0])
-            I0 = Istop
-            
-            self.InternalData[ChKey]["values"] = []
-            for i in range(AB3510_PTS_NB):
-                Istart = I0 + i * calcsize('h')
-                Istop = Istart + calcsize('h')
-                self.InternalData[ChKey]["values"].append(unpack('h', Data[Istart:Istop])[0])
-            I0 = Istop
-            
-            self.InternalData[ChKey]["tempcoeff"] = []
-            self.InternalData[ChKey]["tempcoeff"].append(unpack('f', Data[I0:I0 + calcsize('f')])[0])
-            I0 += calcsize('f')
-            self.InternalData[ChKey]["tempcoeff"].append(unpack('f', Data[I0:I0 + calcsize('f')])[0])
-            I0 += calcsize('f')
-            self.InternalData[ChKey]["wavecoeff"] = []
-            self.InternalData[ChKey]["wavecoeff"].append(unpack('f', Data[I0:I0 + calcsize('f')])[0])
-            I0 += calcsize('f')
-            self.InternalData[ChKey]["wavecoeff"].append(unpack('f', Data[I0:I0 + calcsize('f')])[0])
-            I0 += calcsize('f')
+            for Field in ["powers", "values", "tempcoeff", "wavecoeff"]:
+                self.InternalData[ChKey][Field] = Record["ch"][Field][n].tolist()
         
+        self.BuildCalibration()
         return True
     
     
-    def Parameters2EEPromData(self):
+    def Parameters2EEPromData(self, Partial=False):
         '''
         Converts the python variables into binary data and writes these data to the EEProm
+        By default, the whole EEProm image is written (AB3510_VR_SET_EEPROM_PARAMETERS)
+        If Partial is True and the EEProm data are known (read or written before), only
+        the pages of AB3510_EEPROM_PAGE bytes which have changed are written with the
+        AB3510_VR_WRITE_EEPROM request (address in wValue). This page protocol is not
+        documented by the firmware: use it only with a board on which it was checked
         '''
-        from PyApex.Constantes import AB3510_PTS_NB
-        from struct import pack, calcsize
-        
-        format = ""
-        for i in range(20 + 6 + 6):
-            format += 'c'
-        for i in range(4):
-            for k in range(AB3510_PTS_NB):
-                format += 'fh'
-            format += 'ffff'
+        from PyApex import EEProm
         
-        Data = bytearray(bytes(calcsize(format)))
+        Record = EEProm.Empty(AB3510_EEPROM_LAYOUT)
+        Record["sn"] = self.InternalData["sn"][:20].encode("latin-1")
+        Record["firmware"] = self.InternalData["firmware"][:7].encode("latin-1")
+        Record["hardware"] = self.InternalData["hardware"][:7].encode("latin-1")
+        for n in range(4):
+            ChKey = "ch" + str(n)
+            for Field in ["powers", "values", "tempcoeff", "wavecoeff"]:
+                if Field in self.InternalData[ChKey]:
+                    Record["ch"][Field][n] = self.InternalData[ChKey][Field]
+        Image = EEProm.Encode(Record)
         
-        for i in range(20):
-            try:
-                Data[i] = (ord(self.InternalData["sn"][i]))
-            except:
-                pass
-        I0 = 20
+        if Partial and self.EEPromImage is not None and len(self.EEPromImage) == len(Image):
+            Pages = EEProm.ChangedPages(self.EEPromImage, Image, AB3510_EEPROM_PAGE)
+            Result = self.__WriteEEPromPages(Image, Pages)
+        else:
+            Result = self.SetEEPromData(Image)
         
-        for i in range(6):
-            try:
-                Data[I0 + i] = (ord(self.InternalData["firmware"][i]))
-            except:
-                pass
-        I0 += 6
+        if Result:
+            self.EEPromImage = Image
+        return Result
+    
+    
+    def __WriteEEPromPages(self, Image, Pages):
+        '''
+        Writes the pages Pages of the EEProm image Image at their address
+        '''
         
-        for i in range(6):
+        if self.Simulation:
+            return True
+        for Page in Pages:
+            Address = Page * AB3510_EEPROM_PAGE
             try:
-                Data[I0 + i] = (ord(self.InternalData["hardware"][i]))
+                self.Device.ctrl_transfer(0x40, AB3510_VR_WRITE_EEPROM, Address, 0,
+                                          Image[Address:Address + AB3510_EEPROM_PAGE])
             except:
-                pass
-        I0 += 6
-        
-        for n in range(4):
-            ChKey = "ch" + str(n)
-            
-            for i in range(AB3510_PTS_NB):
-                Temp = pack('f', self.InternalData[ChKey]["powers"][i])
-                for k in range(calcsize('f')):
-                    Data[I0 + k] = Temp[k]
-                I0 += calcsize('f')
-            
-            for i in range(AB3510_PTS_NB):
-                Temp = pack('h', self.InternalData[ChKey]["values"][i])
-                for k in range(calcsize('h')):
-                    Data[I0 + k] = Temp[k]
-                I0 += calcsize('h')
-            
-            Temp = pack('ff', self.InternalData[ChKey]["tempcoeff"][0], self.InternalData[ChKey]["tempcoeff"][1])
-            for i in range(calcsize('ff')):
-                Data[I0 + i] = Temp[i]    
-            I0 += calcsize('ff')
-            
-            Temp = pack('ff', self.InternalData[ChKey]["wavecoeff"][0], self.InternalData[ChKey]["wavecoeff"][1])
-            for i in range(calcsize('ff')):
-                Data[I0 + i] = Temp[i]    
-            I0 += calcsize('ff')
-        
-        return self.SetEEPromData(Data)
-
+                raise ApexError(ABXXXX_EP0_WRITE_ERROR, AB3510_VR_WRITE_EEPROM)
+        return True
@@ -1,8 +1,16 @@
 from PyApex.Common import Send, Receive
+from PyApex.Constantes import AP1000_ATT_ATTMAX, AP1000_ATT_ATTMIN, AP1000_ATT_CHNUMBER, \
+     APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, APXXXX_ERROR_VARIABLE_NOT_DEFINED
+from PyApex.Errors import ApexError
 
 
 class Attenuator():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidUnits = ("db", "%")
+
+    __slots__ = ("__Connexion", "__Simulation", "__SlotNumber", "__Unit", "__Attenuation")
+
     def __init__(self, Equipment, SlotNumber=1, Simulation=False):
         '''
         Constructor of a ATT (Attenuator) equipment.
@@ -15,7 +23,6 @@ class Attenuator():
         self.__SlotNumber = SlotNumber
         self.__Unit = "dB"
         self.__Attenuation = 0
-        self.__ValidUnits = ["db", "%"]
 
 
     def __str__(self):
@@ -30,8 +37,6 @@ class Attenuator():
         Internal use only
         Convert a dB attenuation in % or a % attenuation in dB
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_VALUE, APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         from math import log10 as log
         
         if self.__Unit.lower() == "db":
@@ -54,8 +59,6 @@ class Attenuator():
         Internal use only
         Convert a dB attenuation in % or a % attenuation in dB
         '''
-        from PyApex.Constantes import APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         
         if self.__Unit.lower() == "%":
             return 10**(- Attenuation / 10)
@@ -80,9 +83,6 @@ class Attenuator():
         Attenuation is expressed in the unit defined by the GetUnit() method
         ChNumber is the channel number : 1 (default) or 2
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_ATT_ATTMIN, AP1000_ATT_ATTMAX, AP1000_ATT_CHNUMBER
-        from PyApex.Errors import ApexError
         
         try:
             Attenuation = float(Attenuation)
@@ -121,9 +121,6 @@ class Attenuator():
         The return attenuation is expressed in the unit defined by the GetUnit() method
         ChNumber is the channel number : 1 (default) or 2
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_ATT_CHNUMBER, SimuATT_Attenuation
-        from PyApex.Errors import ApexError
         
         try:
             ChNumber = int(ChNumber)
@@ -151,8 +148,6 @@ class Attenuator():
         Set the attenuation unit of the ATT equipment
         Unit is a string which could be "dB" for logaritmic or "%" for linear power
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -1,10 +1,22 @@
 
 
 from PyApex.Common import Send, Receive
+from PyApex.Constantes import AP1000_DFB_CBAND, AP1000_DFB_FRMAX, AP1000_DFB_FRMIN, \
+     AP1000_DFB_LBAND, AP1000_DFB_OBAND, AP1000_DFB_POWMAX, AP1000_DFB_POWMIN, \
+     AP1000_DFB_WLMAX, AP1000_DFB_WLMIN, AP1000_ERROR_SLOT_TYPE_NOT_DEFINED, \
+     APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, \
+     APXXXX_ERROR_VARIABLE_NOT_DEFINED, SimuDFB_SlotID, VACCUM_LIGHT_SPEED
+from PyApex.Errors import ApexError
 
 
 class DfbLaser():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidUnits = ("dbm", "mw")
+
+    __slots__ = ("__Equipment", "__Connexion", "__SlotNumber", "__Simulation", "__Type",
+                 "__Unit", "__Wavelength", "__Power", "__Status")
+
     def __init__(self, Equipment, SlotNumber, Simulation=False):
         '''
         Constructor of a DFB (Distributed FeedBack Laser Source) equipment.
@@ -12,6 +24,7 @@ class DfbLaser():
         SlotNumber is the number of the slot used by the TLS
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
         '''
+        self.__Equipment = Equipment
         self.__Connexion = Equipment.Connexion
         self.__SlotNumber = SlotNumber
         self.__Simulation = Simulation
@@ -20,7 +33,6 @@ class DfbLaser():
         self.__Wavelength = 1550
         self.__Power = 0
         self.__Status = "OFF"
-        self.__ValidUnits = ["dbm", "mw"]
 
 
     def __str__(self):
@@ -45,17 +57,16 @@ class DfbLaser():
         return 2 for a L band Laser
         return 5 for a O band Laser
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_TYPE_NOT_DEFINED
-        from PyApex.Constantes import SimuDFB_SlotID, AP1000_DFB_CBAND, AP1000_DFB_LBAND, AP1000_DFB_OBAND
-        from PyApex.Errors import ApexError
         import re
         
         if self.__Simulation:
             ID = SimuDFB_SlotID
         else:
-            Command = "SLT[" + str(self.__SlotNumber).zfill(2) + "]:IDN?\n"
-            Send(self.__Connexion, Command)
-            ID = Receive(self.__Connexion)
+            ID = self.__Equipment.Inventory().get(self.__SlotNumber, {}).get("ID")
+            if ID is None:
+                Command = "SLT[" + str(self.__SlotNumber).zfill(2) + "]:IDN?\n"
+                Send(self.__Connexion, Command)
+                ID = Receive(self.__Connexion)
 
         if re.findall(str(AP1000_DFB_CBAND), ID.split("/")[1]) != []:
             return 0
@@ -74,8 +85,6 @@ class DfbLaser():
         Internal use only
         Convert a dBm power in mW or a mW power in dBm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_VALUE, APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         from math import log10 as log
         
         if self.__Unit.lower() == "dbm":
@@ -100,8 +109,6 @@ class DfbLaser():
         Internal use only
         Convert a dBm power in mW or a mW power in dBm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         
         if self.__Unit.lower() == "mw":
             return 10**(Power / 10)
@@ -117,9 +124,6 @@ class DfbLaser():
         Set output power of the DFB equipment
         Power is expressed in the unit defined by the GetUnit() method
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_DFB_POWMIN, AP1000_DFB_POWMAX
-        from PyApex.Errors import ApexError
         
         try:
             Power = float(Power)
@@ -166,8 +170,6 @@ class DfbLaser():
         Set the power unit of the DFB equipment
         Unit is a string which could be "dBm" for logaritmic or "mW" for linear power
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -235,9 +237,6 @@ class DfbLaser():
         Set wavelength of the DFB equipment
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_DFB_WLMIN, AP1000_DFB_WLMAX
-        from PyApex.Errors import ApexError
         
         try:
             Wavelength = float(Wavelength)
@@ -268,7 +267,6 @@ class DfbLaser():
         Get wavelength of the DFB equipment
         The return wavelength is expressed in nm
         '''
-        from PyApex.Constantes import AP1000_DFB_WLMIN, AP1000_DFB_WLMAX
         from random import random
         
         if not self.__Simulation:
@@ -284,9 +282,6 @@ class DfbLaser():
         Set frequency of the DFB equipment
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED, AP1000_DFB_FRMIN, AP1000_DFB_FRMAX
-        from PyApex.Errors import ApexError
         
         try:
             Frequency = float(Frequency)
@@ -312,7 +307,6 @@ class DfbLaser():
         Get frequency of the DFB equipment
         The return frequency is expressed in GHz
         '''
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED
             
         Wavelength = self.GetWavelength()
         return VACCUM_LIGHT_SPEED / Wavelength
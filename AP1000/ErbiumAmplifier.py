@@ -1,8 +1,20 @@
 from PyApex.Common import Send, Receive
+from PyApex.Constantes import AP1000_EFA_IPMAX, AP1000_ERROR_SLOT_TYPE_NOT_DEFINED, \
+     APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, SimuEFA_InPower, \
+     SimuEFA_InVoltage, SimuEFA_OutPower, SimuEFA_OutVoltage, SimuEFA_SlotID
+from PyApex.Errors import ApexError
 
 
 class ErbiumAmplifier():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidUnits = ("dbm", "mw")
+    __ValidGainUnits = ("db", "%")
+
+    __slots__ = ("__Equipment", "__Connexion", "__Simulation", "__SlotNumber", "__Status",
+                 "__Type", "__Unit", "__GainUnit", "__Wavelength", "__Amplification",
+                 "__IPump", "__Mode", "__Setpoint")
+
     def __init__(self, Equipment, SlotNumber, Simulation=False):
         '''
         Constructor of a EFA (Erbium Amplifier) equipment.
@@ -10,6 +22,7 @@ class ErbiumAmplifier():
         SlotNumber is the number of the slot used by the EFA
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
         '''
+        self.__Equipment = Equipment
         self.__Connexion = Equipment.Connexion
         self.__Simulation = Simulation
         self.__SlotNumber = SlotNumber
@@ -20,8 +33,6 @@ class ErbiumAmplifier():
         self.__Wavelength = 1550
         self.__Amplification = 0
         self.__IPump = 0
-        self.__ValidUnits = ["dbm", "mw"]
-        self.__ValidGainUnits = ["db", "%"]
         self.__Mode = 0
         self.__Setpoint = [0.0, 0.0]
 
@@ -57,17 +68,16 @@ class ErbiumAmplifier():
             - "In-Line" for In-Line
             - "Pre-Amplifier" for Pre-Ampli
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_TYPE_NOT_DEFINED
-        from PyApex.Constantes import SimuEFA_SlotID
-        from PyApex.Errors import ApexError
         import re
         
         if self.__Simulation:
             ID = SimuEFA_SlotID
         else:
-            Command = "SLT[" + str(self.__SlotNumber).zfill(2) + "]:IDN?\n"
-            Send(self.__Connexion, Command)
-            ID = Receive(self.__Connexion)
+            ID = self.__Equipment.Inventory().get(self.__SlotNumber, {}).get("ID")
+            if ID is None:
+                Command = "SLT[" + str(self.__SlotNumber).zfill(2) + "]:IDN?\n"
+                Send(self.__Connexion, Command)
+                ID = Receive(self.__Connexion)
         
         if re.findall("A", ID.split("/")[2].split("-")[2]) != []:
             if type.lower() == "c":
@@ -104,8 +114,6 @@ class ErbiumAmplifier():
             - "gain" or 2, the function converts a gain in dB
         Value is the value to convert
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_VALUE, APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         from math import log10 as log
         
         Type = str(Type).lower()
@@ -137,8 +145,6 @@ class ErbiumAmplifier():
             - "gain" or 2, the function converts a gain in % if needed
         Value is the value to convert
         '''
-        from PyApex.Constantes import APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         
         Type = str(Type).lower()
         if Type == "gain" or Type == 2:
@@ -161,7 +167,6 @@ class ErbiumAmplifier():
         The return voltage is expressed in binary unit (V = 2.048 / 4096)
         !!! FOR CALIBRATION ONLY !!!
         '''
-        from PyApex.Constantes import SimuEFA_InVoltage
         
         if self.__Simulation:
             InVoltage = SimuEFA_InVoltage
@@ -179,7 +184,6 @@ class ErbiumAmplifier():
         The return voltage is expressed in binary unit (V = 2.048 / 4096)
         !!! FOR CALIBRATION ONLY !!!
         '''
-        from PyApex.Constantes import SimuEFA_OutVoltage
         
         if self.__Simulation:
             OutVoltage = SimuEFA_OutVoltage
@@ -227,9 +231,6 @@ class ErbiumAmplifier():
         Set laser pump current of the EFA equipment
         IPump is expressed in mA
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_EFA_IPMAX
-        from PyApex.Errors import ApexError
         
         try:
             IPump = float(IPump)
@@ -255,7 +256,6 @@ class ErbiumAmplifier():
         Get input power of the EFA equipment
         The return power is expressed in the unit defined by the GetUnit() method
         '''
-        from PyApex.Constantes import SimuEFA_InPower
         
         if self.__Simulation:
             Power = SimuEFA_InPower
@@ -272,7 +272,6 @@ class ErbiumAmplifier():
         Get output power of the EFA equipment
         The return power is expressed in the unit defined by the GetUnit() method
         '''
-        from PyApex.Constantes import SimuEFA_OutPower
         
         if self.__Simulation:
             Power = SimuEFA_OutPower
@@ -289,8 +288,6 @@ class ErbiumAmplifier():
         Sets the power unit of the EFA equipment
         Unit is a string which could be "dBm" for logaritmic or "mW" for linear power
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -315,8 +312,6 @@ class ErbiumAmplifier():
         Sets the gain unit of the EFA equipment
         Unit is a string which could be "dB" for logaritmic or "%" for linear gain
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -351,8 +346,6 @@ class ErbiumAmplifier():
         If Mode = "gain", SetPoint is expressed in the unit defined by the GetGainUnit() method
         If Mode = "manual", the SetPoint value has no effect
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         Command = "AMP[" + str(self.__SlotNumber).zfill(2) + "]:"
         if isinstance(Mode, str):
@@ -426,8 +419,6 @@ class ErbiumAmplifier():
         in the constant output power mode
         SetPoint is a value expressed in the unit defined by the GetUnit() method 
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Power = float(Power)
@@ -475,8 +466,6 @@ class ErbiumAmplifier():
         in the constant gain mode
         SetPoint is a value expressed in the unit defined by the GetGainUnit() method 
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Gain = float(Gain)
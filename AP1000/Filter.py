@@ -1,8 +1,17 @@
 from PyApex.Common import Send, Receive
+from PyApex.Constantes import AP1000_FIL_FRMAX, AP1000_FIL_FRMIN, AP1000_FIL_SPEEDMAX, \
+     AP1000_FIL_SPEEDMIN, AP1000_FIL_WLMAX, AP1000_FIL_WLMIN, APXXXX_ERROR_ARGUMENT_TYPE, \
+     APXXXX_ERROR_ARGUMENT_VALUE, Celerity
+from PyApex.Errors import ApexError
 
 
 class Filter():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidUnits = ("nm", "ghz")
+
+    __slots__ = ("__Connexion", "__Simulation", "__SlotNumber", "__Unit", "__Wavelength")
+
     def __init__(self, Equipment, SlotNumber=1, Simulation=False):
         '''
         Constructor of a FIL (Filter) equipment.
@@ -16,7 +25,6 @@ class Filter():
         self.__SlotNumber = SlotNumber
         self.__Unit = "nm"
         self.__Wavelength = 1550.0
-        self.__ValidUnits = ["nm", "ghz"]
 
 
     def __str__(self):
@@ -39,9 +47,6 @@ class Filter():
         Internal use only
         Convert a wavelength (nm) in frequency (GHz) or a frequency (GHz) in wavelength (nm)
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_VALUE, APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Constantes import Celerity
-        from PyApex.Errors import ApexError
         
         return Celerity / Value
 
@@ -51,9 +56,6 @@ class Filter():
         Set Wavelength of the FIL equipment
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_FIL_WLMIN, AP1000_FIL_WLMAX
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -91,8 +93,6 @@ class Filter():
         Set Frequency of the FIL equipment
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Frequency, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Frequency")
@@ -132,8 +132,6 @@ class Filter():
         Get the wavelength limits (min and max) of the FIL equipment
         Returns the limits in nm in a list [min, max]
         '''
-        from PyApex.Constantes import AP1000_FIL_WLMIN, AP1000_FIL_WLMAX
-        from PyApex.Errors import ApexError
         
         if self.__Simulation:
             WavelengthMin = AP1000_FIL_WLMIN
@@ -154,8 +152,6 @@ class Filter():
         Get the frequency limits (min and max) of the FIL equipment
         Returns the limits in GHz in a list [min, max]
         '''
-        from PyApex.Constantes import AP1000_FIL_FRMIN, AP1000_FIL_FRMAX
-        from PyApex.Errors import ApexError
         
         if self.__Simulation:
             FrequencyMin = AP1000_FIL_FRMIN
@@ -176,8 +172,6 @@ class Filter():
         Set the start wavelength for a sweep
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -199,7 +193,6 @@ class Filter():
         Get the start wavelength for a sweep
         Returns the wavelength in nm
         '''
-        from PyApex.Constantes import AP1000_FIL_WLMIN
         
         if self.__Simulation:
             Wavelength = AP1000_FIL_WLMIN
@@ -216,8 +209,6 @@ class Filter():
         Set the stop wavelength for a sweep
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -239,7 +230,6 @@ class Filter():
         Get the stop wavelength for a sweep
         Returns the wavelength in nm
         '''
-        from PyApex.Constantes import AP1000_FIL_WLMAX
         
         if self.__Simulation:
             Wavelength = AP1000_FIL_WLMAX
@@ -256,9 +246,6 @@ class Filter():
         Set the speed for a sweep
         SweepSpeed is expressed in nm/s
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_FIL_SPEEDMIN, AP1000_FIL_SPEEDMAX
-        from PyApex.Errors import ApexError
         
         if not isinstance(SweepSpeed, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "SweepSpeed")
@@ -279,7 +266,6 @@ class Filter():
         Get the speed for a sweep
         Returns the speed in nm/s
         '''
-        from PyApex.Constantes import AP1000_FIL_SPEEDMIN
         
         if self.__Simulation:
             Speed = AP1000_FIL_SPEEDMIN
@@ -331,8 +317,6 @@ class Filter():
         Set the unit of the FIL equipment
         Unit is a string which could be "nm" for wavelength or "GHz" for frequency
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Unit, str):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Unit")
@@ -357,8 +341,6 @@ class Filter():
         Voltage is expressed in binary value (between 0 and 65535)
         Filter is the number of the filter 1 (default) or 2
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Voltage, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Voltage")
@@ -389,8 +371,6 @@ class Filter():
         Value is a binary value (True or False)
         Filter is the number of the filter 1 (default) or 2
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Value, bool):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Value")
@@ -1,10 +1,20 @@
 
 
 from PyApex.Common import Send, Receive, ReceiveUntilChar
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, Celerity, VACCUM_LIGHT_SPEED
+from PyApex.Errors import ApexError
 
 
 class OSA():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidYUnits = ("dbm", "mw")
+    __ValidXUnits = ("nm", "ghz")
+
+    __slots__ = ("__Connexion", "__Simulation", "__PowSlotNumber", "__FilSlotNumber",
+                 "__Polarimeter", "__YUnit", "__XUnit", "__StartWavelength",
+                 "__StopWavelength", "__NbPoints")
+
     def __init__(self, Equipment, SlotNumber=1, Simulation=False):
         '''
         Constructor of an OSA (Optical Spectrum Analyzer) equipment.
@@ -24,8 +34,6 @@ class OSA():
         self.__StartWavelength = 1530
         self.__StopWavelength = 1560
         self.__NbPoints = 400
-        self.__ValidYUnits = ["dbm", "mw"]
-        self.__ValidXUnits = ["nm", "ghz"]
 
 
     def __str__(self):
@@ -45,8 +53,6 @@ class OSA():
         Sets the slot number of the Polarimeter or Power-Meter used for the O.S.A. module
         Slot is an integer representing the slot number
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Slot = int(Slot)
@@ -80,8 +86,6 @@ class OSA():
         Sets the slot number of the Filter used for the O.S.A. module
         Slot is an integer representing the slot number
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Slot = int(Slot)
@@ -115,8 +119,6 @@ class OSA():
         Set the x-axis unit of the OSA equipment
         Unit is a string which could be "nm" for wavelengths or "GHz" for Frequencies
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -124,7 +126,7 @@ class OSA():
             self.__Connexion.close()
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Unit")
         else:
-            if Unit.lower() in self.__ValidUnits:
+            if Unit.lower() in self.__ValidXUnits:
                 self.__XUnit = Unit
 
 
@@ -141,8 +143,6 @@ class OSA():
         Set the y-axis unit of the OSA equipment
         Unit is a string which could be "dBm" for logarithmic or "mW" for linear
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -150,7 +150,7 @@ class OSA():
             self.__Connexion.close()
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Unit")
         else:
-            if Unit.lower() in self.__ValidUnits:
+            if Unit.lower() in self.__ValidYUnits:
                 self.__YUnit = Unit
     
     
@@ -167,8 +167,6 @@ class OSA():
         Set the start wavelength of the OSA equipment
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Wavelength = float(Wavelength)
@@ -203,9 +201,6 @@ class OSA():
         Set the start frequency of the OSA equipment
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED
-        from PyApex.Errors import ApexError
         
         try:
             Frequency = float(Frequency)
@@ -235,8 +230,6 @@ class OSA():
         Set the stop wavelength of the OSA equipment
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Wavelength = float(Wavelength)
@@ -271,9 +264,6 @@ class OSA():
         Set the stop frequency of the OSA equipment
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED
-        from PyApex.Errors import ApexError
         
         try:
             Frequency = float(Frequency)
@@ -303,8 +293,6 @@ class OSA():
         Set the number of points of the OSA equipment
         NbPoints is an integer
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             NbPoints = int(NbPoints)
@@ -396,9 +384,6 @@ class OSA():
             - "S3" for the stokes parameter S3
             - "DOP" for the degree of polarization DOP
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import APXXXX_ERROR_VARIABLE_NOT_DEFINED, Celerity
-        from PyApex.Errors import ApexError
         from random import random
         
         try:
@@ -1,8 +1,13 @@
 from PyApex.Common import Send, Receive
+from PyApex.Constantes import AP1000_ERROR_SLOT_TYPE_NOT_DEFINED, SimuOSW_SlotID
+from PyApex.Errors import ApexError
 
 
 class OpticalSwitch():
 
+    __slots__ = ("__Equipment", "__Connexion", "__Simulation", "__SlotNumber", "__Type",
+                 "__Path")
+
     def __init__(self, Equipment, SlotNumber=1, Simulation=False):
         '''
         Constructor of a OSW (Optical Switch) equipment.
@@ -10,6 +15,7 @@ class OpticalSwitch():
         SlotNumber is the number of the slot used by the OSW
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
         '''
+        self.__Equipment = Equipment
         self.__Connexion = Equipment.Connexion
         self.__Simulation = Simulation
         self.__SlotNumber = SlotNumber
@@ -44,17 +50,16 @@ class OpticalSwitch():
             - "1X4" for 1X4
             - "1X8" for 1X8
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_TYPE_NOT_DEFINED
-        from PyApex.Constantes import SimuOSW_SlotID
-        from PyApex.Errors import ApexError
         import re
         
         if self.__Simulation:
             ID = SimuOSW_SlotID
         else:
-            Command = "SLT[" + str(self.__SlotNumber).zfill(2) + "]:IDN?\n"
-            Send(self.__Connexion, Command)
-            ID = Receive(self.__Connexion)
+            ID = self.__Equipment.Inventory().get(self.__SlotNumber, {}).get("ID")
+            if ID is None:
+                Command = "SLT[" + str(self.__SlotNumber).zfill(2) + "]:IDN?\n"
+                Send(self.__Connexion, Command)
+                ID = Receive(self.__Connexion)
         
         if re.findall("x2", ID.split("/")[2].split("-")[3].lower()) != []:
             if type.lower() == "s":
@@ -90,8 +95,6 @@ class OpticalSwitch():
             - A string "A", "B", "C", "D", "E", "F", "G" or "H"
             - An integer 1, 2, 3, 4, 5, 6, 7 or 8
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if self.__Type == 0:
             if type(Path) == str:
@@ -185,8 +188,6 @@ class OpticalSwitch():
         For 1X8 OSW, Path can be:
             - 1, 2, 3, 4, 5, 6, 7 or 8
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if self.__Simulation:
             Path = str(self.__Path) + "\n"
@@ -1,10 +1,20 @@
 
 
 from PyApex.Common import Send, Receive
+from PyApex.Constantes import AP1000_POL_ACQMAX, AP1000_POL_ACQMIN, AP1000_POL_WLMAX, \
+     AP1000_POL_WLMIN, APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_VARIABLE_NOT_DEFINED, \
+     VACCUM_LIGHT_SPEED
+from PyApex.Errors import ApexError
 
 
 class Polarimeter():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidUnits = ("dbm", "mw")
+
+    __slots__ = ("__Connexion", "__Simulation", "__SlotNumber", "__Unit", "__Wavelength",
+                 "__AcqTime")
+
     def __init__(self, Equipment, SlotNumber=1, Simulation=False):
         '''
         Constructor of a POL (Polarimeter) equipment.
@@ -18,7 +28,6 @@ class Polarimeter():
         self.__Unit = "dBm"
         self.__Wavelength = 1550
         self.__AcqTime = 100
-        self.__ValidUnits = ["dbm", "mw"]
 
 
     def __str__(self):
@@ -41,9 +50,6 @@ class Polarimeter():
         Set the acquisition time of the POL equipment
         AcqTime is expressed in ms
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_POL_ACQMIN, AP1000_POL_ACQMAX
-        from PyApex.Errors import ApexError
         
         try:
             AcqTime = float(AcqTime)
@@ -87,8 +93,6 @@ class Polarimeter():
         Set the power unit of the POL equipment
         Unit is a string which could be "dBm" for logaritmic or "mW" for linear power
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -113,9 +117,6 @@ class Polarimeter():
         Set wavelength of the POL equipment
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_POL_WLMIN, AP1000_POL_WLMAX
-        from PyApex.Errors import ApexError
         
         try:
             Wavelength = float(Wavelength)
@@ -145,8 +146,6 @@ class Polarimeter():
         Get wavelength of the POL equipment
         The return wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not self.__Simulation:
             Command = "POL[" + str(self.__SlotNumber).zfill(2) + "]:WL?\n"
@@ -161,9 +160,6 @@ class Polarimeter():
         Set frequency of the POL equipment
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED, AP1000_POL_WLMAX
-        from PyApex.Errors import ApexError
         
         try:
             Frequency = float(Frequency)
@@ -184,9 +180,6 @@ class Polarimeter():
         Get frequency of the POL equipment
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED
-        from PyApex.Errors import ApexError
         
         try:
             Wavelength = self.GetWavelength(ChNumber)
@@ -200,9 +193,6 @@ class Polarimeter():
         Get the total power of the POL equipment
         The return power is expressed in the unit defined by the GetUnit() method
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         from random import random
             
         if self.__Simulation:
@@ -234,9 +224,6 @@ class Polarimeter():
         Get a measured SOP by the POL equipment
         The returned SOP is expressed in nominal values and separated by space
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         from random import random
             
         if self.__Simulation:
@@ -1,10 +1,21 @@
 
 
 from PyApex.Common import Send, Receive
+from PyApex.Constantes import AP1000_PWM_AVGMAX, AP1000_PWM_AVGMIN, AP1000_PWM_CHTYPE, \
+     AP1000_PWM_WLMAX, AP1000_PWM_WLMIN, APXXXX_ERROR_ARGUMENT_TYPE, \
+     APXXXX_ERROR_VARIABLE_NOT_DEFINED, SimuPWM_Power_dBm, SimuPWM_Power_mW, SimuPWM_SlotID, \
+     VACCUM_LIGHT_SPEED
+from PyApex.Errors import ApexError
 
 
 class PowerMeter():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidUnits = ("dbm", "mw")
+
+    __slots__ = ("__Equipment", "__Connexion", "__Simulation", "__SlotNumber", "__Unit",
+                 "__Wavelength", "__AvgTime", "__Channels")
+
     def __init__(self, Equipment, SlotNumber=1, Simulation=False):
         '''
         Constructor of a PWM (Power Meter) equipment.
@@ -12,6 +23,7 @@ class PowerMeter():
         SlotNumber is the number of the slot used by the PWM
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
         '''
+        self.__Equipment = Equipment
         self.__Connexion = Equipment.Connexion
         self.__Simulation = Simulation
         self.__SlotNumber = SlotNumber
@@ -19,7 +31,6 @@ class PowerMeter():
         self.__Wavelength = 1550
         self.__AvgTime = 100
         self.__Channels = self.GetChannels()
-        self.__ValidUnits = ["dbm", "mw"]
 
 
     def __str__(self):
@@ -43,14 +54,15 @@ class PowerMeter():
         return 1 for a Standard PWM
         return 3 for a High Power PWM
         '''
-        from PyApex.Constantes import SimuPWM_SlotID, AP1000_PWM_CHTYPE
         
         if self.__Simulation:
             ID = SimuPWM_SlotID
         else:
-            Command = "SLT[" + str(self.__SlotNumber).zfill(2) + "]:IDN?\n"
-            Send(self.__Connexion, Command)
-            ID = Receive(self.__Connexion)
+            ID = self.__Equipment.Inventory().get(self.__SlotNumber, {}).get("ID")
+            if ID is None:
+                Command = "SLT[" + str(self.__SlotNumber).zfill(2) + "]:IDN?\n"
+                Send(self.__Connexion, Command)
+                ID = Receive(self.__Connexion)
         
         Channels = []
         for c in ID.split("/")[2].split("-")[3]:
@@ -66,9 +78,6 @@ class PowerMeter():
         Set the average time of the PWM equipment
         AvgTime is expressed in ms
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_PWM_AVGMIN, AP1000_PWM_AVGMAX
-        from PyApex.Errors import ApexError
         
         try:
             AvgTime = float(AvgTime)
@@ -112,8 +121,6 @@ class PowerMeter():
         Set the power unit of the PWM equipment
         Unit is a string which could be "dBm" for logaritmic or "mW" for linear power
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -139,9 +146,6 @@ class PowerMeter():
         Wavelength is expressed in nm
         ChNumber is the channel number : 1 (default) or 2
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_PWM_WLMIN, AP1000_PWM_WLMAX
-        from PyApex.Errors import ApexError
         
         try:
             Wavelength = float(Wavelength)
@@ -182,8 +186,6 @@ class PowerMeter():
         The return wavelength is expressed in nm
         ChNumber is the channel number : 1 (default) or 2
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         try:
             ChNumber = int(ChNumber)
@@ -210,9 +212,6 @@ class PowerMeter():
         Frequency is expressed in GHz
         ChNumber is the channel number : 1 (default) or 2
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED, AP1000_PWM_WLMAX
-        from PyApex.Errors import ApexError
         
         try:
             Frequency = float(Frequency)
@@ -244,9 +243,6 @@ class PowerMeter():
         Frequency is expressed in GHz
         ChNumber is the channel number : 1 (default) or 2
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED
-        from PyApex.Errors import ApexError
         
         try:
             ChNumber = int(ChNumber)
@@ -268,10 +264,6 @@ class PowerMeter():
         The return power is expressed in the unit defined by the GetUnit() method
         ChNumber is the channel number : 1 (default) or 2
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Constantes import SimuPWM_Power_dBm, SimuPWM_Power_mW
-        from PyApex.Errors import ApexError
         
         try:
             ChNumber = int(ChNumber)
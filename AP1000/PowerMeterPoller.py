@@ -0,0 +1,250 @@
+from PyApex.Common import Send, ReceiveLines
+import threading
+from time import perf_counter, sleep, time
+from math import floor, nan
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, \
+     SimuPWM_Power_dBm, SimuPWM_Power_mW
+from PyApex.Errors import ApexError
+
+
+class PowerMeterPoller():
+    '''
+    DESCRIPTION
+        Polling engine of the AP1000 power meter channels
+        The power queries of all the channels (in one or several slots) are sent
+        at once and their replies are read in one exchange at each cycle.
+        Each cycle gives a row [timestamp, power of channel 1, power of channel 2, ...]
+        stored in a ring buffer. The cycles are scheduled at a fixed rate without
+        drift: when a cycle is too long, the late cycles are skipped and counted.
+        While the poller is running, it uses the connection of the AP1000 equipment:
+        no other command should be sent to the equipment.
+        This class requires the numpy module installed
+
+    VERSION
+        1.0
+    '''
+
+    __slots__ = ("__Connexion", "__Simulation", "__Unit", "__Channels", "__Command",
+                 "__Buffer", "__Thread", "__Running", "__Cycles", "__Overruns",
+                 "__StartTime", "__StopTime", "__Rate", "__Error")
+
+    def __init__(self, Equipment, Channels, Rate=10.0, BufferSize=100000, Unit="dBm",
+                 Simulation=False):
+        '''
+        Constructor of a power meter poller.
+        Equipment is the AP1000 class of the equipment
+        Channels is a list of the polled channels. Each channel is a slot number (channel 1
+        of the power meter) or a tuple (slot number, channel number). For a PowerMeterB
+        module, use a tuple (slot number, channel number, "POWB")
+        Rate is the number of cycles per second
+        BufferSize is the number of cycles stored in the ring buffer
+        Unit is the unit of the powers: "dBm" (default) or "mW"
+        Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
+        '''
+        from PyApex.RingBuffer import RingBuffer
+
+        if not isinstance(Channels, (list, tuple)) or len(Channels) == 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Channels")
+        if not isinstance(Unit, str) or Unit.lower() not in ["dbm", "mw"]:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Unit")
+
+        self.__Connexion = Equipment.Connexion
+        self.__Simulation = Simulation
+        self.__Unit = Unit
+        self.__Channels = []
+        for Channel in Channels:
+            if isinstance(Channel, int):
+                Channel = (Channel, 1)
+            if len(Channel) == 2:
+                Channel = (Channel[0], Channel[1], "POW")
+            self.__Channels.append((int(Channel[0]), int(Channel[1]), str(Channel[2]).upper()))
+
+        Measure = "DBM" if Unit.lower() == "dbm" else "MW"
+        self.__Command = ""
+        for Slot, ChNumber, Family in self.__Channels:
+            self.__Command += Family + "[" + str(Slot).zfill(2) + "]:" + Measure + \
+                              "[" + str(ChNumber) + "]?\n"
+
+        self.__Buffer = RingBuffer(BufferSize, len(self.__Channels) + 1)
+        self.__Thread = None
+        self.__Running = False
+        self.__Cycles = 0
+        self.__Overruns = 0
+        self.__StartTime = None
+        self.__StopTime = None
+        self.__Error = None
+        self.SetRate(Rate)
+
+
+    def __str__(self):
+        '''
+        Return the poller description when the 'print()' function is used
+        '''
+        return "Power Meter Poller of " + str(len(self.__Channels)) + " channels at " + \
+               str(self.__Rate) + " Hz"
+
+
+    def GetChannels(self):
+        '''
+        Returns the list of the polled channels (slot number, channel number, family)
+        The columns of the data (after the timestamp) are in this order
+        '''
+        return list(self.__Channels)
+
+
+    def GetUnit(self):
+        '''
+        Returns the unit of the powers
+        '''
+        return self.__Unit
+
+
+    def SetRate(self, Rate):
+        '''
+        Sets the polling rate in cycles per second
+        '''
+
+        if not isinstance(Rate, (float, int)):
+            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Rate")
+        if Rate <= 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Rate")
+        self.__Rate = float(Rate)
+
+
+    def GetRate(self):
+        '''
+        Returns the polling rate in cycles per second
+        '''
+        return self.__Rate
+
+
+    def Poll(self):
+        '''
+        Runs one polling cycle and returns the row [timestamp, power 1, power 2, ...]
+        The timestamp (seconds since the epoch) is the middle of the exchange.
+        The row is also stored in the ring buffer
+        '''
+
+        Start = time()
+        if self.__Simulation:
+            Power = SimuPWM_Power_dBm if self.__Unit.lower() == "dbm" else SimuPWM_Power_mW
+            Replies = [str(Power)] * len(self.__Channels)
+        else:
+            Send(self.__Connexion, self.__Command)
+            Replies = ReceiveLines(self.__Connexion, len(self.__Channels))
+        End = time()
+
+        Row = [0.5 * (Start + End)]
+        for Index in range(len(self.__Channels)):
+            try:
+                Row.append(float(Replies[Index]))
+            except:
+                Row.append(nan)
+
+        self.__Buffer.Append(Row)
+        self.__Cycles += 1
+        return Row
+
+
+    def Start(self):
+        '''
+        Starts the polling in a background thread
+        '''
+        if self.__Running:
+            return
+        self.__Running = True
+        self.__Error = None
+        self.__Thread = threading.Thread(target=self.__Run, daemon=True)
+        self.__Thread.start()
+
+
+    def Stop(self):
+        '''
+        Stops the polling thread
+        '''
+        self.__Running = False
+        if self.__Thread is not None:
+            self.__Thread.join()
+            self.__Thread = None
+
+
+    def IsRunning(self):
+        '''
+        Returns True if the polling thread is running, False otherwise
+        '''
+        return self.__Running
+
+
+    def GetError(self):
+        '''
+        Returns the exception which stopped the polling thread (None if the thread has
+        not failed)
+        '''
+        return self.__Error
+
+
+    def __Run(self):
+        Period = 1.0 / self.__Rate
+        Start = perf_counter()
+        self.__StartTime = time()
+        self.__StopTime = None
+        Cycle = 0
+        try:
+            while self.__Running:
+                self.Poll()
+
+                Cycle += 1
+                Now = perf_counter()
+                Late = int(floor((Now - Start) / Period)) - Cycle
+                if Late > 0:
+                    self.__Overruns += Late
+                    Cycle += Late
+                Delay = Start + Cycle * Period - perf_counter()
+                if Delay > 0:
+                    sleep(Delay)
+        except Exception as Error:
+            self.__Error = Error
+        finally:
+            self.__Running = False
+            self.__StopTime = time()
+
+
+    def GetData(self, Number=None):
+        '''
+        Returns the last 'Number' rows of the ring buffer (all the rows if Number is None)
+        in a NumPy array of shape (N, 1 + number of channels). The first column is the
+        timestamp in seconds since the epoch
+        '''
+        return self.__Buffer.GetData(Number)
+
+
+    def GetLatest(self):
+        '''
+        Returns the last row [timestamp, power 1, power 2, ...] or None
+        '''
+        return self.__Buffer.GetLatest()
+
+
+    def GetStats(self):
+        '''
+        Returns a dictionary of statistics of the polling:
+            - "Cycles": number of polling cycles
+            - "Overruns": number of skipped cycles (cycles longer than the period)
+            - "Rate": measured rate in cycles per second (up to the stop of the polling)
+        '''
+        Rate = None
+        End = time() if self.__StopTime is None else self.__StopTime
+        if self.__StartTime is not None and End > self.__StartTime:
+            Rate = self.__Cycles / (End - self.__StartTime)
+        return {"Cycles": self.__Cycles, "Overruns": self.__Overruns, "Rate": Rate}
+
+
+    def Clear(self):
+        '''
+        Removes the rows of the ring buffer and resets the statistics
+        '''
+        self.__Buffer.Clear()
+        self.__Cycles = 0
+        self.__Overruns = 0
+        self.__StartTime = time() if self.__Running else None
+        self.__StopTime = None
@@ -0,0 +1,200 @@
+from PyApex.Common import Send, ReceiveLines
+from time import perf_counter
+from math import nan
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
+from PyApex.Errors import ApexError
+
+
+class SweptInsertionLoss():
+    '''
+    DESCRIPTION
+        Swept insertion loss measurement with an AP1000 tunable laser and power meters
+        The TLS runs a continuous single sweep while the power meter channels are
+        read as fast as possible (all the channels in one exchange). Each reading
+        is timestamped and its wavelength is computed from the sweep start time
+        and the sweep speed:
+            Wavelength = Start + Speed * (Time - SweepStartTime - Delay)
+        'Delay' is the time between the sweep command and the real start of the
+        wavelength sweep. It can be calibrated with a known component.
+        The insertion loss is the difference between a reference measurement
+        (without the device under test) and the measurement.
+        This class requires the numpy module installed
+
+    VERSION
+        1.0
+    '''
+
+    __slots__ = ("__Connexion", "__Simulation", "__TLS", "__Channels", "__Command",
+                 "__Delay", "__Reference")
+
+    def __init__(self, Equipment, TLSSlot, Channels, Simulation=False):
+        '''
+        Constructor of a swept insertion loss measurement.
+        Equipment is the AP1000 class of the equipment
+        TLSSlot is the slot number of the tunable laser
+        Channels is a list of the power meter channels. Each channel is a slot number
+        (channel 1 of the power meter) or a tuple (slot number, channel number)
+        Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
+        '''
+
+        if not isinstance(Channels, (list, tuple)) or len(Channels) == 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Channels")
+
+        self.__Connexion = Equipment.Connexion
+        self.__Simulation = Simulation
+        self.__TLS = Equipment.TunableLaser(TLSSlot)
+        self.__Channels = []
+        self.__Command = ""
+        for Channel in Channels:
+            if isinstance(Channel, int):
+                Channel = (Channel, 1)
+            self.__Channels.append((int(Channel[0]), int(Channel[1])))
+            self.__Command += "POW[" + str(int(Channel[0])).zfill(2) + "]:DBM[" + \
+                              str(int(Channel[1])) + "]?\n"
+        self.__Delay = 0.0
+        self.__Reference = None
+
+
+    def __str__(self):
+        '''
+        Return the measurement description when the 'print()' function is used
+        '''
+        return "Swept Insertion Loss with " + str(self.__TLS) + " and " + \
+               str(len(self.__Channels)) + " power meter channels"
+
+
+    def GetChannels(self):
+        '''
+        Returns the list of the power meter channels (slot number, channel number)
+        The columns of the power and insertion loss arrays are in this order
+        '''
+        return list(self.__Channels)
+
+
+    def SetDelay(self, Delay):
+        '''
+        Sets the delay in seconds between the sweep command and the real start
+        of the wavelength sweep
+        '''
+        self.__Delay = float(Delay)
+
+
+    def GetDelay(self):
+        '''
+        Returns the delay in seconds between the sweep command and the real start
+        of the wavelength sweep
+        '''
+        return self.__Delay
+
+
+    def Sweep(self, Start, Stop, Speed=1.0, NPoints=None):
+        '''
+        Runs a sweep from Start to Stop (nm) at the speed Speed (nm/s) and returns
+        a dictionary of NumPy arrays:
+            - "Wavelength": wavelengths in nm (N,)
+            - "Power": powers in dBm (N, number of channels)
+            - "IL": insertion losses in dB (N, number of channels) if a reference is
+              defined, None otherwise
+            - "Time": timestamps of the readings in seconds since the sweep command (N,)
+        If NPoints is None, the arrays contain all the readings. Otherwise, the powers
+        are interpolated on NPoints wavelengths regularly spaced between Start and Stop
+        The wavelengths are computed from the start, stop and speed read back from the
+        TLS, which limits them to its range
+        '''
+        import numpy as np
+
+        if Start == Stop:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Stop")
+        if Speed <= 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Speed")
+
+        self.__TLS.SetSweepMode(1)
+        self.__TLS.SetStartSweepWavelength(Start)
+        self.__TLS.SetStopSweepWavelength(Stop)
+        self.__TLS.SetSweepSpeed(Speed)
+        if not self.__Simulation:
+            # The TLS clamps the sweep parameters to its limits
+            Start = self.__TLS.GetStartSweepWavelength()
+            Stop = self.__TLS.GetStopSweepWavelength()
+            Speed = self.__TLS.GetSweepSpeed()
+            if Start == Stop:
+                raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Stop")
+        self.__TLS.On()
+        Duration = abs(Stop - Start) / Speed
+
+        Times = []
+        Replies = []
+        Origin = perf_counter()
+        self.__TLS.StartSingleSweep()
+        if self.__Simulation:
+            Times = list(np.linspace(0.0, Duration, 1000) + self.__Delay)
+            Replies = [["-10.0"] * len(self.__Channels)] * len(Times)
+        else:
+            while perf_counter() - Origin < Duration + self.__Delay:
+                Before = perf_counter()
+                Send(self.__Connexion, self.__Command)
+                Lines = ReceiveLines(self.__Connexion, len(self.__Channels))
+                Times.append(0.5 * (Before + perf_counter()) - Origin)
+                Replies.append(Lines)
+
+        Power = np.full((len(Replies), len(self.__Channels)), nan)
+        for i, Lines in enumerate(Replies):
+            for j, Line in enumerate(Lines[:len(self.__Channels)]):
+                try:
+                    Power[i, j] = float(Line)
+                except:
+                    pass
+        Times = np.array(Times)
+        Elapsed = Times - self.__Delay
+        Valid = (Elapsed >= 0.0) & (Elapsed <= Duration)
+        Times = Times[Valid]
+        Power = Power[Valid]
+        Sign = 1.0 if Stop > Start else -1.0
+        Wavelength = Start + Sign * Speed * Elapsed[Valid]
+
+        if NPoints is not None and len(Wavelength) > 1:
+            Grid = np.linspace(Start, Stop, int(NPoints))
+            Order = np.argsort(Wavelength)
+            Power = np.column_stack([np.interp(Grid, Wavelength[Order], Power[Order, j])
+                                     for j in range(Power.shape[1])])
+            Times = np.interp(Grid, Wavelength[Order], Times[Order])
+            Wavelength = Grid
+
+        IL = None
+        if self.__Reference is not None:
+            Reference = np.column_stack([np.interp(Wavelength, self.__Reference[0],
+                                                   self.__Reference[1][:, j])
+                                         for j in range(Power.shape[1])])
+            IL = Reference - Power
+
+        return {"Wavelength": Wavelength, "Power": Power, "IL": IL, "Time": Times}
+
+
+    def SetReference(self, Result):
+        '''
+        Sets the reference measurement (without the device under test)
+        Result is the dictionary returned by the 'Sweep' method
+        '''
+        import numpy as np
+
+        Order = np.argsort(Result["Wavelength"])
+        self.__Reference = (np.asarray(Result["Wavelength"])[Order],
+                            np.asarray(Result["Power"])[Order])
+
+
+    def Reference(self, Start, Stop, Speed=1.0, NPoints=None):
+        '''
+        Runs a sweep without the device under test and sets it as reference
+        Returns the dictionary of the reference measurement (see 'Sweep')
+        '''
+        self.__Reference = None
+        Result = self.Sweep(Start, Stop, Speed, NPoints)
+        self.SetReference(Result)
+        return Result
+
+
+    def ClearReference(self):
+        '''
+        Removes the reference measurement
+        '''
+        self.__Reference = None
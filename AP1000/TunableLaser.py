@@ -1,10 +1,23 @@
 
 
 from PyApex.Common import Send, Receive
+from PyApex.Constantes import AP1000_ERROR_SLOT_TYPE_NOT_DEFINED, AP1000_TLS_CBAND, \
+     AP1000_TLS_LBAND, AP1000_TLS_POWMAX, AP1000_TLS_POWMIN, AP1000_TLS_SOAMAX, \
+     AP1000_TLS_SOAMIN, AP1000_TLS_TMAX, AP1000_TLS_TMIN, AP1000_TLS_WLMAX, AP1000_TLS_WLMIN, \
+     APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, \
+     APXXXX_ERROR_VARIABLE_NOT_DEFINED, SimuTLS_SlotID, VACCUM_LIGHT_SPEED
+from PyApex.Errors import ApexError
 
 
 class TunableLaser():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidUnits = ("dbm", "mw")
+
+    __slots__ = ("__Equipment", "__Connexion", "__SlotNumber", "__Simulation", "__Type",
+                 "__Unit", "__Wavelength", "__Power", "__Status", "__SOACurrent",
+                 "__DiodeNumber", "__DiodeTemp", "__SweepSpeed", "__SOAComp")
+
     def __init__(self, Equipment, SlotNumber, Simulation=False):
         '''
         Constructor of a TLS (Tunable Laser Source) equipment.
@@ -12,6 +25,7 @@ class TunableLaser():
         SlotNumber is the number of the slot used by the TLS
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
         '''
+        self.__Equipment = Equipment
         self.__Connexion = Equipment.Connexion
         self.__SlotNumber = SlotNumber
         self.__Simulation = Simulation
@@ -20,7 +34,6 @@ class TunableLaser():
         self.__Wavelength = 1550
         self.__Power = 0
         self.__Status = "OFF"
-        self.__ValidUnits = ["dbm", "mw"]
 
 
     def __str__(self):
@@ -44,17 +57,16 @@ class TunableLaser():
         return 0 for a C band Laser
         return 2 for a L band Laser
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_TYPE_NOT_DEFINED
-        from PyApex.Constantes import SimuTLS_SlotID, AP1000_TLS_CBAND, AP1000_TLS_LBAND
-        from PyApex.Errors import ApexError
         import re
         
         if self.__Simulation:
             ID = SimuTLS_SlotID
         else:
-            Command = "SLT[" + str(self.__SlotNumber).zfill(2) + "]:IDN?\n"
-            Send(self.__Connexion, Command)
-            ID = Receive(self.__Connexion)
+            ID = self.__Equipment.Inventory().get(self.__SlotNumber, {}).get("ID")
+            if ID is None:
+                Command = "SLT[" + str(self.__SlotNumber).zfill(2) + "]:IDN?\n"
+                Send(self.__Connexion, Command)
+                ID = Receive(self.__Connexion)
 
         if re.findall(str(AP1000_TLS_CBAND), ID.split("/")[1]) != []:
             return 0
@@ -71,8 +83,6 @@ class TunableLaser():
         Internal use only
         Convert a dBm power in mW or a mW power in dBm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_VALUE, APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         from math import log10 as log
         
         if self.__Unit.lower() == "dbm":
@@ -97,8 +107,6 @@ class TunableLaser():
         Internal use only
         Convert a dBm power in mW or a mW power in dBm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         
         if self.__Unit.lower() == "mw":
             return 10**(Power / 10)
@@ -114,9 +122,6 @@ class TunableLaser():
         Set output power of the TLS equipment
         Power is expressed in the unit defined by the GetUnit() method
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_TLS_POWMIN, AP1000_TLS_POWMAX
-        from PyApex.Errors import ApexError
         
         try:
             Power = float(Power)
@@ -162,8 +167,6 @@ class TunableLaser():
         Set the power unit of the TLS equipment
         Unit is a string which could be "dBm" for logaritmic or "mW" for linear power
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -220,9 +223,6 @@ class TunableLaser():
         Set wavelength of the TLS equipment
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_TLS_WLMIN, AP1000_TLS_WLMAX
-        from PyApex.Errors import ApexError
         
         try:
             Wavelength = float(Wavelength)
@@ -267,9 +267,6 @@ class TunableLaser():
         Set frequency of the TLS equipment
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED, AP1000_TLS_WLMAX
-        from PyApex.Errors import ApexError
         
         try:
             Frequency = float(Frequency)
@@ -291,7 +288,6 @@ class TunableLaser():
         Get frequency of the TLS equipment
         The return frequency is expressed in GHz
         '''
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED
             
         Wavelength = self.GetWavelength()
         return VACCUM_LIGHT_SPEED / Wavelength
@@ -302,9 +298,6 @@ class TunableLaser():
         !!! FOR TLS CALIBRATION ONLY !!!
         Set the SOA current. 'Current' is a 16-bits binary value 
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_TLS_SOAMIN, AP1000_TLS_SOAMAX
-        from PyApex.Errors import ApexError
         
         if not isinstance(Current, (float, int)):
             self.Off()
@@ -329,7 +322,6 @@ class TunableLaser():
         Get the SOA Degrade status. Returns True if the SOA is out
         of bounds, False otherwise
         '''
-        from PyApex.Errors import ApexError
             
         if not self.__Simulation:
             Command = "TLS[" + str(self.__SlotNumber).zfill(2) + "]:TLIMIT?\n"
@@ -349,9 +341,6 @@ class TunableLaser():
         Set the temperature tuning speed
         Set the SOA compensation value
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_TLS_TMIN, AP1000_TLS_TMAX
-        from PyApex.Errors import ApexError
 
         if not isinstance(DiodeNumber, int):
             self.Off()
@@ -405,9 +394,6 @@ class TunableLaser():
         Selects STATIC mode (mode=0) or CONTINUOUS mode (mode=1) or STEP mode
         (mode=2)
         """
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_TLS_POWMIN, AP1000_TLS_POWMAX
-        from PyApex.Errors import ApexError
 
         try:
             Mode = int(Mode)
@@ -444,9 +430,6 @@ class TunableLaser():
         Set start wavelength of the TLS equipment
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_TLS_WLMIN, AP1000_TLS_WLMAX
-        from PyApex.Errors import ApexError
 
         try:
             Wavelength = float(Wavelength)
@@ -489,9 +472,6 @@ class TunableLaser():
         Set stop wavelength of the TLS equipment
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_TLS_WLMIN, AP1000_TLS_WLMAX
-        from PyApex.Errors import ApexError
 
         try:
             Wavelength = float(Wavelength)
@@ -533,9 +513,6 @@ class TunableLaser():
         Set stop wavelength of the TLS equipment
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_TLS_WLMIN, AP1000_TLS_WLMAX
-        from PyApex.Errors import ApexError
 
         try:
             Speed = float(Speed)
@@ -2,7 +2,13 @@
 # -*- coding: <utf-8> -*-
 
 import socket
-from PyApex.Common import Send, Receive
+from PyApex.Common import Send, Receive, ReceiveLines
+from PyApex.Constantes import AP1000_ATT_NAME, AP1000_DFB_CBAND_NAME, AP1000_DFB_LBAND_NAME, \
+     AP1000_DFB_OBAND_NAME, AP1000_EFA_NAME, AP1000_FIL_NAME, AP1000_OSW_NAME, AP1000_POL_NAME, \
+     AP1000_PWM_NAME, AP1000_SLOT_MAX, AP1000_SLOT_MIN, AP1000_TLS_CBAND_NAME, \
+     AP1000_TLS_LBAND_NAME, APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, \
+     APXXXX_ERROR_COMMUNICATION, Modules, SimuAP1000_ID, SimuAP1000_SlotID, SimuAP1000_SlotUsed
+from PyApex.Errors import ApexError
 
 class AP1000():
     '''
@@ -26,17 +32,29 @@ class AP1000():
         Vincent PERNET
     '''
 
-    def __init__(self, IPaddress, PortNumber=5900, Simulation=False):
+    __slots__ = ("__IPAddress", "__PortNumber", "__Simulation", "__Connected",
+                 "__Inventory", "__Record", "__Replay", "__ReplaySpeed", "Connexion")
+
+    def __init__(self, IPaddress, PortNumber=5900, Simulation=False, Record=None, Replay=None,
+                 ReplaySpeed=1.0):
         '''
         Constructor of AP1000 equipment.
         IPaddress is the IP address (string) of the equipment.
         PortNumber is by default 5900. It's an integer
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
+        Record is the path of a session log file. If given, all the commands and replies
+        are recorded in this file (see PyApex.Session)
+        Replay is the path of a session log file. If given, the equipment is replaced by
+        the replay of this file at the speed ReplaySpeed (1.0 for the original speed)
         '''
         self.__IPAddress = IPaddress
         self.__PortNumber = PortNumber
         self.__Simulation = Simulation
         self.__Connected = False
+        self.__Inventory = None
+        self.__Record = Record
+        self.__Replay = Replay
+        self.__ReplaySpeed = ReplaySpeed
         self.Open()
         
 
@@ -45,6 +63,14 @@ class AP1000():
         Open connexion to AP1000 equipment.
         This method is called by the constructor of AP1000 class
         '''
+        from PyApex.Session import RecordingConnexion, ReplayConnexion
+        
+        if self.__Replay is not None:
+            self.Connexion = ReplayConnexion(self.__Replay, self.__ReplaySpeed)
+            self.__Connected = True
+            print("Connected successfully to the replayed session")
+            return
+        
         self.Connexion = socket.socket(socket.AF_INET , socket.SOCK_STREAM)
         self.Connexion.settimeout(10.0)
         
@@ -54,6 +80,8 @@ class AP1000():
         else:
             try:
                 self.Connexion.connect((self.__IPAddress, self.__PortNumber))
+                if self.__Record is not None:
+                    self.Connexion = RecordingConnexion(self.Connexion, self.__Record)
                 self.__Connected = True
                 print("Connected successfully to the equipment")
             except:
@@ -64,8 +92,6 @@ class AP1000():
         '''
         Close connexion to AP1000 equipment
         '''
-        from PyApex.Constantes import APXXXX_ERROR_COMMUNICATION
-        from PyApex.Errors import ApexError
         
         if self.__Simulation:
             self.__Connected = False
@@ -90,7 +116,6 @@ class AP1000():
         Set the timeout of the Ethernet connection
         TimeOut is expressed in seconds
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
         
         if not isinstance(TimeOut, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TimeOut")
@@ -112,7 +137,6 @@ class AP1000():
         '''
         Return string ID of AP1000 equipment
         '''
-        from PyApex.Constantes import SimuAP1000_ID
         
         if self.__Simulation:
             return SimuAP1000_ID
@@ -153,10 +177,6 @@ class AP1000():
             - if return True : Slot is used by a module
             - if return False : Slot is not used
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_SLOT_MIN, AP1000_SLOT_MAX
-        from PyApex.Constantes import SimuAP1000_SlotUsed
-        from PyApex.Errors import ApexError
         
         if not isinstance(SlotNumber, int):
             self.Connexion.close()
@@ -183,10 +203,6 @@ class AP1000():
         Return a string ID of the module selected by 'SlotNumber'
         If Force is True, the function return an ID even if slot isn't used
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_SLOT_MIN, AP1000_SLOT_MAX
-        from PyApex.Constantes import SimuAP1000_SlotID
-        from PyApex.Errors import ApexError
         
         if not isinstance(SlotNumber, int):
             self.Connexion.close()
@@ -217,10 +233,6 @@ class AP1000():
         Return the Serial Number (integer) of the module in the slot 'SlotNumber'
         If Force is True, the function return a S/N even if slot isn't used 
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, AP1000_ERROR_SLOT_NOT_DEFINED
-        from PyApex.Constantes import AP1000_SLOT_MIN, AP1000_SLOT_MAX
-        from PyApex.Constantes import SimuAP1000_SlotID
-        from PyApex.Errors import ApexError
         import re
         
         if not isinstance(SlotNumber, int):
@@ -250,10 +262,6 @@ class AP1000():
         If Type = 'string' or 'str' or 's', the function returns a string (default)
         If Type = 'integer' or 'int' or 'i', the function returns the module number type
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP1000_SLOT_MIN, AP1000_SLOT_MAX
-        from PyApex.Constantes import AP1000_ERROR_SLOT_NOT_DEFINED, SimuAP1000_SlotID, Modules
-        from PyApex.Errors import ApexError
         from random import sample
         import re
         
@@ -290,36 +298,133 @@ class AP1000():
             print("PyApex Warning. Slot", SlotNumber, "not defined")
 
 
+    def Inventory(self, Refresh=False):
+        '''
+        Return the inventory of the modules of the AP1000 equipment
+        The inventory is a dictionary {slot number: module} where each module is a dictionary:
+            - "ID": string ID of the module
+            - "Type": module number type (integer)
+            - "Name": description of the module
+            - "SN": Serial Number (integer)
+        Only the used slots are in the inventory. The number of slots is read from the
+        equipment ID. The 'EMPTY?' and 'IDN?' queries of all the slots are sent at once
+        and their replies are read in one exchange.
+        The inventory is cached: it is read again from the equipment only if Refresh is True
+        The module factories (PowerMeter, TunableLaser, ...) use this inventory
+        '''
+        import re
+        
+        if self.__Inventory is not None and not Refresh:
+            return dict(self.__Inventory)
+        
+        try:
+            NbSlots = int(self.GetID().split("/")[1].split("-")[1])
+        except:
+            NbSlots = 8
+        Slots = list(range(1, NbSlots + 1))
+        
+        if self.__Simulation:
+            Replies = []
+            for Slot in Slots:
+                Replies += ["1", SimuAP1000_SlotID[:-1]]
+        else:
+            Command = ""
+            for Slot in Slots:
+                Command += "SLT[" + str(Slot).zfill(2) + "]:EMPTY?\n"
+                Command += "SLT[" + str(Slot).zfill(2) + "]:IDN?\n"
+            Send(self.Connexion, Command)
+            Replies = ReceiveLines(self.Connexion, 2 * len(Slots))
+        
+        Inventory = {}
+        for Index, Slot in enumerate(Slots):
+            if 2 * Index + 1 >= len(Replies) or Replies[2 * Index].strip() != "1":
+                continue
+            ID = Replies[2 * Index + 1].strip()
+            try:
+                Type = int(re.findall("\d+", ID.lower().split("/")[1].split("-")[0])[0])
+            except:
+                Type = None
+            try:
+                SN = ID.lower().split("/")[2].split("-")
+                SN = int(re.findall("\d+", SN[len(SN) - 1])[0])
+            except:
+                SN = None
+            Inventory[Slot] = {"ID": ID, "Type": Type, "Name": Modules.get(Type), "SN": SN}
+        
+        self.__Inventory = Inventory
+        return dict(self.__Inventory)
+
+
+    def __SlotName(self, SlotNumber):
+        '''
+        Return the description of the module in the slot 'SlotNumber' from the inventory
+        '''
+        Module = self.Inventory().get(SlotNumber)
+        if Module is None:
+            return "Slot not used"
+        return Module["Name"]
+
+
     def PowerMeter(self, SlotNumber, Force=False):
         '''
         Return a PowerMeter class for the module in the slot 'SlotNumber'
         if Force is True, a PowerMeter class is returned even if the module isn't a Power Meter
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_NOT_GOOD_TYPE, AP1000_PWM_NAME
-        from PyApex.Errors import ApexError
         from PyApex.AP1000.PowerMeter import PowerMeter
         
         if Force:
             return PowerMeter(self, SlotNumber, self.__Simulation)
-        if self.__Simulation or self.SlotType(SlotNumber) == AP1000_PWM_NAME:
+        if self.__Simulation or self.__SlotName(SlotNumber) == AP1000_PWM_NAME:
             return PowerMeter(self, SlotNumber, self.__Simulation)
         else:
             print("PyApex Warning. Wrong module")
             return None
 
 
+    def PowerMeterPoller(self, Channels, Rate=10.0, BufferSize=100000, Unit="dBm"):
+        '''
+        Return a PowerMeterPoller class polling the power meter channels 'Channels'
+        Channels is a list of slot numbers or of tuples (slot number, channel number)
+        Rate is the number of polling cycles per second
+        BufferSize is the number of cycles stored in the ring buffer
+        '''
+        from PyApex.AP1000.PowerMeterPoller import PowerMeterPoller
+        
+        return PowerMeterPoller(self, Channels, Rate, BufferSize, Unit, self.__Simulation)
+
+
+    def SweptInsertionLoss(self, TLSSlot, Channels):
+        '''
+        Return a SweptInsertionLoss class measuring the insertion loss with the tunable
+        laser of the slot 'TLSSlot' and the power meter channels 'Channels'
+        Channels is a list of slot numbers or of tuples (slot number, channel number)
+        '''
+        from PyApex.AP1000.SweptInsertionLoss import SweptInsertionLoss
+        
+        return SweptInsertionLoss(self, TLSSlot, Channels, self.__Simulation)
+
+
+    def Scan(self, FileName=None, FlushInterval=1.0):
+        '''
+        Return a Scan class for the N-dimensional step and measure scans
+        FileName is the optional .npy file of the results (resumable scans)
+        FlushInterval is the time in seconds between the flushes of the results on the disk
+        '''
+        from PyApex.Scan import Scan
+        
+        return Scan(self, FileName, FlushInterval, self.__Simulation)
+
+
     def Attenuator(self, SlotNumber, Force=False):
         '''
         Return an Attenuator class for the module in the slot 'SlotNumber'
         if Force is True, an Attenuator class is returned even if the module isn't an Attenuator
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_NOT_GOOD_TYPE, AP1000_ATT_NAME
-        from PyApex.Errors import ApexError
         from PyApex.AP1000.Attenuator import Attenuator
         
         if Force:
             return Attenuator(self, SlotNumber, self.__Simulation)
-        if self.__Simulation or self.SlotType(SlotNumber) == AP1000_ATT_NAME:
+        if self.__Simulation or self.__SlotName(SlotNumber) == AP1000_ATT_NAME:
             return Attenuator(self, SlotNumber, self.__Simulation)
         else:
             print("PyApex Warning. Wrong module")
@@ -331,14 +436,12 @@ class AP1000():
         Return a TunableLaser class for the module in the slot 'SlotNumber'
         if Force is True, a TunableLaser class is returned even if the module isn't a Tunable Laser
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_NOT_GOOD_TYPE, AP1000_TLS_CBAND_NAME, AP1000_TLS_LBAND_NAME
-        from PyApex.Errors import ApexError
         from PyApex.AP1000.TunableLaser import TunableLaser
         
         if Force:
             return TunableLaser(self, SlotNumber, self.__Simulation)
-        if self.__Simulation or self.SlotType(SlotNumber) == AP1000_TLS_CBAND_NAME \
-           or self.SlotType(SlotNumber) == AP1000_TLS_LBAND_NAME:
+        if self.__Simulation or self.__SlotName(SlotNumber) == AP1000_TLS_CBAND_NAME \
+           or self.__SlotName(SlotNumber) == AP1000_TLS_LBAND_NAME:
             return TunableLaser(self, SlotNumber, self.__Simulation)
         else:
             print("PyApex Warning. Wrong module")
@@ -350,13 +453,11 @@ class AP1000():
         Return an ErbiumAmplifier class for the module in the slot 'SlotNumber'
         if Force is True, an ErbiumAmplifier class is returned even if the module isn't an Erbium Amplifier
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_NOT_GOOD_TYPE, AP1000_EFA_NAME 
-        from PyApex.Errors import ApexError
         from PyApex.AP1000.ErbiumAmplifier import ErbiumAmplifier
         
         if Force:
             return ErbiumAmplifier(self, SlotNumber, self.__Simulation)
-        if self.__Simulation or self.SlotType(SlotNumber) == AP1000_EFA_NAME:
+        if self.__Simulation or self.__SlotName(SlotNumber) == AP1000_EFA_NAME:
             return ErbiumAmplifier(self, SlotNumber, self.__Simulation)
         else:
             print("PyApex Warning. Wrong module")
@@ -368,13 +469,11 @@ class AP1000():
         Return an OpticalSwitch class for the module in the slot 'SlotNumber'
         if Force is True, an OpticalSwitch class is returned even if the module isn't an Optical Switch
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_NOT_GOOD_TYPE, AP1000_OSW_NAME  
-        from PyApex.Errors import ApexError
         from PyApex.AP1000.OpticalSwitch import OpticalSwitch
         
         if Force:
             return OpticalSwitch(self, SlotNumber, self.__Simulation)
-        if self.__Simulation or self.SlotType(SlotNumber) == AP1000_OSW_NAME:
+        if self.__Simulation or self.__SlotName(SlotNumber) == AP1000_OSW_NAME:
             return OpticalSwitch(self, SlotNumber, self.__Simulation)
         else:
             print("PyApex Warning. Wrong module")
@@ -386,13 +485,11 @@ class AP1000():
         Return an OpticalFilter class for the module in the slot 'SlotNumber'
         if Force is True, an OpticalFilter class is returned even if the module isn't an Optical Filter
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_NOT_GOOD_TYPE, AP1000_FIL_NAME
-        from PyApex.Errors import ApexError
         from PyApex.AP1000.Filter import Filter
         
         if Force:
             return Filter(self, SlotNumber, self.__Simulation)
-        if self.__Simulation or self.SlotType(SlotNumber) == AP1000_FIL_NAME:
+        if self.__Simulation or self.__SlotName(SlotNumber) == AP1000_FIL_NAME:
             return Filter(self, SlotNumber, self.__Simulation)
         else:
             print("PyApex Warning. Wrong module")
@@ -404,15 +501,13 @@ class AP1000():
         Return a DfbLaser class for the module in the slot 'SlotNumber'
         if Force is True, a DfbLaser class is returned even if the module isn't a DFB Laser
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_NOT_GOOD_TYPE, AP1000_DFB_CBAND_NAME, AP1000_DFB_LBAND_NAME, AP1000_DFB_OBAND_NAME
-        from PyApex.Errors import ApexError
         from PyApex.AP1000.DfbLaser import DfbLaser
         
         if Force:
             return DfbLaser(self, SlotNumber, self.__Simulation)
-        if self.__Simulation or self.SlotType(SlotNumber) == AP1000_DFB_CBAND_NAME \
-           or self.SlotType(SlotNumber) == AP1000_DFB_LBAND_NAME or \
-           self.SlotType(SlotNumber) == AP1000_DFB_OBAND_NAME:
+        if self.__Simulation or self.__SlotName(SlotNumber) == AP1000_DFB_CBAND_NAME \
+           or self.__SlotName(SlotNumber) == AP1000_DFB_LBAND_NAME or \
+           self.__SlotName(SlotNumber) == AP1000_DFB_OBAND_NAME:
             return DfbLaser(self, SlotNumber, self.__Simulation)
         else:
             print("PyApex Warning. Wrong module")
@@ -424,13 +519,11 @@ class AP1000():
         Return a Polarimeter class for the module in the slot 'SlotNumber'
         if Force is True, a Polarimeter class is returned even if the module isn't a Polarimeter
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_NOT_GOOD_TYPE, AP1000_POL_NAME
-        from PyApex.Errors import ApexError
         from PyApex.AP1000.Polarimeter import Polarimeter
         
         if Force:
             return Polarimeter(self, SlotNumber, self.__Simulation)
-        if self.__Simulation or self.SlotType(SlotNumber) == AP1000_POL_NAME:
+        if self.__Simulation or self.__SlotName(SlotNumber) == AP1000_POL_NAME:
             return Polarimeter(self, SlotNumber, self.__Simulation)
         else:
             print("PyApex Warning. Wrong module")
@@ -443,13 +536,11 @@ class AP1000():
         SlotNumber is the slot of the polarimeter or the power-meter used for the OSA module
         if Force is True, an OSA class is returned even if the module isn't a Polarimeter or a Power-Meter
         '''
-        from PyApex.Constantes import AP1000_ERROR_SLOT_NOT_GOOD_TYPE, AP1000_POL_NAME, AP1000_PWM_NAME
-        from PyApex.Errors import ApexError
         from PyApex.AP1000.OSA import OSA
         
         if Force:
             return OSA(self, SlotNumber, self.__Simulation)
-        if self.__Simulation or self.SlotType(SlotNumber) == AP1000_POL_NAME or self.SlotType(SlotNumber) == AP1000_PWM_NAME:
+        if self.__Simulation or self.__SlotName(SlotNumber) == AP1000_POL_NAME or self.__SlotName(SlotNumber) == AP1000_PWM_NAME:
             return OSA(self, SlotNumber, self.__Simulation)
         else:
             print("PyApex Warning. Wrong module")
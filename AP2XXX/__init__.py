@@ -2,6 +2,9 @@ import socket
 import os, sys, re
 
 from PyApex.Common import Send, Receive
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_COMMUNICATION, \
+     SimuAP2XXX_ID
+from PyApex.Errors import ApexError
 
 class AP2XXX():
     '''
@@ -24,18 +27,29 @@ class AP2XXX():
         Vincent PERNET
     '''
 
-    def __init__(self, IPaddress, PortNumber=5900, Simulation=False):
+    __slots__ = ("__IPAddress", "__PortNumber", "__Simulation", "__Connected", "__Record",
+                 "__Replay", "__ReplaySpeed", "Connexion")
+
+    def __init__(self, IPaddress, PortNumber=5900, Simulation=False, Record=None, Replay=None,
+                 ReplaySpeed=1.0):
         '''
         Constructor of AP2XXX equipment.
         IPaddress is the IP address (string) of the equipment.
         PortNumber is by default 5900. It's an integer
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
+        Record is the path of a session log file. If given, all the commands and replies
+        are recorded in this file (see PyApex.Session)
+        Replay is the path of a session log file. If given, the equipment is replaced by
+        the replay of this file at the speed ReplaySpeed (1.0 for the original speed)
         '''
         
         self.__IPAddress = IPaddress
         self.__PortNumber = PortNumber
         self.__Simulation = Simulation
         self.__Connected = False
+        self.__Record = Record
+        self.__Replay = Replay
+        self.__ReplaySpeed = ReplaySpeed
         
         # Connexion to the equipment
         self.Open()
@@ -46,6 +60,14 @@ class AP2XXX():
         Open connexion to AP2XXX equipment.
         This method is called by the constructor of AP2XXX class
         '''
+        from PyApex.Session import RecordingConnexion, ReplayConnexion
+        
+        if self.__Replay is not None:
+            self.Connexion = ReplayConnexion(self.__Replay, self.__ReplaySpeed)
+            self.__Connected = True
+            print("Connected successfully to the replayed session")
+            return
+        
         self.Connexion = socket.socket(socket.AF_INET , socket.SOCK_STREAM)
         self.Connexion.settimeout(10.0)
         
@@ -55,6 +77,10 @@ class AP2XXX():
         else:
             try:
                 self.Connexion.connect((self.__IPAddress, self.__PortNumber))
+                # The short commands are not delayed by the acknowledgment of the previous ones
+                self.Connexion.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                if self.__Record is not None:
+                    self.Connexion = RecordingConnexion(self.Connexion, self.__Record)
                 self.__Connected = True
                 print("Connected successfully to the equipment")
             except:
@@ -65,8 +91,6 @@ class AP2XXX():
         '''
         Close connexion to AP2XXX equipment
         '''
-        from PyApex.Constantes import APXXXX_ERROR_COMMUNICATION 
-        from PyApex.Errors import ApexError
         
         if self.__Simulation:
             self.__Connected = False
@@ -93,7 +117,6 @@ class AP2XXX():
         TimeOut is expressed in seconds
         In some functions like 'OSA.Run()', the timeout is disabled
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
         
         if not isinstance(TimeOut, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TimeOut")
@@ -115,7 +138,6 @@ class AP2XXX():
         '''
         Return string ID of AP2XXX equipment
         '''
-        from PyApex.Constantes import SimuAP2XXX_ID
         
         if self.__Simulation:
             return SimuAP2XXX_ID
@@ -129,11 +151,10 @@ class AP2XXX():
         '''
         Return the type of the OSA. For example "AP2061" for an AP2061
         '''
-        from PyApex.Errors import ApexError
         import re
         
         Type = self.GetID()
-        Type = self.__ID.split("/")[1]
+        Type = Type.split("/")[1]
         Type = "AP" + Type
         return Type
     
@@ -164,7 +185,6 @@ class AP2XXX():
         By convention, the "APEX Start" mode is always 0 index. The index follows the
         list in the AP2XXX menu box.
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
         
         TimeOut = self.Connexion.gettimeout()
         self.Connexion.settimeout(None)
@@ -262,7 +282,6 @@ class AP2XXX():
         The available bands can be listed by the 'ListBands' command
         The optical band choice is only available for AP2X8X
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
         
         if not isinstance(Band, (str)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Band")
@@ -316,6 +335,36 @@ class AP2XXX():
         return Powermeter(self, self.__Simulation)
         
         
+    def PowerSampler(self, Rate=None, BufferSize=100000, Decimation=[10, 100, 1000]):
+        '''
+        Return a PowerSampler object for the continuous logging of the embedded powermeter
+        Rate is the number of samples per second (None for the maximum rate)
+        BufferSize is the number of rows of each ring buffer
+        Decimation is the list of the number of samples of each decimated level
+        '''
+        from PyApex.AP2XXX.powersampler import PowerSampler
+        return PowerSampler(self, Rate, BufferSize, Decimation, self.__Simulation)
+        
+        
+    def CoordinatedSweep(self):
+        '''
+        Return a CoordinatedSweep object for the TLS sweeps with an OSA or a
+        powermeter acquisition
+        '''
+        from PyApex.AP2XXX.sweep import CoordinatedSweep
+        return CoordinatedSweep(self, self.__Simulation)
+        
+        
+    def Scan(self, FileName=None, FlushInterval=1.0):
+        '''
+        Return a Scan object for the N-dimensional step and measure scans
+        FileName is the optional .npy file of the results (resumable scans)
+        FlushInterval is the time in seconds between the flushes of the results on the disk
+        '''
+        from PyApex.Scan import Scan
+        return Scan(self, FileName, FlushInterval, self.__Simulation)
+        
+        
     def OsaFs(self):
         '''
         Return an OSA Fast-Sweep object for using the OSA Fast Sweep of the AP207X
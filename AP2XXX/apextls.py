@@ -1,9 +1,18 @@
 from PyApex.Common import Send, Receive
+from PyApex import Schema
 import sys
+from PyApex.Constantes import AP2XXX_TLS_COMMANDS, APXXXX_ERROR_ARGUMENT_TYPE, VACCUM_LIGHT_SPEED
+from PyApex.Errors import ApexError
 
 
 class TunableLaser():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidUnits = ("dbm", "mw")
+
+    __slots__ = ("__Connexion", "__Simulation", "__ID", "__Unit", "__WLUnit", "__Power",
+                 "__Wavelength", "__Status", "__Values", "__Cache")
+
     
     def __init__(self, Equipment, Simulation=False):
         '''
@@ -17,13 +26,13 @@ class TunableLaser():
         
         # Variables and constants of the equipment
         self.__Unit = "dBm"
-        self.__ValidUnits = ["dbm", "mw"]
         
         self.__WLUnit = "nm"
 
         self.__Power = 0.0
         self.__Wavelength = 1550.0
         self.__Status = "OFF"
+        Schema.Init(self, TunableLaser)
 
 
     def __str__(self):
@@ -38,8 +47,6 @@ class TunableLaser():
         Set the power unit of the TLS equipment
         Unit is a string which could be "dBm" for logaritmic or "mW" for linear power
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -116,8 +123,6 @@ class TunableLaser():
         Set the power of the TLS equipment
         The power is expressed in the unit defined by the GetUnit() method
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         from math import log10 as log
 
         if not isinstance(Power, (int, float)):
@@ -138,9 +143,6 @@ class TunableLaser():
         Get the power of the TLS equipment
         The returned power is expressed in the unit defined by the GetUnit() method
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         from random import random
 
         if not self.__Simulation:
@@ -161,8 +163,6 @@ class TunableLaser():
         Set the static wavelength of the TLS equipment
         The wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
 
         if not isinstance(Wavelength, (int, float)):
             self.__Connexion.close()
@@ -196,8 +196,6 @@ class TunableLaser():
         Set the static frequency of the TLS equipment
         The frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, VACCUM_LIGHT_SPEED
-        from PyApex.Errors import ApexError
 
         if not isinstance(Frequency, (int, float)):
             self.__Connexion.close()
@@ -215,7 +213,6 @@ class TunableLaser():
         Get the static frequency of the TLS equipment
         The frequency is expressed in GHz
         '''
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED
         
         if self.__Simulation:
             Frequency = VACCUM_LIGHT_SPEED / self.__Wavelength
@@ -275,153 +272,18 @@ class TunableLaser():
             Command = "TLSS\n"
             Send(self.__Connexion, Command)
     
-    def SetLaserSweep(self, Mode): 
-        if not isinstance(Mode, (int)):
-            raise TypeError('Set Sweep mode : Argument should be int')
-        
-        if not self.__Simulation:
-            Command = "TLSSW" + str(Mode) + "\n"
-            Send(self.__Connexion, Command)
-    
-    def SetStartWL(self,StartWL):
-        if not isinstance(StartWL, float):
-            raise TypeError('Set Start WL: Argument should be float')
-        
-        if not self.__Simulation:
-            Command = "TLSSTAR" + str(StartWL) + "\n"
-            Send(self.__Connexion, Command)
-    
-    def GetStartWL(self):
-        '''
-        Get the static wavelength of the TLS equipment
-        The wavelength is expressed in nm
-        '''
-        
-        if not self.__Simulation:
-            Command = "TLSSTAR?\n"               
-            Send(self.__Connexion, Command)
-            StartWL= float(Receive(self.__Connexion)[:-1])
-            
-        return StartWL
-    
-    def SetStopWL(self,StopWL):
-        if not isinstance(StopWL, float):
-            raise TypeError('Set Start WL: Argument should be float')
-        
-        if not self.__Simulation:
-            Command = "TLSSTOP" + str(StopWL) + "\n"
-            Send(self.__Connexion, Command)
-
-
-    def GetStopWL(self):
-        '''
-        Get the static wavelength of the TLS equipment
-        The wavelength is expressed in nm
-        '''
-        
-        if not self.__Simulation:
-            Command = "TLSSTOP?\n"               
-            Send(self.__Connexion, Command)
-            StartWL= float(Receive(self.__Connexion)[:-1])
-            
-        return StartWL
-    
-    def SetLaserSpeed(self,Speed):
-        if not isinstance(Speed, float):
-            raise TypeError('Set Start WL: Argument should be float')
-        
-        if not self.__Simulation:
-            Command = "TLSSPE" + str(Speed) + "\n"
-            Send(self.__Connexion, Command)
-    
-    def GetLaserSpeed(self):
-        '''
-        Get the static wavelength of the TLS equipment
-        The wavelength is expressed in nm
-        '''
-        if not self.__Simulation:
-            Command = "TLSSPE?\n"               
-            Send(self.__Connexion, Command)
-            Speed = float(Receive(self.__Connexion)[:-1])
-            
-        return Speed
-    
-    def SetContPower(self,ContPower):
-        if not isinstance(ContPower, float):
-            raise TypeError('Set Start WL: Argument should be float')
-        
-        if not self.__Simulation:
-            Command = "TLSCONTPWR" + str(ContPower) + "\n"
-            Send(self.__Connexion, Command)
-    
-    def GetContPower(self):
-        '''
-        Get the static wavelength of the TLS equipment
-        The wavelength is expressed in nm
-        '''
-        if not self.__Simulation:
-            Command = "TLSCONTPWR?\n"               
-            Send(self.__Connexion, Command)
-            ContPower = float(Receive(self.__Connexion)[:-1])
-            
-        return ContPower
-    
-    def SeStepDealy(self,StepDelay):
-        if not isinstance(StepDelay, float):
-            raise TypeError('Set Step Delay: Argument should be float')
-        
-        if not self.__Simulation:
-            Command = "TLSSTEPDELAY" + str(StepDelay) + "\n"
-            Send(self.__Connexion, Command)
-    
-    def GetStepDelay(self):
-        '''
-        Get the step delay of the TLS equipment
-        The step delay is expressed in s
-        '''
-        if not self.__Simulation:
-            Command = "TLSSTEPDELAY?\n"               
-            Send(self.__Connexion, Command)
-            StepDelay = float(Receive(self.__Connexion)[:-1])
-            
-        return StepDelay
-    
-    def SeStepNum(self,StepNum):
-        if not isinstance(StepNum, int):
-            raise TypeError('Set Step Delay: Argument should be int')
-        
-        if not self.__Simulation:
-            Command = "TLSSTEPNUM" + str(StepNum) + "\n"
-            Send(self.__Connexion, Command)
-    
-    def GetStepNum(self):
-        '''
-        Get the static wavelength of the TLS equipment
-        The wavelength is expressed in nm
-        '''
-        if not self.__Simulation:
-            Command = "TLSSTEPNUM?\n"               
-            Send(self.__Connexion, Command)
-            StepNum = int(Receive(self.__Connexion)[:-1])
-            
-        return StepNum
-    
     def Run(self, Type="single"):
         '''
         Runs a laser sweeping and returns the types of sweep (between 1 and 3)
         If Type is
             - "single" or 0, a single sweep is running (default)
             - "repeat" or 1, a repeat sweep is running
-        In this function, the connection timeout is disabled and enabled after the
-        execution of the function
+        The command has no reply: the connection timeout is not changed
         '''
         
         if self.__Simulation:
             Type = -1
         else:
-            TimeOut = self.__Connexion.gettimeout()
-            self.__Connexion.settimeout(None)
-            
             if isinstance(Type, str):
                 if Type.lower() == "single":
                     Command = "TLSSWP0\n"                    
@@ -438,8 +300,6 @@ class TunableLaser():
             #     trace = int(Receive(self.__Connexion))
             # except:
             #     trace = 0
-        
-            self.__Connexion.settimeout(TimeOut)
             
         return Type
     
@@ -455,3 +315,6 @@ class TunableLaser():
         
         
 
+
+# Accessors of the sweep parameters (SetStartWL, GetStartWL, ...)
+Schema.Generate(TunableLaser, AP2XXX_TLS_COMMANDS)
@@ -1,9 +1,13 @@
 from PyApex.Common import Send, Receive
 import sys
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
+from PyApex.Errors import ApexError
 
 
 class Filter():
 
+    __slots__ = ("__Connexion", "__Simulation", "__ID")
+
     
     def __init__(self, Equipment, Simulation=False):
         '''
@@ -47,8 +51,6 @@ class Filter():
             - State = 0 or False : the filter output is not enabled (default)
             - State = 1 or True : the filter output is enabled
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(State, (int, bool)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "State")
@@ -90,8 +92,6 @@ class Filter():
         Sets the filter static wavelength
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -130,8 +130,6 @@ class Filter():
             Mode = 1 or "single" : Only 1 filter is used (default)
             Mode = 2 or "dual" : 2 cascaded filters are used
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Mode, (int, str)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Mode")
@@ -181,8 +179,6 @@ class Filter():
         Sets the filter start wavelength for sweep
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -219,8 +215,6 @@ class Filter():
         Sets the filter start wavelength for sweep
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -259,8 +253,6 @@ class Filter():
             - "single" or 1, a single measurement is running (default)
             - "repeat" or 2, a repeat measurement is running
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Type, (int, str)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Type")
@@ -1,9 +1,27 @@
 from PyApex.Common import Send, Receive, ReceiveUntilChar
+from PyApex import Schema
 import sys
+from PyApex.Constantes import AP2XXX_OCSA_COMMANDS, AP2XXX_WLMAX, AP2XXX_WLMIN, \
+     APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, APXXXX_ERROR_BAD_FILENAME, Celerity
+from PyApex.Errors import ApexError
 
 
 class OCSA():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidScreensMode = (1, 2, 3, 4, 6, 10)
+    __ValidScreenType = ("spectrum power", "spectrum phase", "temporal power",
+                         "temporal phase", "temporal chirp", "temporal alpha",
+                         "constellation", "eye power", "eye phase")
+    __ValidPolarType = ("1+2", "1", "2")
+    __ValidScaleUnits = (0, 1)
+    __Validtracenumbers = (0, 1, 2, 3, 4, 5, 6)
+
+    __slots__ = ("__Connexion", "__Simulation", "__ID", "__Type", "__StartWavelength",
+                 "__StopWavelength", "__Span", "__Center", "__ClockFrequency",
+                 "__PatternLength", "__BaudRate", "__NPointsFFT", "__ScaleXUnit",
+                 "__ScaleYUnit", "__tracenumber", "__NAverage", "__Values", "__Cache")
+
 
     def __init__(self, Equipment, Simulation=False):
         '''
@@ -11,7 +29,6 @@ class OCSA():
         Equipment is the AP2XXX class of the equipment
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
         '''
-        from PyApex.Constantes import AP2XXX_WLMIN, AP2XXX_WLMAX   
         
         self.__Connexion = Equipment.Connexion
         self.__Simulation = Simulation
@@ -19,9 +36,6 @@ class OCSA():
         self.__Type = self.GetType()
         
         # Variables and constants of the equipment
-        self.__OpticalClockRecovery = 0
-        self.__DoubleScan = 1
-        self.__ControlModeShift = 0
         self.__StartWavelength = AP2XXX_WLMIN
         self.__StopWavelength = AP2XXX_WLMAX
         self.__Span = AP2XXX_WLMAX - AP2XXX_WLMIN
@@ -29,18 +43,12 @@ class OCSA():
         self.__ClockFrequency = 0.1 # 100 MHz
         self.__PatternLength = 2**7 - 1 # 127 symbols
         self.__BaudRate = self.__ClockFrequency * self.__PatternLength # 12.7 GHz
-        self.__ValidScreensMode = [1, 2, 3, 4, 6, 10]
-        self.__ValidScreenType = ["spectrum power", "spectrum phase", "temporal power", 
-                                  "temporal phase", "temporal chirp", "temporal alpha",
-                                  "constellation", "eye power", "eye phase"]
-        self.__ValidPolarType = ["1+2", "1", "2"]
         self.__NPointsFFT = 4096
-        self.__ValidScaleUnits = [0 , 1]
         self.__ScaleXUnit = 1
         self.__ScaleYUnit = 1
-        self.__Validtracenumbers = [0 , 1 , 2 , 3 , 4 , 5 , 6]
         self.__tracenumber = 1
         self.__NAverage = 5
+        Schema.Init(self, OCSA)
 
 
     def __str__(self):
@@ -54,7 +62,6 @@ class OCSA():
         '''
         Return the type of the OSA. For example "AP2061" for an AP2061
         '''
-        from PyApex.Errors import ApexError
         import re
         
         Type = self.__ID.split("/")[1]
@@ -62,157 +69,11 @@ class OCSA():
         return Type
 
 
-    def SetOpticalClockRecovery(self, Enable):
-        '''
-        Set the status of the optical clock recovery option
-        Enable is boolean or integer which can be:
-            - True or 1: the option is enabled
-            - False or 0: the option is disabled
-        '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE        
-        from PyApex.Errors import ApexError
-
-        if not isinstance(Enable, (bool, int)):
-            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Enable")
-            sys.exit()
-
-        if Enable:
-            Enable = 1
-        else:
-            Enable = 0
-
-        if not self.__Simulation:
-            Command = "CSPOCRECOVERY" + str(Enable) + "\n"
-            Send(self.__Connexion, Command)
-
-        self.__OpticalClockRecovery = Enable
-
-
-    def GetOpticalClockRecovery(self):
-        '''
-        Get the status of the optical clock recovery option
-        This function returns a boolean which can be:
-            - True: the option is enabled
-            - False: the option is disabled
-        '''
-        
-        if not self.__Simulation:
-            Command = "CSPOCRECOVERY?\n"
-            Send(self.__Connexion, Command)
-            try:
-                self.__OpticalClockRecovery = int(Receive(self.__Connexion)[:-1])
-            except:
-                pass
-
-        if self.__OpticalClockRecovery:
-            return True
-        else:
-            return False
-
-
-    def SetDoubleScan(self, Enable):
-        '''
-        Set the status of the double scan option
-        Enable is boolean or integer which can be:
-            - True or 1: the option is enabled
-            - False or 0: the option is disabled
-        '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE        
-        from PyApex.Errors import ApexError
-
-        if not isinstance(Enable, (bool, int)):
-            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Enable")
-            sys.exit()
-
-        if Enable:
-            Enable = 1
-        else:
-            Enable = 0
-
-        if not self.__Simulation:
-            Command = "CSPDOUBLESCAN" + str(Enable) + "\n"
-            Send(self.__Connexion, Command)
-
-        self.__DoubleScan = Enable
-
-
-    def GetDoubleScan(self):
-        '''
-        Get the status of the double scan option
-        This function returns a boolean which can be:
-            - True: the option is enabled
-            - False: the option is disabled
-        '''
-        
-        if not self.__Simulation:
-            Command = "CSPDOUBLESCAN?\n"
-            Send(self.__Connexion, Command)
-            try:
-                self.__DoubleScan = int(Receive(self.__Connexion)[:-1])
-            except:
-                pass
-
-        if self.__DoubleScan:
-            return True
-        else:
-            return False
-
-
-    def SetControlModeShift(self, Enable):
-        '''
-        Set the status of the control mode shift option
-        Enable is boolean or integer which can be:
-            - True or 1: the option is enabled
-            - False or 0: the option is disabled
-        '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE        
-        from PyApex.Errors import ApexError
-
-        if not isinstance(Enable, (bool, int)):
-            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Enable")
-            sys.exit()
-
-        if Enable:
-            Enable = 1
-        else:
-            Enable = 0
-
-        if not self.__Simulation:
-            Command = "CSPCTRLMODESHIFT" + str(Enable) + "\n"
-            Send(self.__Connexion, Command)
-
-        self.__ControlModeShift = Enable
-
-
-    def GetControlModeShift(self):
-        '''
-        Get the status of the control mode shift option
-        This function returns a boolean which can be:
-            - True: the option is enabled
-            - False: the option is disabled
-        '''
-        
-        if not self.__Simulation:
-            Command = "CSPCTRLMODESHIFT?\n"
-            Send(self.__Connexion, Command)
-            try:
-                self.__ControlModeShift = int(Receive(self.__Connexion)[:-1])
-            except:
-                pass
-
-        if self.__ControlModeShift:
-            return True
-        else:
-            return False
-
-
     def SetClockFrequency(self, Frequency):
         '''
         Set the frequency of the pattern clock (repetition frequency)
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE        
-        from PyApex.Errors import ApexError
         
         if not isinstance(Frequency, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Frequency")
@@ -244,8 +105,6 @@ class OCSA():
         Set the Length of the pattern (number of symbols)
         Length is an integer
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE        
-        from PyApex.Errors import ApexError
         
         if not isinstance(Length, (int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Length")
@@ -278,8 +137,6 @@ class OCSA():
         Set the baud rate of the modulation (number of symbols per second)
         Rate is expressed in GBaud
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE        
-        from PyApex.Errors import ApexError
         
         if not isinstance(Rate, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Rate")
@@ -312,8 +169,6 @@ class OCSA():
         Set the start wavelength of the measurement span
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE        
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -347,9 +202,6 @@ class OCSA():
         Set the start frequency of the measurement span
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import Celerity
-        from PyApex.Errors import ApexError
         
         if not isinstance(Frequency, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Frequency")
@@ -369,7 +221,6 @@ class OCSA():
         Get the start frequency of the measurement span
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import Celerity
         
         if self.__Simulation:
             Frequency = Celerity / self.__StartWavelength 
@@ -387,8 +238,6 @@ class OCSA():
         Set the stop wavelength of the measurement span
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE        
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -422,9 +271,6 @@ class OCSA():
         Set the stop frequency of the measurement span
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import Celerity
-        from PyApex.Errors import ApexError
         
         if not isinstance(Frequency, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Frequency")
@@ -444,7 +290,6 @@ class OCSA():
         Get the stop frequency of the measurement span
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import Celerity
         
         if self.__Simulation:
             Frequency = Celerity / self.__StopWavelength 
@@ -462,8 +307,6 @@ class OCSA():
         Set the wavelength measurement span
         Span is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE   
-        from PyApex.Errors import ApexError
         
         if not isinstance(Span, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Span")
@@ -497,9 +340,6 @@ class OCSA():
         Set the frequency measurement span
         Span is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import Celerity
-        from PyApex.Errors import ApexError
         
         if not isinstance(Span, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Span")
@@ -520,7 +360,6 @@ class OCSA():
         Get the frequency measurement span
         Span is expressed in GHz
         '''
-        from PyApex.Constantes import Celerity
         
         if self.__Simulation:
             Span = Celerity / self.__StopWavelength 
@@ -539,8 +378,6 @@ class OCSA():
         Set the wavelength measurement center
         Center is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         
         if not isinstance(Center, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Center")
@@ -574,9 +411,6 @@ class OCSA():
         Set the stop frequency of the measurement span
         Center is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import Celerity
-        from PyApex.Errors import ApexError
         
         if not isinstance(Center, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Center")
@@ -596,7 +430,6 @@ class OCSA():
         Get the stop frequency of the measurement span
         Frequency is expressed in GHz
         '''
-        from PyApex.Constantes import Celerity
         
         if self.__Simulation:
             Center = Celerity / self.__StopWavelength 
@@ -609,77 +442,6 @@ class OCSA():
         return Center
     
     
-    def SetAveragingValue(self, Number):
-        '''
-        Set the number of sweeps to average before displaying
-        Number is a positive integer. When Number = 1, there
-        is no averaging.
-        '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
-        
-        if not isinstance(Number, int):
-            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Number")
-            sys.exit()
-        
-        if Number <= 0:
-            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Number")
-            sys.exit()
-        
-        if not self.__Simulation:
-            Command = "CSPAVERAGING" + str(Number) + "\n"
-            Send(self.__Connexion, Command)
-    
-    
-    def GetAveragingValue(self):
-        '''
-        Get the number of averaged sweeps before displaying
-        When Number = 1, there is no averaging.
-        '''
-        
-        if self.__Simulation:
-            Averaging = 1
-        else:
-            Command = "CSPAVERAGING?\n"
-            Send(self.__Connexion, Command)
-            Averaging = int(Receive(self.__Connexion)[:-1])
-
-        return Averaging
-    
-    
-    def SetContinueAveraging(self, Enable):
-        '''
-        Enables the continue averaging option
-        Enable is a boolean:
-            - True: the option is enabled
-            - False: the option is disabled
-        '''
-        
-        Command = "CSPCONTINUEAVRG"
-        if Enable == True:
-            Command += "1\n"
-        else:
-            Command += "0\n"
-        
-        if not self.__Simulation:
-            Send(self.__Connexion, Command)
-    
-    
-    def GetContinueAveraging(self):
-        '''
-        Get the value of the continue averaging option
-        '''
-        
-        if self.__Simulation:
-            Averaging = 0
-        else:
-            Command = "CSPCONTINUEAVRG?\n"
-            Send(self.__Connexion, Command)
-            Averaging = int(Receive(self.__Connexion)[:-1])
-
-        return Averaging
-    
-    
     def GetFilterBandWidth(self):
         '''
         Get the filter bandwidth of the O.C.S.A. mode
@@ -703,9 +465,6 @@ class OCSA():
             - Unit = "nm": sweep speed is expressed in nm/s
             - Unit = "GHz": sweep speed is expressed in GHz/s
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
-        from PyApex.Constantes import Celerity
         
         if not isinstance(Unit, str):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Unit")
@@ -735,8 +494,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Mode, (int, str)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Mode")
@@ -779,8 +536,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -815,8 +570,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         
         if not isinstance(Carrier, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Carrier")
@@ -843,8 +596,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -872,9 +623,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import Celerity
-        from PyApex.Errors import ApexError
         
         if not isinstance(Carrier, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Carrier")
@@ -901,9 +649,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import Celerity
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -931,8 +676,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Number, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Number")
@@ -962,8 +705,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -991,9 +732,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import Celerity
-        from PyApex.Errors import ApexError
         
         if not isinstance(Frequency, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Frequency")
@@ -1020,9 +758,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import Celerity
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -1050,8 +785,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Number, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Number")
@@ -1081,8 +814,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -1110,9 +841,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import Celerity
-        from PyApex.Errors import ApexError
         
         if not isinstance(Frequency, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Frequency")
@@ -1139,9 +867,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import Celerity
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -1169,8 +894,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Number, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Number")
@@ -1200,8 +923,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -1229,8 +950,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(TimeShift, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TimeShift")
@@ -1257,8 +976,6 @@ class OCSA():
             - 0: Carrier mode is set for all traces (default)
             - 1 to 6: Carrier mode is set to the specified trace
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -1287,8 +1004,6 @@ class OCSA():
             - "spectrum" or 1: PhaseOrigin is applied to spectrum graphs only
             - "temporal" or 2: PhaseOrigin is applied to temporal graphs only
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(PhaseOrigin, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "PhaseOrigin")
@@ -1331,8 +1046,6 @@ class OCSA():
             - index 0: Phase origin of spectrum graphs
             - index 1: Phase origin of temporal graphs
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(GraphType, (int, str)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "GraphType")
@@ -1381,8 +1094,6 @@ class OCSA():
             - "spectrum" or 1: PhaseWrapping is applied to spectrum graphs only
             - "temporal" or 2: PhaseWrapping is applied to temporal graphs only
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(PhaseWrapping, (int, str)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "PhaseWrapping")
@@ -1440,8 +1151,6 @@ class OCSA():
             - index 0: Phase wrapping of spectrum graphs
             - index 1: Phase wrapping of temporal graphs
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(GraphType, (int, str)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "GraphType")
@@ -1501,8 +1210,6 @@ class OCSA():
             - 6 : Hexa screens mode
             - 10 : Deca screens mode
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Number, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Number")
@@ -1551,8 +1258,6 @@ class OCSA():
             - 1 or "1": Polarization 1 is selected
             - 2 or "2": Polarization 1 is selected
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Number, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Number")
@@ -1606,8 +1311,6 @@ class OCSA():
             - 's': the returned data are string (default)
             - 'i': the returned data are integer
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         from random import randint
         
         if not isinstance(Number, int):
@@ -1696,9 +1399,6 @@ class OCSA():
         '''
         from random import random
         from math import log10
-        from PyApex.Constantes import SimuAP2XXX_StartWavelength, SimuAP2XXX_StopWavelength
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         from time import sleep
         
         if not isinstance(XScale, str):
@@ -1778,7 +1478,7 @@ class OCSA():
             XData = [NPoints]       
             DeltaX = (self.__StopWavelength - self.__StartWavelength) / NPoints
             for i in range(0, NPoints):
-                if Scale.lower() == "lin":
+                if YScale.lower() == "lin":
                     PowerData.append(random())
                 else:
                     PowerData.append(80.0 * random() - 70.0)
@@ -1805,8 +1505,6 @@ class OCSA():
             - True: the trace TraceNumber is locked
             - False: the trace TraceNumber is unlocked
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
 
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -1862,8 +1560,6 @@ class OCSA():
         Clear the selected trace
         TraceNumber is an integer between 1 and 6
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
 
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -1890,8 +1586,6 @@ class OCSA():
             - Type = "ANALYSIS" : data are saved in the AnalysisData format
             - Type = "DATA" : data are saved in the SpectrumData format
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, APXXXX_ERROR_BAD_FILENAME
-        from PyApex.Errors import ApexError
         from os.path import isdir, dirname
         
         if not isinstance(TraceNumber, int):
@@ -1925,8 +1619,6 @@ class OCSA():
         Load a file with O.C.S.A. data
         FileName is a string representing the path of the data file
         '''
-        from PyApex.Constantes import APXXXX_ERROR_BAD_FILENAME
-        from PyApex.Errors import ApexError
         from os.path import isdir, dirname
         
         if not isdir(dirname(FileName)):
@@ -1937,3 +1629,7 @@ class OCSA():
             Command = "CSPLOAD_" + str(FileName) + "\n"
             Send(self.__Connexion, Command)
     
+
+
+# Simple accessors of the OCSA (see PyApex.Schema)
+Schema.Generate(OCSA, AP2XXX_OCSA_COMMANDS)
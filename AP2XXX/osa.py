@@ -1,9 +1,25 @@
-from PyApex.Common import Send, Receive, ReceiveUntilChar
+from PyApex.Common import Send, Receive, ReceiveUntilChar, recvall
+from PyApex import Schema
 import sys
+from PyApex.Constantes import AP2XXX_MAXNPTS, AP2XXX_MINNPTS, AP2XXX_OSA_COMMANDS, \
+     AP2XXX_WLMAX, AP2XXX_WLMIN, APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, \
+     APXXXX_ERROR_BAD_FILENAME
+from PyApex.Errors import ApexError
 
 
 class OSA():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidSweepResolutions = (0, 1, 2)
+    __ValidScaleUnits = (0, 1)
+    __ValidPolarizationModes = (0, 1, 2, 3)
+    __Validtracenumbers = (0, 1, 2, 3, 4, 5, 6)
+
+    __slots__ = ("__Connexion", "__Simulation", "__ID", "__Type", "__StartWavelength",
+                 "__StopWavelength", "__Span", "__Center", "__NPoints", "__ScaleXUnit",
+                 "__ScaleYUnit", "__PolarizationMode", "__tracenumber", "__NAverageOSA",
+                 "__Values", "__Cache")
+
 
     def __init__(self, Equipment, Simulation=False):
         '''
@@ -11,7 +27,6 @@ class OSA():
         Equipment is the AP2XXX class of the equipment
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
         '''
-        from PyApex.Constantes import AP2XXX_WLMIN, AP2XXX_WLMAX   
         
         self.__Connexion = Equipment.Connexion
         self.__Simulation = Simulation
@@ -23,18 +38,13 @@ class OSA():
         self.__StopWavelength = AP2XXX_WLMAX
         self.__Span = AP2XXX_WLMAX - AP2XXX_WLMIN
         self.__Center = AP2XXX_WLMIN + (self.__Span / 2)
-        self.__SweepResolution = 1.12 
-        self.__ValidSweepResolutions = [0 , 1 , 2]
         self.__NPoints = 1000
-        self.__NoiseMaskValue = -70
-        self.__ValidScaleUnits = [0 , 1]
         self.__ScaleXUnit = 1
         self.__ScaleYUnit = 1
-        self.__ValidPolarizationModes = [0 , 1 , 2 , 3]
         self.__PolarizationMode = 0
-        self.__Validtracenumbers = [0 , 1 , 2 , 3 , 4 , 5 , 6]
         self.__tracenumber = 1
         self.__NAverageOSA = 5
+        Schema.Init(self, OSA)
 
 
     def __str__(self):
@@ -48,7 +58,6 @@ class OSA():
         '''
         Return the type of the OSA. For example "AP2061" for an AP2061
         '''
-        from PyApex.Errors import ApexError
         import re
         
         Type = self.__ID.split("/")[1]
@@ -61,8 +70,6 @@ class OSA():
         Set the start wavelength of the measurement span
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE        
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -96,8 +103,6 @@ class OSA():
         Set the stop wavelength of the measurement span
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE        
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -131,8 +136,6 @@ class OSA():
         Set the wavelength measurement span
         Span is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE   
-        from PyApex.Errors import ApexError
         
         if not isinstance(Span, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Span")
@@ -166,8 +169,6 @@ class OSA():
         Set the wavelength measurement center
         Center is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         
         if not isinstance(Center, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Center")
@@ -196,74 +197,10 @@ class OSA():
         return self.__Center
 
         
-    def SetXResolution(self, Resolution):
-        '''
-        Set the wavelength measurement resolution
-        Resolution is expressed in the value of 'ScaleXUnit'
-        '''
-        if not self.__Simulation:
-            Command = "SPSWPRES" + str(Resolution) + "\n"
-            Send(self.__Connexion, Command)
-        
-        self.__SweepResolution = Resolution
-
-            
-    def GetXResolution(self):
-        '''
-        Get the wavelength measurement resolution
-        Resolution is expressed in the value of 'ScaleXUnit'
-        '''
-        
-        if not self.__Simulation:
-            Command = "SPSWPRES?\n"
-            Send(self.__Connexion, Command)
-            self.__SweepResolution = float(Receive(self.__Connexion)[:-1])
-
-        return self.__SweepResolution
-
-        
-    def SetYResolution(self, Resolution):
-        '''
-        Set the Y-axis power per division value
-        Resolution is expressed in the value of 'ScaleYUnit'
-        '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP2XXX_MINYRES, AP2XXX_MAXYRES
-        from PyApex.Errors import ApexError
-        
-        if not isinstance(Resolution, (float, int)):
-            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Resolution")
-            sys.exit()
-        if Resolution < AP2XXX_MINYRES or Resolution > AP2XXX_MAXYRES:
-            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Resolution")
-            sys.exit()
-        
-        if not self.__Simulation:
-            Command = "SPDIVY" + str(Resolution) + "\n"
-            Send(self.__Connexion, Command)
-
-            
-    def GetYResolution(self):
-        '''
-        Get the Y-axis power per division value
-        Resolution is expressed in the value of 'ScaleYUnit'
-        '''
-        
-        if not self.__Simulation:
-            Command = "SPDIVY?\n"
-            Send(self.__Connexion, Command)
-            Resolution = Receive(self.__Connexion)
-
-        return float(Resolution[:-1])
-
-        
     def SetNPoints(self, NPoints):
         '''
         Set the number of points for the measurement
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP2XXX_MINNPTS, AP2XXX_MAXNPTS 
-        from PyApex.Errors import ApexError
         
         if not isinstance(NPoints, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "NPoints")
@@ -359,9 +296,6 @@ class OSA():
         '''
         from random import random
         from math import log10
-        from PyApex.Constantes import SimuAP2XXX_StartWavelength, SimuAP2XXX_StopWavelength
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE 
-        from PyApex.Errors import ApexError
         
         if not isinstance(ScaleX, str):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "ScaleX")
@@ -410,7 +344,7 @@ class OSA():
             XData = [self.__NPoints]       
             DeltaX = (self.__StopWavelength - self.__StartWavelength) / self.__NPoints
             for i in range(0, self.__NPoints):
-                if Scale.lower() == "lin":
+                if ScaleY.lower() == "lin":
                     YData.append(random())
                 else:
                     YData.append(80.0 * random() - 70.0)
@@ -437,8 +371,7 @@ class OSA():
         from random import random
         # from math import log10
         # from PyApex.Constantes import SimuAP2XXX_StartWavelength, SimuAP2XXX_StopWavelength
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE 
-        from PyApex.Errors import ApexError
+        import numpy as np
         
         if not isinstance(ScaleX, str):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "ScaleX")
@@ -465,7 +398,7 @@ class OSA():
             Send(self.__Connexion, Command)
             ByteNumber = 4 * self.__NPoints #array of NbSamples double 
             YData = recvall(self.__Connexion, ByteNumber)
-            YData = np.array(struct.unpack('f'* self.__NPoints, YData), dtype=np.float32)
+            YData = np.frombuffer(YData, dtype=np.float32)
             
             # YStr = ReceiveUntilChar(self.__Connexion)[:-1]
             # YStr = YStr.split(" ")
@@ -483,7 +416,7 @@ class OSA():
             Send(self.__Connexion, Command)
             ByteNumber = 8 * self.__NPoints #array of NbSamples double 
             XData = recvall(self.__Connexion, ByteNumber)
-            XData = np.array(struct.unpack('d'* self.__NPoints, XData), dtype=np.double)
+            XData = np.frombuffer(XData, dtype=np.double)
             
         else:
             YData = [self.__NPoints]
@@ -514,9 +447,6 @@ class OSA():
         '''
         from random import random
         from math import log10
-        from PyApex.Constantes import SimuAP2XXX_StartWavelength, SimuAP2XXX_StopWavelength
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE 
-        from PyApex.Errors import ApexError
         
         if not self.__Simulation:
             YData = []
@@ -561,25 +491,6 @@ class OSA():
         return [YData[1:], XData[1:]]
         
     
-    def SetNoiseMask(self, NoiseMaskValue):
-        '''
-        Set the noise mask of the signal (values under this mask are set to this value)
-        Noise mask is expressed in the value of 'ScaleYUnit'
-        '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE 
-        from PyApex.Errors import ApexError
-        
-        if not isinstance(NoiseMaskValue, (float, int)):
-            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "NoiseMaskValue")
-            sys.exit()
-        
-        if not self.__Simulation:
-            Command = "SPSWPMSK" + str(NoiseMaskValue) + "\n"
-            Send(self.__Connexion, Command)
-
-        self.__NoiseMaskValue = NoiseMaskValue
-
-
     def SetScaleXUnit(self, ScaleXUnit=0):
         '''
         Defines the unit of the X-Axis
@@ -588,8 +499,6 @@ class OSA():
             - "GHz" or 0, X-Axis unit is in GHz (default)
             - "nm" or 1, X-Axis unit is in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         
         if isinstance(ScaleXUnit, str):
             if ScaleXUnit.lower() == "nm":
@@ -620,8 +529,6 @@ class OSA():
             - "lin" or 0, Y-Axis unit is in mW (default)
             - "log" or 1, Y-Axis unit is in dBm or dBm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         
         if isinstance(ScaleYUnit, str):
             if ScaleYUnit.lower() == "log":
@@ -654,8 +561,6 @@ class OSA():
             - "1" or 2, just the polarization channel 1 is measured
             - "2" or 3, just the polarization channel 2 is measured
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         
         if isinstance(PolarizationMode, str):
             if PolarizationMode.lower() == "1&2":
@@ -756,8 +661,6 @@ class OSA():
             - Find = "ALL" : all peaks are returned in a list
             - Find = "MEAN" : a mean value of all peaks is returned
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -877,9 +780,6 @@ class OSA():
         TraceNumber is an integer between 1 (default) and 6
         NbAverage is the number of average to perform after the span selection (no average by default)
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import AP2XXX_WLMIN, AP2XXX_WLMAX
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -927,8 +827,6 @@ class OSA():
         TraceNumber is an integer between 1 (default) and 6
         Position is the X-axis position of the marker expressed in the value of 'ScaleXUnit'
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -956,8 +854,6 @@ class OSA():
             Axis = 1 or 'Y' : get the Y-axis values of the markers (default)
             Axis = 2 or 'XY': get the X-axis and Y-axis values of the markers
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         
         if not isinstance(Axis, (int, str)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Axis")
@@ -1032,8 +928,6 @@ class OSA():
         Deletes all markers of a selected trace
         TraceNumber is an integer between 1 (default) and 6
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -1060,8 +954,6 @@ class OSA():
             - Get = "LEVEL" : only the line width peak level is returned
             - Get = "ALL" : all line width values are returned in a list
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -1114,8 +1006,6 @@ class OSA():
             - Type = "DAT" : data are saved in a binary format (default)
             - Type = "TXT" : data are saved in a text format
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, APXXXX_ERROR_BAD_FILENAME
-        from PyApex.Errors import ApexError
         from os.path import isdir, dirname
         
         if not isinstance(TraceNumber, int):
@@ -1151,8 +1041,6 @@ class OSA():
             - True: the trace TraceNumber is locked
             - False: the trace TraceNumber is unlocked
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, APXXXX_ERROR_BAD_FILENAME
-        from PyApex.Errors import ApexError
 
         if not isinstance(TraceNumber, int):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "TraceNumber")
@@ -1192,3 +1080,7 @@ class OSA():
             Command = "SPTRSCROLL" + str(Enable) + "\n"
             Send(self.__Connexion, Command)
     
+
+
+# Simple accessors of the OSA (see PyApex.Schema)
+Schema.Generate(OSA, AP2XXX_OSA_COMMANDS)
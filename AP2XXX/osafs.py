@@ -1,9 +1,14 @@
 from PyApex.Common import Send, Receive
 import sys
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
+from PyApex.Errors import ApexError
 
 
 class OsaFs():
 
+    __slots__ = ("__Connexion", "__Simulation", "__ID", "__StartWavelength",
+                 "__StopWavelength", "__Span", "__Center", "__Mode")
+
     
     def __init__(self, Equipment, Simulation=False):
         '''
@@ -35,8 +40,6 @@ class OsaFs():
         Set the start wavelength of the measurement span
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE        
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -70,8 +73,6 @@ class OsaFs():
         Set the stop wavelength of the measurement span
         Wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE      
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
@@ -105,8 +106,6 @@ class OsaFs():
         Set the wavelength measurement span
         Span is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE  
-        from PyApex.Errors import ApexError
         
         if not isinstance(Span, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Span")
@@ -138,8 +137,6 @@ class OsaFs():
         Set the wavelength measurement center
         Center is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Center, (float, int)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Center")
@@ -173,8 +170,6 @@ class OsaFs():
             - Mode = 1 or "Fast" : OSA Fast-Sweep will run in fast mode
             - Mode = 2 or "Sensitive" : OSA Fast-Sweep will run in high-sensitivity mode (default)
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         if isinstance(Mode, (str)):
             if str(Mode).lower() == "fast":
@@ -205,8 +200,6 @@ class OsaFs():
             - "Fast" for Fast
             - "Sensitive" for High-Sensitivity
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         if not isintance(Type, (str)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Type")
@@ -235,7 +228,6 @@ class OsaFs():
             - "single" or 1, a single measurement is running (default)
             - "repeat" or 2, a repeat measurement is running
         '''
-        from PyApex.Errors import ApexError
         
         
         if isinstance(Type, str):                  
@@ -270,8 +262,6 @@ class OsaFs():
         Get the number of points for the specified trace on the OSA Fast-Sweep
         TraceNumber is an integer between 1 (default) and 6
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Errors import ApexError
         from random import randint
         
         if not isinstance(TraceNumber, (int)):
@@ -304,8 +294,6 @@ class OsaFs():
             - "lin" : get the Y-Axis Data in mW
         TraceNumber is an integer between 1 (default) and 6
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE 
-        from PyApex.Errors import ApexError
         from random import random
         
         if not isinstance(Scale, str):
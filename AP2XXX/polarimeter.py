@@ -1,9 +1,13 @@
 from PyApex.Common import Send, Receive
 import sys
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
+from PyApex.Errors import ApexError
 
 
 class Polarimeter():
 
+    __slots__ = ("__Connexion", "__Simulation", "__ID")
+
     
     def __init__(self, Equipment, Simulation=False):
         '''
@@ -122,8 +126,6 @@ class Polarimeter():
             - Path = "full" or 0 : the polarimeter input is used (no optical filter) (default)
             - Path = "filtered" or 1 : the OSA input is used (a 170 pm optical filter is used)
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         if not self.__Simulation:
             Command = "POLPATH"
@@ -178,8 +180,6 @@ class Polarimeter():
         Sets the polarimeter wavelength. Wavelength is expressed in nm
         If the "filtered" path is used, the filter is set to the specified wavelength
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         if not isinstance(Wavelength, (int, float)):
             raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Wavelength")
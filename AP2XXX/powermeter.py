@@ -1,9 +1,16 @@
 from PyApex.Common import Send, Receive
 import sys
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_VARIABLE_NOT_DEFINED
+from PyApex.Errors import ApexError
 
 
 class Powermeter():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidUnits = ("dbm", "mw")
+
+    __slots__ = ("__Connexion", "__Simulation", "__ID", "__Unit")
+
     
     def __init__(self, Equipment, Simulation=False):
         '''
@@ -17,7 +24,6 @@ class Powermeter():
         
         # Variables and constants of the equipment
         self.__Unit = "dBm"
-        self.__ValidUnits = ["dbm", "mw"]
 
 
     def __str__(self):
@@ -32,8 +38,6 @@ class Powermeter():
         Set the power unit of the Powermeter equipment
         Unit is a string which could be "dBm" for logaritmic or "mW" for linear power
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -62,9 +66,6 @@ class Powermeter():
             - 1 : Power of polarization channel n°1
             - 2 : Power of polarization channel n°2
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         from random import random
         
         if not isinstance(Polar, (int)):
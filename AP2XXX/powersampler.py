@@ -0,0 +1,265 @@
+from PyApex.Common import Send, Receive
+import threading
+from time import perf_counter, sleep, time
+from math import nan, isnan
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
+from PyApex.Errors import ApexError
+
+
+class PowerSampler():
+    '''
+    DESCRIPTION
+        Background sampler of the powermeter embedded in an AP2XXX equipment
+        The powers (dBm) are read continuously and stored with their timestamp
+        in a ring buffer. Decimated levels keep the minimum, maximum and mean of
+        blocks of samples in other ring buffers, so that long monitorings are
+        stored in a fixed memory size:
+            - level 0: rows [timestamp, power]
+            - level k: rows [first timestamp, last timestamp, min, max, mean] of
+              Decimation[k - 1] consecutive samples
+        The statistics over any time window are computed from the finest level
+        covering the window.
+        While the sampler is running, it uses the connection of the AP2XXX equipment:
+        the other commands must be sent within Pause(), so that they are not
+        interleaved with the exchanges of the sampler.
+        This class requires the numpy module installed
+
+    VERSION
+        1.0
+    '''
+
+    __slots__ = ("__Connexion", "__Simulation", "__Rate", "__Decimation", "__Levels",
+                 "__Accumulators", "__Thread", "__Running", "__Lock", "__Exchange", "__Error")
+
+    def __init__(self, Equipment, Rate=None, BufferSize=100000, Decimation=[10, 100, 1000],
+                 Simulation=False):
+        '''
+        Constructor of a Powermeter sampler.
+        Equipment is the AP2XXX class of the equipment
+        Rate is the number of samples per second. If Rate is None, the samples are read
+        as fast as possible
+        BufferSize is the number of rows of each level
+        Decimation is the list of the number of samples of each decimated level
+        Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
+        '''
+        from PyApex.RingBuffer import RingBuffer
+
+        if not isinstance(Decimation, (list, tuple)):
+            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Decimation")
+        for d in Decimation:
+            if not isinstance(d, int) or d < 2:
+                raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Decimation")
+        if Rate is not None and (not isinstance(Rate, (float, int)) or Rate <= 0):
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Rate")
+
+        self.__Connexion = Equipment.Connexion
+        self.__Simulation = Simulation
+        self.__Rate = Rate
+        self.__Decimation = sorted(Decimation)
+        self.__Levels = [RingBuffer(BufferSize, 2)]
+        for d in self.__Decimation:
+            self.__Levels.append(RingBuffer(BufferSize, 5))
+        self.__Accumulators = [None] * len(self.__Decimation)
+        self.__Thread = None
+        self.__Running = False
+        self.__Lock = threading.Lock()
+        self.__Exchange = threading.RLock()
+        self.__Error = None
+
+
+    def __str__(self):
+        '''
+        Return the sampler description when the 'print()' function is used
+        '''
+        return "Powermeter Sampler with decimation levels " + str(self.__Decimation)
+
+
+    def GetDecimation(self):
+        '''
+        Returns the list of the number of samples of each decimated level
+        '''
+        return list(self.__Decimation)
+
+
+    def Sample(self):
+        '''
+        Reads one power (dBm) and stores it in the ring buffers
+        Returns the tuple (timestamp, power). The timestamp is expressed in seconds
+        since the epoch
+        '''
+        from random import random
+
+        if self.__Simulation:
+            Power = 60.0 * random() - 50.0
+        else:
+            with self.__Exchange:
+                Send(self.__Connexion, "SPMEASDETECTORDBM1\n")
+                Reply = Receive(self.__Connexion)
+            Power = nan
+            for p in reversed(Reply[:-1].split("_")):
+                try:
+                    Power = float(p)
+                    break
+                except:
+                    pass
+        Time = time()
+        self.Add(Time, Power)
+        return Time, Power
+
+
+    def Add(self, Time, Power):
+        '''
+        Stores a sample (timestamp, power) in the ring buffers
+        This method is called by 'Sample'. It can also be used to feed the sampler with
+        the powers read by another way
+        '''
+        with self.__Lock:
+            self.__Levels[0].Append((Time, Power))
+            if isnan(Power):
+                return
+            for Index, Size in enumerate(self.__Decimation):
+                a = self.__Accumulators[Index]
+                if a is None:
+                    a = [Time, Time, Power, Power, 0.0, 0]
+                    self.__Accumulators[Index] = a
+                a[1] = Time
+                a[2] = min(a[2], Power)
+                a[3] = max(a[3], Power)
+                a[4] += Power
+                a[5] += 1
+                if a[5] >= Size:
+                    self.__Levels[Index + 1].Append((a[0], a[1], a[2], a[3], a[4] / a[5]))
+                    self.__Accumulators[Index] = None
+
+
+    def Pause(self):
+        '''
+        Returns a context manager which suspends the exchanges of the sampler with the
+        equipment, so that other commands can be sent on the connection:
+            with MySampler.Pause():
+                MyTLS.Run()
+        '''
+        return self.__Exchange
+
+
+    def Start(self):
+        '''
+        Starts the sampling in a background thread
+        '''
+        if self.__Running:
+            return
+        self.__Running = True
+        self.__Error = None
+        self.__Thread = threading.Thread(target=self.__Run, daemon=True)
+        self.__Thread.start()
+
+
+    def Stop(self):
+        '''
+        Stops the sampling thread
+        '''
+        self.__Running = False
+        if self.__Thread is not None:
+            self.__Thread.join()
+            self.__Thread = None
+
+
+    def IsRunning(self):
+        '''
+        Returns True if the sampling thread is running, False otherwise
+        '''
+        return self.__Running
+
+
+    def GetError(self):
+        '''
+        Returns the exception which stopped the sampling thread (None if the thread has
+        not failed). The samples stored before the error are kept
+        '''
+        return self.__Error
+
+
+    def __Run(self):
+        Start = perf_counter()
+        Count = 0
+        try:
+            while self.__Running:
+                self.Sample()
+                Count += 1
+                if self.__Rate is not None:
+                    Delay = Start + Count / self.__Rate - perf_counter()
+                    if Delay > 0:
+                        sleep(Delay)
+                    else:
+                        Count = int((perf_counter() - Start) * self.__Rate)
+        except Exception as Error:
+            self.__Error = Error
+        finally:
+            self.__Running = False
+
+
+    def GetData(self, Level=0, Start=None, Stop=None):
+        '''
+        Returns the rows of a level in a NumPy array, from the oldest to the newest
+        Level 0 gives the rows [timestamp, power], the other levels give the rows
+        [first timestamp, last timestamp, min, max, mean]
+        Start and Stop are optional timestamps (seconds since the epoch) of the window
+        '''
+
+        if not isinstance(Level, int) or Level < 0 or Level >= len(self.__Levels):
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Level")
+
+        Data = self.__Levels[Level].GetData()
+        if Start is not None:
+            Data = Data[Data[:, 0] >= Start]
+        if Stop is not None:
+            Data = Data[Data[:, 1 if Level > 0 else 0] <= Stop]
+        return Data
+
+
+    def GetStats(self, Start=None, Stop=None):
+        '''
+        Returns the statistics of the powers between the timestamps Start and Stop
+        (all the stored samples if None) in a dictionary:
+            - "Level": level used for the computation
+            - "Count": number of samples
+            - "Start", "Stop": timestamps of the first and last samples
+            - "Min", "Max", "Mean": minimum, maximum and mean powers (dBm)
+        The finest level covering Start is used
+        '''
+        Level = len(self.__Levels) - 1
+        for Index, Buffer in enumerate(self.__Levels):
+            if Buffer.GetCount() <= Buffer.GetSize():
+                Level = Index
+                break
+            if Start is not None and Buffer.GetOldest()[0] <= Start:
+                Level = Index
+                break
+
+        Data = self.GetData(Level, Start, Stop)
+        if Level == 0:
+            Data = Data[Data[:, 1] == Data[:, 1]]
+            if len(Data) == 0:
+                return {"Level": 0, "Count": 0, "Start": None, "Stop": None,
+                        "Min": None, "Max": None, "Mean": None}
+            return {"Level": 0, "Count": len(Data), "Start": float(Data[0, 0]),
+                    "Stop": float(Data[-1, 0]), "Min": float(Data[:, 1].min()),
+                    "Max": float(Data[:, 1].max()), "Mean": float(Data[:, 1].mean())}
+
+        if len(Data) == 0:
+            return {"Level": Level, "Count": 0, "Start": None, "Stop": None,
+                    "Min": None, "Max": None, "Mean": None}
+        return {"Level": Level, "Count": len(Data) * self.__Decimation[Level - 1],
+                "Start": float(Data[0, 0]), "Stop": float(Data[-1, 1]),
+                "Min": float(Data[:, 2].min()), "Max": float(Data[:, 3].max()),
+                "Mean": float(Data[:, 4].mean())}
+
+
+    def Clear(self):
+        '''
+        Removes all the samples of the ring buffers
+        '''
+        with self.__Lock:
+            for Buffer in self.__Levels:
+                Buffer.Clear()
+            self.__Accumulators = [None] * len(self.__Decimation)
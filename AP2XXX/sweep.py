@@ -0,0 +1,237 @@
+import threading
+from time import time
+from math import nan
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
+from PyApex.Errors import ApexError
+
+
+class CoordinatedSweep():
+    '''
+    DESCRIPTION
+        Coordinated sweep of the TLS embedded in an AP2XXX equipment with an
+        acquisition of the OSA or of the powermeter
+        The TLS sweep is started and the acquisition runs during the sweep. The
+        end of the sweep is awaited without polling the equipment (the TLS does
+        not reply at the end of a sweep, so its duration is computed from the
+        sweep parameters):
+            - continuous mode: |Stop - Start| / Speed
+            - step mode: StepNumber * StepDelay
+        The results are aligned wavelength and power arrays.
+        While a sweep is running, it uses the connection of the AP2XXX equipment:
+        no other command should be sent to the equipment.
+        This class requires the numpy module installed
+
+    VERSION
+        1.0
+    '''
+
+    __slots__ = ("__Equipment", "__Simulation", "__TLS", "__Start", "__Stop", "__Speed",
+                 "__StepNumber", "__StepDelay", "__Margin", "__Done")
+
+    def __init__(self, Equipment, Simulation=False):
+        '''
+        Constructor of a coordinated sweep.
+        Equipment is the AP2XXX class of the equipment
+        Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
+        '''
+        self.__Equipment = Equipment
+        self.__Simulation = Simulation
+        self.__TLS = Equipment.APEXTLS()
+        self.__Start = 1530.0
+        self.__Stop = 1560.0
+        self.__Speed = 10.0
+        self.__StepNumber = None
+        self.__StepDelay = None
+        self.__Margin = 0.1
+        self.__Done = threading.Event()
+
+
+    def __str__(self):
+        '''
+        Return the coordinated sweep description when the 'print()' function is used
+        '''
+        if self.__StepNumber is None:
+            return "Coordinated Sweep from " + str(self.__Start) + " to " + str(self.__Stop) + \
+                   " nm at " + str(self.__Speed) + " nm/s"
+        return "Coordinated Sweep from " + str(self.__Start) + " to " + str(self.__Stop) + \
+               " nm in " + str(self.__StepNumber) + " steps of " + str(self.__StepDelay) + " s"
+
+
+    def Configure(self, Start, Stop, Speed=10.0, StepNumber=None, StepDelay=0.1):
+        '''
+        Configures the TLS sweep from Start to Stop (nm)
+        If StepNumber is None, the sweep is continuous at the speed Speed (nm/s).
+        Otherwise, the sweep is made of StepNumber steps of StepDelay seconds
+        '''
+
+        try:
+            Start = float(Start)
+            Stop = float(Stop)
+            Speed = float(Speed)
+            StepDelay = float(StepDelay)
+        except:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Configure")
+        if Start == Stop:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Stop")
+        if Speed <= 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Speed")
+        if StepNumber is not None and (not isinstance(StepNumber, int) or StepNumber < 2):
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "StepNumber")
+        if StepDelay <= 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "StepDelay")
+
+        self.__TLS.SetStartWL(Start)
+        self.__TLS.SetStopWL(Stop)
+        if StepNumber is None:
+            self.__TLS.SetLaserSweep(0)
+            self.__TLS.SetLaserSpeed(Speed)
+        else:
+            self.__TLS.SetLaserSweep(1)
+            self.__TLS.SeStepDealy(StepDelay)
+            self.__TLS.SeStepNum(StepNumber)
+
+        self.__Start = Start
+        self.__Stop = Stop
+        self.__Speed = Speed
+        self.__StepNumber = StepNumber
+        self.__StepDelay = StepDelay
+
+
+    def SetMargin(self, Margin):
+        '''
+        Sets the time in seconds waited after the computed end of the sweep
+        '''
+        self.__Margin = float(Margin)
+
+
+    def GetDuration(self):
+        '''
+        Returns the computed duration of the TLS sweep in seconds
+        '''
+        if self.__StepNumber is None:
+            return abs(self.__Stop - self.__Start) / self.__Speed
+        return self.__StepNumber * self.__StepDelay
+
+
+    def GetWavelengths(self, Times):
+        '''
+        Returns the wavelengths (nm) of the TLS at the times Times (seconds since the
+        start of the sweep) in a NumPy array. The times outside the sweep give NaN
+        '''
+        import numpy as np
+
+        Times = np.asarray(Times, dtype=np.float64)
+        Duration = self.GetDuration()
+        if self.__StepNumber is None:
+            Sign = 1.0 if self.__Stop > self.__Start else -1.0
+            Wavelengths = self.__Start + Sign * self.__Speed * Times
+        else:
+            Step = np.floor(Times / self.__StepDelay)
+            Wavelengths = self.__Start + Step * (self.__Stop - self.__Start) / (self.__StepNumber - 1)
+        Wavelengths[(Times < 0.0) | (Times >= Duration)] = nan
+        return Wavelengths
+
+
+    def Stop(self):
+        '''
+        Stops a running sweep (from another thread)
+        '''
+        self.__Done.set()
+
+
+    def __Sweep(self):
+        self.__Done.clear()
+        self.__TLS.On()
+        Origin = time()
+        self.__TLS.Run("single")
+        return Origin
+
+
+    def __Wait(self, Origin):
+        Remaining = Origin + self.GetDuration() + self.__Margin - time()
+        if self.__Simulation or Remaining <= 0:
+            return False
+        return self.__Done.wait(Remaining)
+
+
+    def RunPowermeter(self, Rate=None):
+        '''
+        Runs a TLS sweep while the embedded powermeter is sampled at the rate Rate
+        (samples per second, None for the maximum rate)
+        Returns a dictionary of NumPy arrays:
+            - continuous sweep: "Wavelength" and "Power" (dBm) of each sample and
+              "Time" (seconds since the start of the sweep)
+            - step sweep: "Wavelength" of each step, mean "Power" (dBm) of the samples
+              of each step and "Count" the number of samples of each step
+        The error which stops the sampler during the sweep is raised
+        '''
+        import numpy as np
+        from PyApex.AP2XXX.powersampler import PowerSampler
+
+        Duration = self.GetDuration()
+        # The ring buffer must keep all the samples of the sweep (16 bytes per sample)
+        Size = int((Duration + self.__Margin) * (Rate if Rate is not None else 100000.0)) + 1000
+        Sampler = PowerSampler(self.__Equipment, Rate, Size, [], self.__Simulation)
+        if self.__Simulation:
+            Origin = self.__Sweep()
+            for t in np.linspace(0.0, Duration, 1000, endpoint=False):
+                Sampler.Add(Origin + t, -10.0)
+        else:
+            # The sampler is running before the sweep is triggered, so that the beginning
+            # of the sweep is sampled. The TLS commands are sent between two samples
+            Sampler.Start()
+            try:
+                with Sampler.Pause():
+                    Origin = self.__Sweep()
+                Stopped = self.__Wait(Origin)
+            finally:
+                Sampler.Stop()
+            if Stopped:
+                self.__TLS.Stop()
+            if Sampler.GetError() is not None:
+                raise Sampler.GetError()
+
+        # The samples before the trigger have no wavelength (NaN) and are dropped
+        Data = Sampler.GetData()
+        Times = Data[:, 0] - Origin
+        Wavelengths = self.GetWavelengths(Times)
+        Valid = ~np.isnan(Wavelengths)
+        if self.__StepNumber is None:
+            return {"Wavelength": Wavelengths[Valid], "Power": Data[Valid, 1], "Time": Times[Valid]}
+
+        Valid &= ~np.isnan(Data[:, 1])
+        Steps = np.floor(Times[Valid] / self.__StepDelay).astype(int)
+        Count = np.bincount(Steps, minlength=self.__StepNumber)[:self.__StepNumber]
+        Sum = np.bincount(Steps, Data[Valid, 1], minlength=self.__StepNumber)[:self.__StepNumber]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            Power = Sum / Count
+        return {"Wavelength": np.linspace(self.__Start, self.__Stop, self.__StepNumber),
+                "Power": Power, "Count": Count}
+
+
+    def RunOSA(self, TraceNumber=1, Binary=True):
+        '''
+        Runs a TLS sweep and a single OSA measurement over the span of the TLS sweep
+        The OSA measurement and the end of the TLS sweep are awaited
+        Returns a dictionary of NumPy arrays "Wavelength" (nm) and "Power" (dBm)
+        Binary selects the binary transfer of the OSA trace (faster)
+        '''
+        import numpy as np
+
+        MyOSA = self.__Equipment.OSA()
+        MyOSA.SetStartWavelength(min(self.__Start, self.__Stop))
+        MyOSA.SetStopWavelength(max(self.__Start, self.__Stop))
+
+        Origin = self.__Sweep()
+        Trace = MyOSA.Run("single")
+        if self.__Wait(Origin):
+            self.__TLS.Stop()
+
+        if Trace <= 0 and not self.__Simulation:
+            return {"Wavelength": np.zeros(0), "Power": np.zeros(0)}
+        if Binary:
+            Data = MyOSA.GetDataBin("nm", "log", TraceNumber)
+        else:
+            Data = MyOSA.GetData("nm", "log", TraceNumber)
+        return {"Wavelength": np.asarray(Data[1], dtype=np.float64),
+                "Power": np.asarray(Data[0], dtype=np.float64)}
@@ -1,9 +1,17 @@
 from PyApex.Common import Send, Receive
 import sys
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, VACCUM_LIGHT_SPEED
+from PyApex.Errors import ApexError
 
 
 class TunableLaser():
 
+    # Capabilities of the equipment, shared by all the objects
+    __ValidUnits = ("dbm", "mw")
+
+    __slots__ = ("__Connexion", "__Simulation", "__ID", "__Unit", "__Power",
+                 "__Wavelength", "__Status")
+
     
     def __init__(self, Equipment, Simulation=False):
         '''
@@ -17,7 +25,6 @@ class TunableLaser():
         
         # Variables and constants of the equipment
         self.__Unit = "dBm"
-        self.__ValidUnits = ["dbm", "mw"]
 
         self.__Power = 0.0
         self.__Wavelength = 1550.0
@@ -36,8 +43,6 @@ class TunableLaser():
         Set the power unit of the TLS equipment
         Unit is a string which could be "dBm" for logaritmic or "mW" for linear power
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         
         try:
             Unit = str(Unit)
@@ -62,8 +67,6 @@ class TunableLaser():
         Set the power of the TLS equipment
         The power is expressed in the unit defined by the GetUnit() method
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
         from math import log10 as log
 
         if not isinstance(Power, (int, float)):
@@ -84,9 +87,6 @@ class TunableLaser():
         Get the power of the TLS equipment
         The returned power is expressed in the unit defined by the GetUnit() method
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
-        from PyApex.Constantes import APXXXX_ERROR_VARIABLE_NOT_DEFINED
-        from PyApex.Errors import ApexError
         from random import random
 
         if not self.__Simulation:
@@ -107,8 +107,6 @@ class TunableLaser():
         Set the static wavelength of the TLS equipment
         The wavelength is expressed in nm
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE
-        from PyApex.Errors import ApexError
 
         if not isinstance(Wavelength, (int, float)):
             self.__Connexion.close()
@@ -142,8 +140,6 @@ class TunableLaser():
         Set the static frequency of the TLS equipment
         The frequency is expressed in GHz
         '''
-        from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, VACCUM_LIGHT_SPEED
-        from PyApex.Errors import ApexError
 
         if not isinstance(Frequency, (int, float)):
             self.__Connexion.close()
@@ -161,7 +157,6 @@ class TunableLaser():
         Get the static frequency of the TLS equipment
         The frequency is expressed in GHz
         '''
-        from PyApex.Constantes import VACCUM_LIGHT_SPEED
         
         if self.__Simulation:
             Frequency = VACCUM_LIGHT_SPEED / self.__Wavelength
@@ -0,0 +1,358 @@
+'''
+Benchmark suite of the PyApex transport and data paths
+
+    The benchmarks are run against the local emulators (PyApex.Emulator), through
+    the real socket path of the drivers:
+        - OSA trace transfer, ASCII (GetData) and binary (GetDataBin)
+        - setter round trip (setter followed by the query of the value) and
+          query round trip (*IDN?)
+        - AP1000 slot discovery (SlotType of all slots or pipelined Inventory)
+        - AP1000 power meter polling rate
+        - OCSA spectrum fetch (GetSpectrum)
+        - time per call of the Python code of Send and GetPower (without
+          communication)
+        - import time of the package and of its main classes
+
+    The results are a dictionary which can be saved in a JSON file. A previous
+    result file can be used as a baseline to detect the regressions:
+
+        from PyApex import Benchmark
+
+        Results = Benchmark.Run(Sizes=[1000, 100000])
+        Benchmark.Save(Results, "results.json")
+        Regressions = Benchmark.Compare(Results, Benchmark.Load("baseline.json"))
+
+    The suite can also be run from the command line:
+        python -m PyApex.Benchmark --output results.json --baseline baseline.json
+
+    This module requires the numpy module installed
+'''
+
+import json
+import platform
+import sys
+from datetime import datetime
+from time import perf_counter
+from PyApex.Constantes import AP1000_PWM
+
+
+def Measure(Function, Repeat=5, Warmup=1):
+    '''
+    Measures the execution time of Function (without argument)
+    Function is called Warmup times without measure, then Repeat times.
+    Returns a dictionary with the minimum, median, mean and maximum times in seconds
+    '''
+    for i in range(Warmup):
+        Function()
+
+    Times = []
+    for i in range(max(int(Repeat), 1)):
+        Start = perf_counter()
+        Function()
+        Times.append(perf_counter() - Start)
+
+    Times.sort()
+    Middle = len(Times) // 2
+    if len(Times) % 2:
+        Median = Times[Middle]
+    else:
+        Median = 0.5 * (Times[Middle - 1] + Times[Middle])
+
+    return {"Repeat": len(Times), "Min": Times[0], "Median": Median,
+            "Mean": sum(Times) / len(Times), "Max": Times[-1], "Unit": "s"}
+
+
+def TraceTransfer(NPoints, Binary=False, Repeat=5, Latency=0.0, Bandwidth=None):
+    '''
+    Measures the transfer time of an AP2XXX OSA trace of NPoints points
+    If Binary is True, the trace is transferred with the binary format (GetDataBin),
+    otherwise with the ASCII format (GetData)
+    '''
+    from PyApex.AP2XXX import AP2XXX
+    from PyApex.Emulator import AP2XXXEmulator
+
+    with AP2XXXEmulator(TraceSize=NPoints, Latency=Latency, Bandwidth=Bandwidth) as Emu:
+        Equipment = AP2XXX(Emu.GetAddress(), Emu.GetPort())
+        try:
+            OSA = Equipment.OSA()
+            Trace = OSA.Run()
+            if Binary:
+                Result = Measure(lambda: OSA.GetDataBin("nm", "log", Trace), Repeat)
+            else:
+                Result = Measure(lambda: OSA.GetData("nm", "log", Trace), Repeat)
+        finally:
+            Equipment.Close()
+
+    Result["Name"] = "TraceTransfer" + ("Binary" if Binary else "ASCII")
+    Result["Points"] = NPoints
+    Result["PointsPerSecond"] = NPoints / Result["Median"] if Result["Median"] > 0 else None
+    return Result
+
+
+def SetterLatency(Count=50, Latency=0.0):
+    '''
+    Measures the round trip of a setter (OSA start wavelength), acknowledged by the
+    query of its value, and the round trip of a query (*IDN?)
+    Returns a list of 2 results, the times are given for 1 command
+    '''
+    from PyApex.AP2XXX import AP2XXX
+    from PyApex.Emulator import AP2XXXEmulator
+
+    def SetAndGet():
+        for i in range(Count):
+            OSA.SetStartWavelength(1530.0 + (i % 10))
+            OSA.GetStartWavelength()
+
+    def Query():
+        for i in range(Count):
+            Equipment.GetID()
+
+    with AP2XXXEmulator(Latency=Latency) as Emu:
+        Equipment = AP2XXX(Emu.GetAddress(), Emu.GetPort())
+        try:
+            OSA = Equipment.OSA()
+            Results = [Measure(SetAndGet, 3), Measure(Query, 3)]
+        finally:
+            Equipment.Close()
+
+    for Result, Name in zip(Results, ["SetterRoundTrip", "QueryRoundTrip"]):
+        for Key in ["Min", "Median", "Mean", "Max"]:
+            Result[Key] /= Count
+        Result["Name"] = Name
+        Result["Commands"] = Count
+    return Results
+
+
+def SlotDiscovery(SlotNumber=8, Latency=0.0, Repeat=5, Pipelined=False):
+    '''
+    Measures the time to find the type of all the slots of an AP1000 mainframe
+    Latency is the processing time of each command of the emulated mainframe
+    If Pipelined is True, the slots are read with the 'Inventory' method, otherwise
+    with the 'SlotType' method for each slot
+    '''
+    from PyApex.AP1000 import AP1000
+    from PyApex.Emulator import AP1000Emulator
+
+    def Discover():
+        if Pipelined:
+            Equipment.Inventory(Refresh=True)
+            return
+        for Slot in range(1, SlotNumber + 1):
+            Equipment.SlotType(Slot)
+
+    with AP1000Emulator(SlotNumber=SlotNumber, Latency=Latency) as Emu:
+        Equipment = AP1000(Emu.GetAddress(), Emu.GetPort())
+        try:
+            Result = Measure(Discover, Repeat)
+        finally:
+            Equipment.Close()
+
+    Result["Name"] = "SlotDiscoveryPipelined" if Pipelined else "SlotDiscovery"
+    Result["Slots"] = SlotNumber
+    Result["Latency"] = Latency
+    return Result
+
+
+def PowerMeterPolling(Duration=1.0, Latency=0.0):
+    '''
+    Measures the polling rate of an AP1000 power meter (GetPower calls during
+    Duration seconds)
+    '''
+    from PyApex.AP1000 import AP1000
+    from PyApex.Emulator import AP1000Emulator
+
+    with AP1000Emulator(Slots={1: AP1000_PWM}, Latency=Latency) as Emu:
+        Equipment = AP1000(Emu.GetAddress(), Emu.GetPort())
+        try:
+            PowerMeter = Equipment.PowerMeter(1)
+            PowerMeter.GetPower(1)
+            Count = 0
+            Start = perf_counter()
+            while perf_counter() - Start < Duration:
+                PowerMeter.GetPower(1)
+                Count += 1
+            Elapsed = perf_counter() - Start
+        finally:
+            Equipment.Close()
+
+    return {"Name": "PowerMeterPolling", "Samples": Count, "Duration": Elapsed,
+            "Rate": Count / Elapsed, "Unit": "Hz", "Latency": Latency}
+
+
+def OCSASpectrum(NModes=1000, Repeat=3, Latency=0.0):
+    '''
+    Measures the fetch time of an OCSA spectrum (power, phase and X-axis data)
+    of NModes modes
+    '''
+    from PyApex.AP2XXX import AP2XXX
+    from PyApex.Emulator import AP2XXXEmulator
+
+    with AP2XXXEmulator(TraceSize=NModes, Latency=Latency) as Emu:
+        Equipment = AP2XXX(Emu.GetAddress(), Emu.GetPort())
+        try:
+            OCSA = Equipment.OCSA()
+            Trace = OCSA.Run()
+            Result = Measure(lambda: OCSA.GetSpectrum("nm", "log", "1+2", Trace), Repeat)
+        finally:
+            Equipment.Close()
+
+    Result["Name"] = "OCSASpectrum"
+    Result["Points"] = NModes
+    return Result
+
+
+def CallOverhead(Count=100000, Repeat=5):
+    '''
+    Measures the time per call of the Python code of the drivers, without any
+    communication: Common.Send to a connection which discards the data and
+    AP1000 PowerMeter.GetPower in simulation mode
+    Returns a list of results
+    '''
+    from PyApex.AP1000 import AP1000
+    from PyApex.Common import Send
+
+    class NullConnexion():
+        def send(self, Data):
+            return len(Data)
+
+    Connexion = NullConnexion()
+    PowerMeter = AP1000("127.0.0.1", Simulation=True).PowerMeter(1)
+
+    Results = []
+    for Name, Function in [("SendOverhead", lambda: Send(Connexion, "POW[01]:DBM[1]?\n")),
+                           ("GetPowerOverhead", lambda: PowerMeter.GetPower(1))]:
+        def Loop():
+            for i in range(Count):
+                Function()
+        Result = Measure(Loop, Repeat)
+        for Key in ["Min", "Median", "Mean", "Max"]:
+            Result[Key] /= Count
+        Result["Name"] = Name
+        Result["Calls"] = Count
+        Results.append(Result)
+    return Results
+
+
+def ImportTime(Statement="from PyApex import AP2XXX", Repeat=5):
+    '''
+    Measures the execution time of the import statement Statement (string) in a new
+    Python interpreter for each measure, so that no module is already imported
+    '''
+    import os
+    import subprocess
+
+    Code = "from time import perf_counter\nStart = perf_counter()\n" + Statement + \
+           "\nprint(perf_counter() - Start)"
+    Environment = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    Times = []
+    for i in range(max(int(Repeat), 1)):
+        Times.append(float(subprocess.check_output([sys.executable, "-c", Code], env=Environment)))
+
+    Times.sort()
+    Middle = len(Times) // 2
+    if len(Times) % 2:
+        Median = Times[Middle]
+    else:
+        Median = 0.5 * (Times[Middle - 1] + Times[Middle])
+
+    return {"Name": "Import " + Statement.split()[-1], "Statement": Statement,
+            "Repeat": len(Times), "Min": Times[0], "Median": Median,
+            "Mean": sum(Times) / len(Times), "Max": Times[-1], "Unit": "s"}
+
+
+def Run(Sizes=[1000, 100000, 5000000], Repeat=5, Latency=0.0, Bandwidth=None,
+        PollingDuration=1.0, Verbose=False):
+    '''
+    Runs all the benchmarks and returns a dictionary of the results
+    Sizes is the list of the trace sizes for the ASCII and binary transfers
+    Repeat is the number of measures of each benchmark. It is reduced to 1 for
+    the traces over 1 million points
+    Latency and Bandwidth are the link performances of the emulators
+    '''
+    Results = []
+
+    def Add(Result):
+        Results.append(Result)
+        if Verbose:
+            print(Format(Result))
+
+    for NPoints in Sizes:
+        TraceRepeat = Repeat if NPoints <= 1000000 else 1
+        for Binary in [False, True]:
+            Add(TraceTransfer(NPoints, Binary, TraceRepeat, Latency, Bandwidth))
+    for Result in SetterLatency(Latency=Latency):
+        Add(Result)
+    Add(SlotDiscovery(Latency=Latency, Repeat=Repeat))
+    Add(SlotDiscovery(Latency=Latency, Repeat=Repeat, Pipelined=True))
+    Add(PowerMeterPolling(PollingDuration, Latency))
+    Add(OCSASpectrum(Repeat=min(Repeat, 3), Latency=Latency))
+    for Result in CallOverhead(Repeat=Repeat):
+        Add(Result)
+    for Statement in ["import PyApex", "from PyApex import AP2XXX", "from PyApex import AP1000"]:
+        Add(ImportTime(Statement, Repeat))
+
+    return {"Date": datetime.now().isoformat(timespec="seconds"),
+            "Python": sys.version.split()[0],
+            "Platform": platform.platform(),
+            "Latency": Latency,
+            "Bandwidth": Bandwidth,
+            "Results": Results}
+
+
+def Key(Result):
+    '''
+    Returns the identifier (string) of a benchmark result
+    '''
+    if "Points" in Result:
+        return Result["Name"] + "-" + str(Result["Points"])
+    return Result["Name"]
+
+
+def Format(Result):
+    '''
+    Returns a printable line (string) of a benchmark result
+    '''
+    if Result.get("Unit") == "Hz":
+        return "%-32s %12.1f Hz" % (Key(Result), Result["Rate"])
+    if "Calls" in Result:
+        return "%-32s %12.3f us (min %.3f us, max %.3f us)" % \
+               (Key(Result), Result["Median"] * 1e6, Result["Min"] * 1e6, Result["Max"] * 1e6)
+    return "%-32s %12.6f s (min %.6f s, max %.6f s)" % \
+           (Key(Result), Result["Median"], Result["Min"], Result["Max"])
+
+
+def Save(Results, FileName):
+    '''
+    Saves the benchmark results in the JSON file FileName
+    '''
+    with open(FileName, "w") as File:
+        json.dump(Results, File, indent=2)
+
+
+def Load(FileName):
+    '''
+    Loads the benchmark results from the JSON file FileName
+    '''
+    with open(FileName, "r") as File:
+        return json.load(File)
+
+
+def Compare(Results, Baseline, Tolerance=0.2):
+    '''
+    Compares the benchmark results with the baseline results
+    Tolerance is the accepted relative degradation (0.2 for 20 %)
+    Returns a list of tuples (benchmark identifier, baseline value, new value) of
+    the regressions. The values are the median times (s) or the rates (Hz)
+    '''
+    Reference = dict((Key(r), r) for r in Baseline["Results"])
+    Regressions = []
+    for Result in Results["Results"]:
+        Old = Reference.get(Key(Result))
+        if Old is None:
+            continue
+        if Result.get("Unit") == "Hz":
+            if Result["Rate"] < Old["Rate"] * (1.0 - Tolerance):
+                Regressions.append((Key(Result), Old["Rate"], Result["Rate"]))
+        elif Result["Median"] > Old["Median"] * (1.0 + Tolerance):
+            Regressions.append((Key(Result), Old["Median"], Result["Median"]))
+    return Regressions
@@ -0,0 +1,44 @@
+'''
+Runs the PyApex benchmark suite from the command line
+    python -m PyApex.Benchmark --output results.json
+    python -m PyApex.Benchmark --quick --baseline results.json --tolerance 0.3
+The exit code is 1 if a regression is found compared to the baseline
+'''
+
+import argparse
+import sys
+
+
+def main(Arguments=None):
+    from PyApex import Benchmark
+
+    Parser = argparse.ArgumentParser(prog="python -m PyApex.Benchmark",
+                                     description="Benchmarks of the PyApex transport and data paths")
+    Parser.add_argument("--output", default=None, help="JSON file of the results")
+    Parser.add_argument("--baseline", default=None, help="JSON file of the baseline results")
+    Parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="accepted relative degradation (default 0.2)")
+    Parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 5000000],
+                        help="trace sizes (default 1000 100000 5000000)")
+    Parser.add_argument("--quick", action="store_true", help="only 1000 and 100000 points traces")
+    Parser.add_argument("--repeat", type=int, default=5, help="number of measures (default 5)")
+    Parser.add_argument("--latency", type=float, default=0.0, help="emulated command latency in s")
+    Parser.add_argument("--bandwidth", type=float, default=None, help="emulated link rate in bytes/s")
+    Args = Parser.parse_args(Arguments)
+
+    Sizes = [s for s in Args.sizes if s <= 100000] if Args.quick else Args.sizes
+    Results = Benchmark.Run(Sizes, Args.repeat, Args.latency, Args.bandwidth, Verbose=True)
+    if Args.output is not None:
+        Benchmark.Save(Results, Args.output)
+
+    if Args.baseline is not None:
+        Regressions = Benchmark.Compare(Results, Benchmark.Load(Args.baseline), Args.tolerance)
+        for Name, Old, New in Regressions:
+            print("Regression", Name, ":", Old, "->", New)
+        if Regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import threading
+from math import nan
+from PyApex.Errors import ApexError
+
+
+class BoardManager():
+    '''
+    DESCRIPTION
+        Manager of all the Apex USB boards connected to the computer
+        All the AB3510 (photodetectors) and AB3380 (filters) boards are opened.
+        Each AB3510 board streams its samples in its own reader thread and another
+        thread per board reads its temperature, so that the USB transfers of the
+        boards run concurrently. The timestamped streams of the boards are merged
+        and resampled on a common time grid:
+            columns 0 to 3: channels of the first AB3510 board
+            columns 4 to 7: channels of the second AB3510 board, ...
+        This class requires the numpy module installed
+
+    VERSION
+        1.0
+    '''
+
+    def __init__(self, Simulation=False, BoardNumber=1):
+        '''
+        Constructor of the board manager.
+        Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
+        BoardNumber is the number of simulated AB3510 boards (simulation mode only)
+        '''
+        from PyApex.AB3510 import AB3510
+        from PyApex.AB3380 import AB3380
+
+        self.__Simulation = Simulation
+        self.__Photodetectors = []
+        self.__Filters = []
+
+        if Simulation:
+            for i in range(BoardNumber):
+                self.__Photodetectors.append(AB3510(True))
+        else:
+            for Class, Boards in [(AB3510, self.__Photodetectors), (AB3380, self.__Filters)]:
+                try:
+                    Board = Class(False)
+                except ApexError:
+                    continue
+                Number = len(Board.Find())
+                Boards.append(Board)
+                if Number > 1:
+                    Board.Open(0)
+                    for Handle in range(1, Number):
+                        Board = Class(False)
+                        Board.Open(Handle)
+                        Boards.append(Board)
+
+        self.__Temperatures = [nan] * len(self.__Photodetectors)
+        self.__TemperatureInterval = 1.0
+        self.__Threads = []
+        self.__Running = False
+        self.__StopEvent = threading.Event()
+
+
+    def __str__(self):
+        '''
+        Return the manager description when the 'print()' function is used
+        '''
+        return "Board Manager of " + str(len(self.__Photodetectors)) + " AB3510 and " + \
+               str(len(self.__Filters)) + " AB3380 boards"
+
+
+    def GetPhotodetectors(self):
+        '''
+        Returns the list of the AB3510 objects
+        '''
+        return list(self.__Photodetectors)
+
+
+    def GetFilters(self):
+        '''
+        Returns the list of the AB3380 objects
+        '''
+        return list(self.__Filters)
+
+
+    def Start(self, BufferSize=1000000, Bulk=True, TemperatureInterval=1.0):
+        '''
+        Starts the streaming acquisition of all the AB3510 boards and the reading of their
+        temperature every TemperatureInterval seconds
+        BufferSize and Bulk are the parameters of AB3510.StartStreaming
+        '''
+        if self.__Running:
+            return
+        self.__TemperatureInterval = float(TemperatureInterval)
+        self.__StopEvent.clear()
+        self.__Running = True
+        for Index, Board in enumerate(self.__Photodetectors):
+            Board.StartStreaming(BufferSize, Bulk)
+            Thread = threading.Thread(target=self.__ReadTemperature, args=(Index,), daemon=True)
+            Thread.start()
+            self.__Threads.append(Thread)
+
+
+    def Stop(self):
+        '''
+        Stops the acquisitions of all the boards
+        '''
+        if not self.__Running:
+            return
+        self.__StopEvent.set()
+        for Thread in self.__Threads:
+            Thread.join()
+        self.__Threads = []
+        for Board in self.__Photodetectors:
+            Board.StopStreaming()
+        self.__Running = False
+
+
+    def IsRunning(self):
+        '''
+        Returns True if the acquisitions are running, False otherwise
+        '''
+        return self.__Running
+
+
+    def Close(self):
+        '''
+        Stops the acquisitions and closes all the boards
+        '''
+        self.Stop()
+        for Board in self.__Photodetectors + self.__Filters:
+            Board.Close()
+
+
+    def __ReadTemperature(self, Index):
+        Board = self.__Photodetectors[Index]
+        while True:
+            try:
+                self.__Temperatures[Index] = Board.GetTemperature()
+            except Exception:
+                self.__Temperatures[Index] = nan
+            if self.__StopEvent.wait(self.__TemperatureInterval):
+                break
+
+
+    def GetTemperatures(self):
+        '''
+        Returns the list of the last temperatures (degree Celsius) of the AB3510 boards
+        '''
+        return list(self.__Temperatures)
+
+
+    def GetStats(self):
+        '''
+        Returns the list of the streaming statistics of the AB3510 boards
+        (see AB3510.GetStreamStats)
+        '''
+        return [Board.GetStreamStats() for Board in self.__Photodetectors]
+
+
+    def GetData(self, Duration=None, Rate=None, Calibrated=False):
+        '''
+        Returns the merged streams of the AB3510 boards in a tuple (Times, Data):
+            - Times is an array of shape (N,) of timestamps in seconds since the epoch
+            - Data is an array of shape (N, 4 * number of AB3510 boards)
+        The samples of each board are linearly interpolated on a common time grid
+        which covers the last Duration seconds (or the whole time range common to all
+        the boards if Duration is None) at Rate samples per second (by default, the
+        lowest achieved rate of the boards)
+        If Calibrated is True, the data are the calibrated powers (see AB3510.Calibrate),
+        otherwise the raw sample values
+        '''
+        import numpy as np
+
+        Width = 4 * len(self.__Photodetectors)
+        Streams = [Board.GetStreamTimedData() for Board in self.__Photodetectors]
+        if len(Streams) == 0 or min(len(Times) for Times, Samples in Streams) < 2:
+            return np.zeros(0), np.zeros((0, Width))
+
+        Start = max(Times[0] for Times, Samples in Streams)
+        Stop = min(Times[-1] for Times, Samples in Streams)
+        if Duration is not None:
+            Start = max(Start, Stop - float(Duration))
+        if Rate is None:
+            Rates = [(len(Times) - 1) / (Times[-1] - Times[0]) for Times, Samples in Streams
+                     if Times[-1] > Times[0]]
+            Rate = min(Rates) if len(Rates) > 0 else nan
+        if not Stop > Start or not Rate > 0:
+            return np.zeros(0), np.zeros((0, Width))
+
+        Grid = np.arange(Start, Stop, 1.0 / Rate)
+        Data = np.empty((len(Grid), Width))
+        for Index, (Board, (Times, Samples)) in enumerate(zip(self.__Photodetectors, Streams)):
+            if Calibrated:
+                Samples = Board.Calibrate(Samples)
+            for Channel in range(4):
+                Data[:, 4 * Index + Channel] = np.interp(Grid, Times, Samples[:, Channel])
+        return Grid, Data
@@ -0,0 +1,333 @@
+import threading
+from time import time
+from math import nan
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE, \
+     APXXXX_ERROR_COMMUNICATION
+from PyApex.Errors import ApexError
+
+
+class Campaign():
+    '''
+    DESCRIPTION
+        Temperature campaign scheduler of an Etuve
+        The campaign steps the set point of the Etuve through a list of temperatures.
+        On each plateau, the stability of the Etuve is awaited from the temperatures
+        decoded by the Etuve monitor (see Etuve.WaitStable) instead of fixed delays,
+        then all the measures are run. As soon as the measures of a plateau are done,
+        the set point of the next plateau is sent: the results of the plateau and the
+        temperature log are written by a writer thread while the Etuve ramps.
+        The results are stored incrementally in a directory:
+            - "plateau_XXX.npz": the results of the measures of the plateau XXX
+            - "temperatures.bin": the log of the Etuve temperatures (float64 rows
+              [timestamp, actual temperature, set point temperature])
+            - "campaign.json": the temperatures, the progress and the description of
+              the done plateaus (stabilisation time, temperature during the measures)
+        so that an interrupted campaign can be resumed.
+        This class requires the numpy module installed
+
+    VERSION
+        1.0
+    '''
+
+    def __init__(self, Etuve, Directory, Tolerance=0.5, Duration=300.0, Timeout=None):
+        '''
+        Constructor of a temperature campaign.
+        Etuve is the Etuve class of the equipment
+        Directory is the directory of the results
+        Tolerance (degree Celsius) and Duration (seconds) are the stability criterion of
+        the plateaus (see Etuve.WaitStable)
+        Timeout is the maximum time in seconds to wait for the stability of a plateau
+        (None for no limit). After the timeout, the measures are run and the plateau is
+        marked as not stable
+        '''
+
+        if Tolerance <= 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Tolerance")
+        if Duration < 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Duration")
+
+        self.__Etuve = Etuve
+        self.__Directory = str(Directory)
+        self.__Tolerance = float(Tolerance)
+        self.__Duration = float(Duration)
+        self.__Timeout = None if Timeout is None else float(Timeout)
+        self.__Measures = []
+        self.__Temperatures = []
+        self.__Plateaus = []
+        self.__LogTime = 0.0
+        self.__Running = False
+        self.__Queue = None
+        self.__Writer = None
+        self.__WriteError = None
+
+
+    def __str__(self):
+        '''
+        Return the campaign description when the 'print()' function is used
+        '''
+        return "Temperature Campaign of " + str(len(self.__Measures)) + " measures on " + \
+               str(len(self.__Temperatures)) + " plateaus"
+
+
+    def AddMeasure(self, Name, Getter):
+        '''
+        Adds a measure run on each plateau
+        Name is the name of the measure
+        Getter is a function returning a number, a sequence or a dictionary of sequences,
+        for example MyOSA.GetPower or MySweep.RunOSA. The dictionary values are stored as
+        Name + "_" + key
+        '''
+
+        if not callable(Getter):
+            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Getter")
+        if str(Name) in self.GetMeasures():
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Name")
+        self.__Measures.append((str(Name), Getter))
+
+
+    def GetMeasures(self):
+        '''
+        Returns the list of the names of the measures
+        '''
+        return [Measure[0] for Measure in self.__Measures]
+
+
+    def GetProgress(self):
+        '''
+        Returns the tuple (number of done plateaus, total number of plateaus)
+        '''
+        return len(self.__Plateaus), len(self.__Temperatures)
+
+
+    def GetPlateaus(self):
+        '''
+        Returns the list of the descriptions of the done plateaus. Each description is a
+        dictionary:
+            - "Temperature": set point temperature of the plateau
+            - "Stable": True if the Etuve was stable before and during the measures
+            - "StabilisationTime": time in seconds from the set point to the stability
+            - "Start", "Stop": timestamps of the measures
+            - "Mean", "Min", "Max": actual temperatures during the measures
+            - "File": file of the results
+        '''
+        return [dict(Plateau) for Plateau in self.__Plateaus]
+
+
+    def GetResults(self, Index):
+        '''
+        Returns the results of the plateau Index in a dictionary {name: NumPy array}
+        '''
+        import os
+        import numpy as np
+
+        with np.load(os.path.join(self.__Directory, self.__Plateaus[Index]["File"])) as Data:
+            return dict((Name, Data[Name]) for Name in Data.files)
+
+
+    def GetTemperatureLog(self):
+        '''
+        Returns the log of the Etuve temperatures in a NumPy array of shape (N, 3):
+        timestamp, actual temperature and set point temperature
+        '''
+        import os
+        import numpy as np
+
+        FileName = os.path.join(self.__Directory, "temperatures.bin")
+        if not os.path.isfile(FileName):
+            return np.zeros((0, 3))
+        return np.fromfile(FileName, dtype=np.float64).reshape(-1, 3)
+
+
+    def GetWriteError(self):
+        '''
+        Returns the exception which stopped the writer thread of the last run (None if
+        the results have been written without error)
+        '''
+        return self.__WriteError
+
+
+    def Stop(self):
+        '''
+        Stops a running campaign (from another thread) after the current plateau
+        The campaign can be continued with Run(Temperatures, Resume=True)
+        '''
+        self.__Running = False
+
+
+    def __Description(self):
+        return {"Temperatures": self.__Temperatures, "Measures": self.GetMeasures(),
+                "Tolerance": self.__Tolerance, "Duration": self.__Duration,
+                "Plateaus": self.__Plateaus, "LogTime": self.__LogTime}
+
+
+    def __Open(self, Resume):
+        import json
+        import os
+
+        if not os.path.isdir(self.__Directory):
+            os.makedirs(self.__Directory)
+        Progress = os.path.join(self.__Directory, "campaign.json")
+        self.__Plateaus = []
+        self.__LogTime = 0.0
+        if Resume and os.path.isfile(Progress):
+            with open(Progress, "r") as File:
+                Description = json.load(File)
+            if Description["Temperatures"] != self.__Temperatures or \
+               Description["Measures"] != self.GetMeasures():
+                raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Directory")
+            self.__Plateaus = Description["Plateaus"]
+            self.__LogTime = float(Description["LogTime"])
+        else:
+            Log = os.path.join(self.__Directory, "temperatures.bin")
+            if os.path.isfile(Log):
+                os.remove(Log)
+            self.__Save()
+
+
+    def __Save(self):
+        import json
+        import os
+
+        Progress = os.path.join(self.__Directory, "campaign.json")
+        with open(Progress + ".tmp", "w") as File:
+            json.dump(self.__Description(), File)
+        os.replace(Progress + ".tmp", Progress)
+
+
+    def __SaveLog(self):
+        import os
+
+        History = self.__Etuve.GetHistory()
+        History = History[History[:, 0] > self.__LogTime]
+        if len(History) == 0:
+            return
+        with open(os.path.join(self.__Directory, "temperatures.bin"), "ab") as File:
+            History.tofile(File)
+        self.__LogTime = float(History[-1, 0])
+
+
+    def __Write(self):
+        import os
+        import numpy as np
+
+        try:
+            while True:
+                Item = self.__Queue.get()
+                if Item is None:
+                    break
+                Plateau, Results = Item
+                FileName = os.path.join(self.__Directory, Plateau["File"])
+                with open(FileName + ".tmp", "wb") as File:
+                    np.savez(File, **Results)
+                os.replace(FileName + ".tmp", FileName)
+                self.__SaveLog()
+                self.__Plateaus.append(Plateau)
+                self.__Save()
+        except Exception as Error:
+            # The campaign stops after the current plateau and Run raises the error
+            self.__WriteError = Error
+            self.__Running = False
+
+
+    def __Measure(self):
+        import numpy as np
+
+        Results = {}
+        for Name, Getter in self.__Measures:
+            Value = Getter()
+            if isinstance(Value, dict):
+                for Key in Value:
+                    Results[Name + "_" + str(Key)] = np.asarray(Value[Key])
+            else:
+                Results[Name] = np.asarray(Value)
+        return Results
+
+
+    def __WaitStable(self, Temperature, SetTime):
+        # Only the temperatures decoded after the set point are used
+        while self.__Running:
+            if not self.__Etuve.IsMonitoring():
+                raise ApexError(APXXXX_ERROR_COMMUNICATION, "Etuve monitor")
+            Remaining = 1.0
+            if self.__Timeout is not None:
+                Remaining = min(Remaining, SetTime + self.__Timeout - time())
+                if Remaining <= 0:
+                    return False
+            if self.__Etuve.WaitStable(self.__Tolerance, self.__Duration, Temperature, Remaining,
+                                       SetTime):
+                return True
+        return False
+
+
+    def Run(self, Temperatures, Resume=False):
+        '''
+        Runs the campaign on the set point temperatures Temperatures (degree Celsius)
+        The Etuve monitor is started if it is not running. An ApexError is raised if the
+        monitor stops during the campaign (the campaign can be resumed). If the results
+        cannot be written, the campaign stops and the error of the writer thread is raised
+        (see GetWriteError)
+        If Resume is True, the campaign continues after the last done plateau
+        Returns the list of the descriptions of the done plateaus (see GetPlateaus)
+        '''
+        import queue
+
+        if len(self.__Measures) == 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Measures")
+        self.__Temperatures = [float(Temperature) for Temperature in Temperatures]
+        if len(self.__Temperatures) == 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Temperatures")
+
+        self.__Open(Resume)
+        if not self.__Etuve.IsMonitoring():
+            self.__Etuve.StartMonitor()
+
+        self.__Queue = queue.Queue()
+        self.__WriteError = None
+        self.__Writer = threading.Thread(target=self.__Write, daemon=True)
+        self.__Writer.start()
+        self.__Running = True
+        try:
+            Index = len(self.__Plateaus)
+            if Index < len(self.__Temperatures):
+                self.__Etuve.SetConsigneTemp(self.__Temperatures[Index])
+            SetTime = time()
+            while self.__Running and Index < len(self.__Temperatures):
+                Temperature = self.__Temperatures[Index]
+                Stable = self.__WaitStable(Temperature, SetTime)
+                if not self.__Running:
+                    break
+                Start = time()
+                Results = self.__Measure()
+                Stop = time()
+
+                # The ramp to the next plateau starts before the results are written
+                if Index + 1 < len(self.__Temperatures):
+                    self.__Etuve.SetConsigneTemp(self.__Temperatures[Index + 1])
+                NextSetTime = time()
+
+                Actual = self.__Etuve.GetHistory()
+                Actual = Actual[(Actual[:, 0] >= Start) & (Actual[:, 0] <= Stop), 1]
+                if len(Actual) == 0:
+                    Latest = self.__Etuve.Latest()
+                    Actual = [nan] if Latest is None else [Latest[1]]
+                Mean, Min, Max = sum(Actual) / len(Actual), min(Actual), max(Actual)
+                Stable = Stable and Max - Temperature <= self.__Tolerance and \
+                         Temperature - Min <= self.__Tolerance
+                Plateau = {"Temperature": Temperature, "Stable": bool(Stable),
+                           "StabilisationTime": Start - SetTime,
+                           "Start": Start, "Stop": Stop, "Mean": float(Mean),
+                           "Min": float(Min), "Max": float(Max),
+                           "File": "plateau_" + str(Index).zfill(3) + ".npz"}
+                self.__Queue.put((Plateau, Results))
+                SetTime = NextSetTime
+                Index += 1
+        finally:
+            self.__Running = False
+            self.__Queue.put(None)
+            self.__Writer.join()
+            if self.__WriteError is None:
+                self.__SaveLog()
+                self.__Save()
+        if self.__WriteError is not None:
+            raise self.__WriteError
+        return self.GetPlateaus()
@@ -1,35 +1,80 @@
 
+from PyApex import Instrumentation
+from socket import timeout
+from time import perf_counter
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_BADCOMMAND, \
+     APXXXX_ERROR_COMMUNICATION
+from PyApex.Errors import ApexError
+
+# Commands buffered for the corked connections (see Cork)
+Corked = {}
+
+
+def Cork(Connexion):
+    '''
+    Starts buffering the commands sent to Connexion. The buffered commands are
+    sent at once by the next receive function, by Flush or by Uncork, so that
+    a group of setters and the following query are sent in one write
+    '''
+    Corked.setdefault(id(Connexion), [])
+
+
+def Flush(Connexion):
+    '''
+    Sends at once the commands buffered for the corked connection Connexion
+    '''
+    Commands = Corked.get(id(Connexion))
+    if Commands:
+        Corked[id(Connexion)] = []
+        __Write(Connexion, "".join(Commands))
+
+
+def Uncork(Connexion):
+    '''
+    Sends the buffered commands and stops buffering the commands sent to Connexion
+    '''
+    Flush(Connexion)
+    Corked.pop(id(Connexion), None)
+
+
 def Send(Connexion, Command):
-    from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_BADCOMMAND 
-    from PyApex.Errors import ApexError
-    from sys import exit
-    from socket import timeout
-    
     if not isinstance(Command, str):
         Connexion.close()
         raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Command")
+    if Corked and id(Connexion) in Corked:
+        Corked[id(Connexion)].append(Command)
+        return
+    __Write(Connexion, Command)
+
+
+def __Write(Connexion, Command):
     try:
-        Connexion.send(Command.encode('utf-8'))
+        if Instrumentation.Enabled:
+            Start = perf_counter()
+            Connexion.send(Command.encode('utf-8'))
+            Instrumentation.OnSend(Connexion, Command, Start, perf_counter())
+        else:
+            Connexion.send(Command.encode('utf-8'))
     except timeout:
         Connexion.close()
         raise ApexError(APXXXX_ERROR_BADCOMMAND, Command)
 
 
 def Receive(Connexion, ByteNumber=1024):
-    from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_COMMUNICATION 
-    from PyApex.Errors import ApexError
-    from sys import exit
-    from socket import timeout
-    
     if not isinstance(ByteNumber, int):
         Connexion.close()
         raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "ByteNumber")
+    if Corked:
+        Flush(Connexion)
     try:
         data = Connexion.recv(ByteNumber)
     except timeout:
         Connexion.close()
         raise ApexError(APXXXX_ERROR_COMMUNICATION, Connexion.getsockname()[0])
     else:
+        if Instrumentation.Enabled:
+            End = perf_counter()
+            Instrumentation.OnReceive(Connexion, len(data), End, End)
         return data.decode('utf-8')
 
 # Python Socket Receive Large Amount of Data
@@ -45,42 +90,45 @@ def recvall(Connexion, ByteNumber):
     #     data.extend(packet)
     # return data
     
-    from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_COMMUNICATION 
-    from PyApex.Errors import ApexError
-    # from sys import exit
-    from socket import timeout
     
     if not isinstance(ByteNumber, int):
         Connexion.close()
         raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "ByteNumber")
+    if Corked:
+        Flush(Connexion)
     try: 
         # Helper function to recv n bytes or return None if EOF is hit
         data = bytearray()
+        First = None
         while len(data) < ByteNumber:    
             packet = Connexion.recv(ByteNumber - len(data))
             if not packet:
                 return None
+            if First is None:
+                First = perf_counter()
             data.extend(packet) 
     except timeout:
             Connexion.close()
             raise ApexError(APXXXX_ERROR_COMMUNICATION, Connexion.getsockname()[0])
     else: 
+            if Instrumentation.Enabled and First is not None:
+                Instrumentation.OnReceive(Connexion, len(data), First, perf_counter())
             return data   
 
 
 def ReceiveUntilChar(Connexion, EndCharacter = "\n"):
-    from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_COMMUNICATION 
-    from PyApex.Errors import ApexError
-    from sys import exit
-    from socket import timeout
-    
     if not isinstance(EndCharacter, str):
         Connexion.close()
         raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "EndCharacter")
+    if Corked:
+        Flush(Connexion)
     try:
         data_total = ""
+        First = None
         while True:
             data = (Connexion.recv(1024)).decode('utf-8')
+            if First is None:
+                First = perf_counter()
             if data.find(EndCharacter) >= 0:
                 data_total += data[:data.find(EndCharacter)] + EndCharacter
                 break
@@ -90,4 +138,44 @@ def ReceiveUntilChar(Connexion, EndCharacter = "\n"):
         Connexion.close()
         raise ApexError(APXXXX_ERROR_COMMUNICATION, Connexion.getsockname()[0])
     else:
+        if Instrumentation.Enabled:
+            Instrumentation.OnReceive(Connexion, len(data_total), First, perf_counter())
         return data_total
+
+
+def ReceiveLines(Connexion, LineNumber, EndCharacter = "\n"):
+    '''
+    Receives LineNumber replies ended by EndCharacter
+    This function is used to read the replies of pipelined commands (several
+    commands sent at once). Returns a list of strings without EndCharacter
+    '''
+    
+    if not isinstance(LineNumber, int):
+        Connexion.close()
+        raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "LineNumber")
+    if not isinstance(EndCharacter, str):
+        Connexion.close()
+        raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "EndCharacter")
+    
+    End = EndCharacter.encode('utf-8')
+    data = bytearray()
+    Count = 0
+    First = None
+    if Corked:
+        Flush(Connexion)
+    try:
+        while Count < LineNumber:
+            packet = Connexion.recv(65536)
+            if not packet:
+                break
+            if First is None:
+                First = perf_counter()
+            Count += packet.count(End)
+            data.extend(packet)
+    except timeout:
+        Connexion.close()
+        raise ApexError(APXXXX_ERROR_COMMUNICATION, Connexion.getsockname()[0])
+    
+    if Instrumentation.Enabled and First is not None:
+        Instrumentation.OnReceive(Connexion, len(data), First, perf_counter())
+    return data.decode('utf-8').split(EndCharacter)[:LineNumber]
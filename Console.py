@@ -1,8 +1,14 @@
 from PyApex import AP2XXX, AP1000
+from PyApex.Common import Send
 import threading
-from time import sleep
+import selectors
+import socket
+import queue
+from time import perf_counter
 
 Equipments = []
+Current = [None]
+
 
 def __Menu():
     
@@ -30,50 +36,51 @@ def __Menu():
     return Choice
 
 
-def __ConnectAP2XXX():
+def __AddEquipment(Equipment, IP, Type, Receiver):
+
+    EquipmentData = {}
+    EquipmentData['equipment'] = Equipment
+    EquipmentData['ip'] = IP
+    EquipmentData['type'] = Type
+    EquipmentData['hex'] = False
+    EquipmentData['buffer'] = bytearray()
+    EquipmentData['replies'] = queue.Queue(1000)
+    Equipment.SetTimeOut(0.5)
+    Equipments.append(EquipmentData)
+    Receiver.Add(EquipmentData)
+
+
+def __ConnectAP2XXX(Receiver):
 
-    global Equipments
     IP = input("Enter IP Address of the AP2XXX: ")
     
     Equipment = AP2XXX(str(IP))
     if Equipment.IsConnected():
-        EquipmentData = {}
-        EquipmentData['equipment'] = Equipment
-        EquipmentData['ip'] = IP
-        EquipmentData['type'] = Equipment.GetType()
-        Equipment.SetTimeOut(0.5)
-        Equipments.append(EquipmentData)
+        __AddEquipment(Equipment, IP, Equipment.GetType(), Receiver)
 
 
-def __ConnectAP1000():
+def __ConnectAP1000(Receiver):
 
-    global Equipments
     IP = input("Enter IP Address of the AP1000: ")
     
     Equipment = AP1000(str(IP))
     if Equipment.IsConnected():
-        EquipmentData = {}
-        EquipmentData['equipment'] = Equipment
-        EquipmentData['ip'] = IP
-        EquipmentData['type'] = "AP1000"
-        Equipment.SetTimeOut(0.5)
-        Equipments.append(EquipmentData)
+        __AddEquipment(Equipment, IP, "AP1000", Receiver)
 
 
-def __CloseConnection(Number = 0):
+def __CloseConnection(Receiver, Number = 0):
     
-    global Equipments
     if Number >= 0 and Number < len(Equipments):
+        Receiver.Remove(Equipments[Number])
         try:
             Equipments[Number]['equipment'].Close()
-            Equipments.remove(Number)
         except:
             pass
+        del Equipments[Number]
 
 
 def __SelectEquipment(Action):
     
-    global Equipments
     N = 1
     
     for e in Equipments:
@@ -90,72 +97,167 @@ def __SelectEquipment(Action):
     return Number
 
 
-def __Run(equipment):
+def __RunScript(Equipment, FileName, TimeOut = 2.0):
+    '''
+    Sends the commands of the file FileName (one per line, '#' for the comments)
+    and displays the time of each command. The time of a query (command containing
+    '?') is the time until its first reply
+    '''
+    try:
+        with open(FileName, "r") as File:
+            Lines = [Line.strip() for Line in File]
+    except OSError:
+        print("Cannot open the file " + str(FileName))
+        return
+
+    Replies = Equipment['replies']
+    Total = perf_counter()
+    for Line in Lines:
+        if Line == "" or Line.startswith("#"):
+            continue
+        while not Replies.empty():
+            Replies.get_nowait()
+        Start = perf_counter()
+        Send(Equipment['equipment'].Connexion, Line + "\n")
+        Status = ""
+        if "?" in Line:
+            try:
+                Replies.get(timeout=TimeOut)
+            except queue.Empty:
+                Status = "  (no reply)"
+        print("[" + format((perf_counter() - Start) * 1000.0, "9.2f") + " ms] " + Line + Status)
+    print("Script done in " + format(perf_counter() - Total, ".3f") + " s")
+
+
+def __Run(Index, Receiver):
     
     print("To display help, press 'help' at prompt")
     print("To exit the software, press 'quit' at prompt")
     print()
 
-    RecThread = __ReceiveThread(equipment['equipment'].Connexion, 0.2, 1024)
-    RecThread.start()
-
-    cmd = input(equipment['type'] + "@" + equipment['ip'] + "> ")
-    try:
-        cmd = str(cmd)
-    except:
-        cmd = ""
-
-    while cmd.lower() != 'quit':
-    
-        if cmd.lower() == 'help':
-            DisplayHelp()
+    Current[0] = Equipments[Index]
+    while True:
+        equipment = Current[0]
+        try:
+            cmd = str(input(equipment['type'] + "@" + equipment['ip'] + "> "))
+        except EOFError:
+            break
+        Words = cmd.split(None, 1)
+        Keyword = Words[0].lower() if len(Words) > 0 else ""
+
+        if cmd.strip() == "":
+            continue
+        elif Keyword == 'quit':
+            break
+        elif Keyword == 'help':
+            __DisplayHelp()
+        elif Keyword == 'hex':
+            equipment['hex'] = not equipment['hex']
+            print("Hexadecimal display " + ("ON" if equipment['hex'] else "OFF"))
+        elif Keyword == 'sessions':
+            for N, e in enumerate(Equipments):
+                print(("* " if e is equipment else "  ") + str(N + 1) + ". " + e['type'] + " on " + e['ip'])
+        elif Keyword == 'use' and len(Words) > 1:
+            try:
+                Current[0] = Equipments[int(Words[1]) - 1]
+            except (ValueError, IndexError):
+                print("Invalid session number")
+        elif Keyword == 'run' and len(Words) > 1:
+            __RunScript(equipment, Words[1].strip())
         else:
             if cmd[-1] != '\n':
                 cmd += '\n'
-            equipment['equipment'].Connexion.send(cmd.encode('utf-8'))
+            try:
+                Send(equipment['equipment'].Connexion, cmd)
+            except Exception as Error:
+                print(Error)
+
+    Current[0] = None
+
 
-        sleep(0.2)
-        cmd = input(equipment['type'] + "@" + equipment['ip'] + "> ")
+def HexDump(Data, Offset = 0):
+    '''
+    Returns the hexadecimal dump (16 bytes per line) of the bytes Data
+    '''
+    Lines = []
+    for i in range(0, len(Data), 16):
+        Chunk = bytes(Data[i:i + 16])
+        Hex = " ".join(format(b, "02X") for b in Chunk)
+        Text = "".join(chr(b) if 32 <= b < 127 else "." for b in Chunk)
+        Lines.append(format(Offset + i, "08X") + "  " + Hex.ljust(48) + "  " + Text)
+    return "\n".join(Lines)
 
-    RecThread.stop()
-    RecThread.join()
 
+class __Receiver(threading.Thread):
+    '''
+    Thread echoing the replies of all the connected equipments as soon as they
+    arrive. The sockets of the equipments are watched with a selector
+    '''
 
-class __ReceiveThread(threading.Thread):
-    
-    def __init__(self, Connexion, SleepTime, BytesNb = 1024):
-        threading.Thread.__init__(self)
-        self.Connexion = Connexion
-        self.SleepTime = SleepTime
-        self.BytesNb = BytesNb
+    def __init__(self):
+        threading.Thread.__init__(self, daemon = True)
+        self.Selector = selectors.DefaultSelector()
+        self.WakeUp, self.Signal = socket.socketpair()
+        self.Selector.register(self.WakeUp, selectors.EVENT_READ, None)
         self.Running = True
-      
-    def run(self):
-        while self.Running:        
-            RecvString = self.ReceiveData()
-            if RecvString != "":
-                print(RecvString)
-            sleep(self.SleepTime)
-    
-    def ReceiveData(self):
+
+    def Add(self, Equipment):
         try:
-            finish = False
-            RecvString = ""
-            while not finish:
-                rstr = self.Connexion.recv(self.BytesNb)
-                if chr(rstr[len(rstr) - 1]) == '\n':
-                    finish = True
-                RecvString += rstr.decode('utf-8')
-        except:
+            self.Selector.register(Equipment['equipment'].Connexion, selectors.EVENT_READ, Equipment)
+        except (ValueError, AttributeError):
+            print("The replies of this connection cannot be displayed")
+        self.Signal.send(b"\0")
+
+    def Remove(self, Equipment):
+        try:
+            self.Selector.unregister(Equipment['equipment'].Connexion)
+        except (KeyError, ValueError):
             pass
+        self.Signal.send(b"\0")
 
-        return RecvString
+    def run(self):
+        while self.Running:
+            for Key, Events in self.Selector.select():
+                if Key.data is None:
+                    self.WakeUp.recv(1024)
+                    continue
+                try:
+                    Data = Key.fileobj.recv(65536)
+                except (BlockingIOError, socket.timeout):
+                    continue
+                except OSError:
+                    Data = b""
+                if Data == b"":
+                    print("Connection closed by " + Key.data['type'] + " on " + Key.data['ip'])
+                    self.Selector.unregister(Key.fileobj)
+                    continue
+                self.Echo(Key.data, Data)
+
+    def Echo(self, Equipment, Data):
+        Prefix = ""
+        if Current[0] is not Equipment:
+            Prefix = "[" + Equipment['type'] + "@" + Equipment['ip'] + "] "
+        if Equipment['hex']:
+            print(Prefix + "\n" + HexDump(Data) if Prefix else HexDump(Data))
+            try:
+                Equipment['replies'].put_nowait(Data)
+            except queue.Full:
+                pass
+            return
+
+        Equipment['buffer'] += Data
+        *Lines, Rest = Equipment['buffer'].split(b"\n")
+        Equipment['buffer'] = bytearray(Rest)
+        for Line in Lines:
+            print(Prefix + Line.decode('utf-8', 'replace').rstrip("\r"))
+            try:
+                Equipment['replies'].put_nowait(Line)
+            except queue.Full:
+                pass
 
     def stop(self):
         self.Running = False
-
-    def IsRunning(self):
-        return self.Running
+        self.Signal.send(b"\0")
 
 
 def __DisplayHelp():
@@ -163,10 +265,15 @@ def __DisplayHelp():
     print()
     print("--------------------------------------------------------------------------")
     print("This is a terminal for communicating asynchronously with APEX equipments")
+    print("The replies of all the connected equipments are displayed as they arrive")
     print("Press 'quit' to exit from the terminal and return to the main menu")
     print("Press 'help' to display this help")
+    print("Press 'sessions' to list the connected equipments")
+    print("Press 'use N' to communicate with the equipment N")
+    print("Press 'hex' to display the replies in hexadecimal (or back in text)")
+    print("Press 'run FILE' to send the commands of a file and display their times")
     print("Any other command will be send to the connected equipment") 
-    print("If no '\n' is present at the end of the command, it is automatically added")
+    print("If no '\\n' is present at the end of the command, it is automatically added")
     print("--------------------------------------------------------------------------")
     print()
 
@@ -175,28 +282,34 @@ def Terminal():
     '''
     Terminal is a small program to communicate with AP2XXX and AP1000 equipments.
     It acts as a standard terminal. Send data and read answers.
+    The replies of all the connected equipments are displayed as soon as they arrive
     '''
 
+    Receiver = __Receiver()
+    Receiver.start()
+
     Loop = True
     while Loop:
 
         Choice = __Menu()
     
         if Choice == 1:
-            __ConnectAP2XXX()
+            __ConnectAP2XXX(Receiver)
         
         elif Choice == 2:
-            __ConnectAP1000()
+            __ConnectAP1000(Receiver)
 
         elif Choice == 3:
             Index = __SelectEquipment("Communicate with")
-            __Run(Equipments[Index])
+            if 0 <= Index < len(Equipments):
+                __Run(Index, Receiver)
         
         elif Choice == 4:
             Index = __SelectEquipment("Close")
-            __CloseConnection(Index)
+            __CloseConnection(Receiver, Index)
         
         elif Choice == 0:
             Loop = False
 
-
+    Receiver.stop()
+    Receiver.join()
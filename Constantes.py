@@ -1,15 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-# ------------------------------------------------------------------------------
-#                                       IMPORTS
-# ------------------------------------------------------------------------------
-
-try:
-    from serial import EIGHTBITS, PARITY_NONE, STOPBITS_ONE
-except:
-    pass
-
 # ------------------------------------------------------------------------------
 #                                  UNIVERSAL CONSTANTS
 # ------------------------------------------------------------------------------
@@ -175,6 +166,61 @@ AP2XXX_MAXYRES = 100
 AP2XXX_MINNPTS = 2
 AP2XXX_MAXNPTS = 1000000
 
+# Commands of the TLS embedded in the AP2XXX (see PyApex.Schema)
+# (name, mnemonic, type, minimum, maximum, default, description, setter name, getter name,
+#  argument name of the setter)
+AP2XXX_TLS_COMMANDS = [
+    ("StartWL", "TLSSTAR", float, AP2XXX_WLMIN, AP2XXX_WLMAX, 1530.0,
+     "start wavelength of the TLS sweep in nm", None, None, "StartWL"),
+    ("StopWL", "TLSSTOP", float, AP2XXX_WLMIN, AP2XXX_WLMAX, 1560.0,
+     "stop wavelength of the TLS sweep in nm", None, None, "StopWL"),
+    ("LaserSpeed", "TLSSPE", float, 0.0, None, 10.0,
+     "speed of the continuous TLS sweep in nm/s", None, None, "Speed"),
+    ("ContPower", "TLSCONTPWR", float, None, None, 0.0,
+     "output power of the TLS sweep", None, None, "ContPower"),
+    ("StepDelay", "TLSSTEPDELAY", float, 0.0, None, 0.0,
+     "delay of each step of the TLS step sweep in s", "SeStepDealy", None, "StepDelay"),
+    ("StepNum", "TLSSTEPNUM", int, 1, None, 100,
+     "number of steps of the TLS step sweep", "SeStepNum", None, "StepNum"),
+    ("LaserSweep", "TLSSW", int, 0, None, 0,
+     "TLS sweep mode: 0 for a continuous sweep, 1 for a step sweep", None, False, "Mode"),
+]
+
+# Commands of the OSA mode of the AP2XXX
+AP2XXX_OSA_COMMANDS = [
+    ("XResolution", "SPSWPRES", float, None, None, 1.12,
+     "wavelength measurement resolution in the unit of the X-axis (see SetScaleXUnit)",
+     None, None, "Resolution"),
+    ("YResolution", "SPDIVY", float, AP2XXX_MINYRES, AP2XXX_MAXYRES, 2.0,
+     "power per division of the Y-axis in the unit of the Y-axis (see SetScaleYUnit)",
+     None, None, "Resolution"),
+    ("NoiseMask", "SPSWPMSK", float, None, None, -70.0,
+     "noise mask of the signal in the unit of the Y-axis (the values under the mask "
+     "are set to the mask)", None, False, "NoiseMaskValue"),
+]
+
+# Commands of the OCSA mode of the AP2XXX
+AP2XXX_OCSA_COMMANDS = [
+    ("OpticalClockRecovery", "CSPOCRECOVERY", bool, None, None, False,
+     "status (True or False) of the optical clock recovery option", None, None, "Enable"),
+    ("DoubleScan", "CSPDOUBLESCAN", bool, None, None, True,
+     "status (True or False) of the double scan option", None, None, "Enable"),
+    ("ControlModeShift", "CSPCTRLMODESHIFT", bool, None, None, False,
+     "status (True or False) of the control mode shift option", None, None, "Enable"),
+    ("AveragingValue", "CSPAVERAGING", int, 1, None, 1,
+     "number of averaged sweeps before displaying (1 for no averaging)", None, None,
+     "Number"),
+    ("ContinueAveraging", "CSPCONTINUEAVRG", bool, None, None, False,
+     "status (True or False) of the continue averaging option", None, None, "Enable"),
+]
+
+# Commands of the AP2XXX replying one line without '?' (sweeps, traces and measures)
+AP2XXX_REPLY_MNEMONICS = ("SPSWP", "SPDATAD", "SPDATAL", "SPDATAWL", "SPDATAF", "SPFPGASD",
+                          "SPFPGASWL", "SPDATAMKRX", "SPDATAMKRY", "SPLWTH",
+                          "SPMEASDETECTORDBM", "CSPSWP", "CSPSPECTRD", "CSPSPECTRL",
+                          "CSPSPECTRPHI", "CSPSPECTRWL", "CSPSPECTRF", "OSAFSPOINTS",
+                          "OSAFSDATAD", "OSAFSDATAL", "OSAFSDATAWL")
+
 # ------------------------------------------------------------------------------
 #                                   AB3510 CONSTANTS
 # ------------------------------------------------------------------------------
@@ -199,6 +245,17 @@ AB3510_VR_WRITE_EEPROM = 0xC1
 AB3510_VR_READ_EEPROM = 0xC2
 # OTHER CONSTANTS
 AB3510_PTS_NB = 100
+AB3510_EP_STREAM = 0x86
+AB3510_STREAM_BLOCK = 512
+# EEPROM LAYOUT (NumPy structured dtype description, little endian, packed)
+AB3510_EEPROM_SIZE = 3500
+AB3510_EEPROM_PAGE = 64
+AB3510_EEPROM_LAYOUT = [("sn", "S20"), ("firmware", "S7"), ("hardware", "S7"),
+                        ("ch", [("powers", "<f4", (AB3510_PTS_NB,)),
+                                ("values", "<i2", (AB3510_PTS_NB,)),
+                                ("tempcoeff", "<f4", (2,)),
+                                ("wavecoeff", "<f4", (2,))], (4,)),
+                        ("checksum", "<u4")]
 
 # ------------------------------------------------------------------------------
 #                                   AB3380 CONSTANTS
@@ -220,19 +277,23 @@ AB3380_VR_MAX_VOLTAGE1 = 0xC5
 AB3380_VR_MAX_VOLTAGE2 = 0xC6
 # OTHER CONSTANTS
 AB3380_PTS_NB = 84
+# EEPROM LAYOUT (NumPy structured dtype description, little endian, packed)
+# The wavelengths are stored in pm
+AB3380_EEPROM_SIZE = 1200
+AB3380_EEPROM_LAYOUT = [("sn", "S20"), ("version", "<i2", (2,)), ("wltransition", "<f4", (2,)),
+                        ("wavelength", "<f4", (AB3380_PTS_NB,)), ("dac", "<f4", (2, AB3380_PTS_NB)),
+                        ("checksum", "<u4")]
 
 # ------------------------------------------------------------------------------
 #                               ETUVE CONSTANTS
 # ------------------------------------------------------------------------------
 
-try:
-    ETUVE_BAUDRATE = 9600
-    ETUVE_NBITS = EIGHTBITS
-    ETUVE_PARITY = PARITY_NONE
-    ETUVE_STOPBIT = STOPBITS_ONE
-    ETUVE_FLOWCONTROL = False
-except:
-    pass
+# Values of the serial module constants EIGHTBITS, PARITY_NONE and STOPBITS_ONE
+ETUVE_BAUDRATE = 9600
+ETUVE_NBITS = 8
+ETUVE_PARITY = 'N'
+ETUVE_STOPBIT = 1
+ETUVE_FLOWCONTROL = False
 
 
 # ------------------------------------------------------------------------------
@@ -244,6 +305,7 @@ APXXXX_ERROR_BADCOMMAND = -2
 APXXXX_ERROR_ARGUMENT_TYPE = -11
 APXXXX_ERROR_ARGUMENT_VALUE = -12
 APXXXX_ERROR_BAD_FILENAME = -13
+APXXXX_ERROR_REPLAY = -14
 APXXXX_ERROR_VARIABLE_NOT_DEFINED = -301
 AP1000_ERROR_SLOT_NOT_DEFINED = -151
 AP1000_ERROR_SLOT_NOT_GOOD_TYPE = -152
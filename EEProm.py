@@ -0,0 +1,100 @@
+'''
+Codec of the EEProm images of the Apex USB boards (AB3510, AB3380)
+
+    The layout of an EEProm image is described by a NumPy structured dtype
+    (see AB3510_EEPROM_LAYOUT and AB3380_EEPROM_LAYOUT in PyApex.Constantes).
+    The whole image is decoded in one np.frombuffer call and encoded in one
+    tobytes call. The last field of a layout is a CRC32 checksum of the
+    previous bytes.
+    To rewrite only the modified parts of an EEProm, ChangedPages gives the
+    pages which differ between two images.
+
+        from PyApex import EEProm
+        Record, ChecksumOK = EEProm.Decode(Data, AB3510_EEPROM_LAYOUT)
+        Record["ch"]["powers"][1] += 0.1
+        Image = EEProm.Encode(Record)
+        Pages = EEProm.ChangedPages(Data, Image, 64)
+
+    This module requires the numpy module installed
+'''
+
+from zlib import crc32
+
+import numpy as np
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_VALUE
+from PyApex.Errors import ApexError
+
+
+def Size(Layout):
+    '''
+    Returns the size in bytes of an image of the layout Layout
+    '''
+    return np.dtype(Layout).itemsize
+
+
+def Empty(Layout):
+    '''
+    Returns an empty record (all the fields to 0) of the layout Layout
+    The record is a NumPy array of shape () which fields are read and written
+    with Record["field"]
+    '''
+    return np.zeros((), dtype=np.dtype(Layout))
+
+
+def Checksum(Image):
+    '''
+    Returns the checksum of the bytes Image without its last 4 bytes (the checksum field)
+    '''
+    return crc32(bytes(Image[:-4])) & 0xFFFFFFFF
+
+
+def Decode(Data, Layout):
+    '''
+    Decodes the EEProm data Data (bytes or array of bytes) with the layout Layout
+    Returns a tuple (Record, ChecksumOK). Record is a writable record of the layout
+    and ChecksumOK is True if the checksum field matches the data
+    '''
+
+    DType = np.dtype(Layout)
+    Data = bytes(Data)
+    if len(Data) < DType.itemsize:
+        raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Data")
+
+    Record = np.frombuffer(Data, DType, 1).reshape(()).copy()
+    ChecksumOK = Checksum(Data[:DType.itemsize]) == int(Record["checksum"])
+    return Record, ChecksumOK
+
+
+def Encode(Record):
+    '''
+    Encodes the record Record into an EEProm image (bytes) and sets its checksum field
+    '''
+    Record["checksum"] = 0
+    Image = bytearray(Record.tobytes())
+    Record["checksum"] = Checksum(Image)
+    Image[-4:] = Record["checksum"].tobytes()
+    return bytes(Image)
+
+
+def String(Field):
+    '''
+    Returns the string of a bytes field without its null characters
+    '''
+    return bytes(Field).replace(b"\x00", b"").decode("latin-1")
+
+
+def ChangedPages(Old, New, PageSize=64):
+    '''
+    Returns the list of the numbers of the pages of PageSize bytes which differ between
+    the images Old and New. If the images have different sizes, all the pages of New
+    are returned
+    '''
+    Old = np.frombuffer(bytes(Old), dtype=np.uint8)
+    New = np.frombuffer(bytes(New), dtype=np.uint8)
+    PageNumber = (len(New) + PageSize - 1) // PageSize
+    if len(Old) != len(New):
+        return list(range(PageNumber))
+
+    Padding = PageNumber * PageSize - len(New)
+    Diff = np.concatenate((Old != New, np.zeros(Padding, dtype=bool)))
+    return np.flatnonzero(Diff.reshape(PageNumber, PageSize).any(axis=1)).tolist()
@@ -0,0 +1,32 @@
+'''
+Local TCP emulators of Apex equipments
+
+    PyApex.Emulator.AP2XXXEmulator emulates an AP2XXX OSA or OCSA
+    "help(PyApex.Emulator.AP2XXXEmulator)" for more details
+
+    PyApex.Emulator.AP1000Emulator emulates an AP1000 mainframe and its modules
+    "help(PyApex.Emulator.AP1000Emulator)" for more details
+
+    The emulators listen on a local TCP port and answer the commands sent by
+    the PyApex drivers through the real socket path. They can be used to test
+    and benchmark the drivers on a computer without any equipment:
+
+        from PyApex import AP2XXX
+        from PyApex.Emulator import AP2XXXEmulator
+
+        with AP2XXXEmulator(TraceSize=100000, Latency=0.001) as Emu:
+            MyAP2XXX = AP2XXX("127.0.0.1", Emu.GetPort())
+            MyOSA = MyAP2XXX.OSA()
+            Data = MyOSA.GetData()
+            MyAP2XXX.Close()
+
+    An emulator can also be started from the command line:
+        python -m PyApex.Emulator ap2xxx --port 5900 --points 100000
+        python -m PyApex.Emulator ap1000 --port 5900 --latency 0.002
+
+    These classes require the numpy module installed
+'''
+
+from PyApex.Emulator.server import Emulator
+from PyApex.Emulator.ap2xxx import AP2XXXEmulator
+from PyApex.Emulator.ap1000 import AP1000Emulator
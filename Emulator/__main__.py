@@ -0,0 +1,54 @@
+'''
+Starts an Apex equipment emulator from the command line
+    python -m PyApex.Emulator ap2xxx --port 5900 --points 100000 --latency 0.001
+    python -m PyApex.Emulator ap1000 --port 5900 --slots 1:3314 2:3350 3:3364
+'''
+
+import argparse
+from time import sleep
+
+
+def main(Arguments=None):
+    from PyApex.Emulator import AP2XXXEmulator, AP1000Emulator
+
+    Parser = argparse.ArgumentParser(prog="python -m PyApex.Emulator",
+                                     description="Local TCP emulator of Apex equipments")
+    Parser.add_argument("equipment", choices=["ap2xxx", "ap1000"], help="type of the emulated equipment")
+    Parser.add_argument("--ip", default="127.0.0.1", help="listening IP address (default 127.0.0.1)")
+    Parser.add_argument("--port", type=int, default=5900, help="listening TCP port (default 5900)")
+    Parser.add_argument("--latency", type=float, default=0.0, help="processing time of a command in s")
+    Parser.add_argument("--bandwidth", type=float, default=None, help="maximum reply rate in bytes/s")
+    Parser.add_argument("--points", type=int, default=1000, help="number of points of the traces")
+    Parser.add_argument("--sweep-time", type=float, default=0.0, help="duration of a sweep in s")
+    Parser.add_argument("--slots", nargs="*", default=None, metavar="SLOT:MODULE",
+                        help="AP1000 slot population, for example 1:3314 2:3350")
+    Parser.add_argument("--slot-number", type=int, default=8, help="number of AP1000 slots (default 8)")
+    Args = Parser.parse_args(Arguments)
+
+    if Args.equipment == "ap1000":
+        Slots = None
+        if Args.slots is not None:
+            Slots = {}
+            for Item in Args.slots:
+                Slot, Module = Item.split(":", 1)
+                Slots[int(Slot)] = int(Module) if Module.isdigit() else Module
+        Emu = AP1000Emulator(Args.ip, Args.port, Slots=Slots, SlotNumber=Args.slot_number,
+                             Latency=Args.latency, Bandwidth=Args.bandwidth,
+                             SweepTime=Args.sweep_time)
+    else:
+        Emu = AP2XXXEmulator(Args.ip, Args.port, TraceSize=Args.points, Latency=Args.latency,
+                             Bandwidth=Args.bandwidth, SweepTime=Args.sweep_time)
+
+    Emu.Start()
+    print("Emulator", Args.equipment.upper(), "listening on", Args.ip + ":" + str(Emu.GetPort()))
+    try:
+        while True:
+            sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        Emu.Stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,392 @@
+import re
+from math import exp
+from time import perf_counter
+
+import numpy as np
+
+from PyApex.Emulator.server import Emulator
+from PyApex.Constantes import VACCUM_LIGHT_SPEED, AP1000_PWM, AP1000_TLS_CBAND, AP1000_TLS_LBAND, \
+     AP1000_ATT, AP1000_OSW, AP1000_EFA, AP1000_FIL, AP1000_DFB_CBAND, AP1000_DFB_LBAND, \
+     AP1000_DFB_OBAND, AP1000_POL
+
+
+def Notch(Wavelength):
+    '''
+    Default device under test of the AP1000 emulator: a 20 dB notch filter
+    centered at 1545 nm with 1 dB of insertion loss. Returns the loss in dB
+    '''
+    return 1.0 + 20.0 * exp(-((Wavelength - 1545.0) / 0.5)**2)
+
+
+class AP1000Emulator(Emulator):
+    '''
+    DESCRIPTION
+        TCP emulator of an AP1000 mainframe and its modules
+        The emulator answers the commands of the PyApex.AP1000 driver:
+            - mainframe commands (*IDN?, SLT[xx]:EMPTY?, SLT[xx]:IDN?, ...)
+            - power meters (POW[xx]:..., POWB[xx]:...)
+            - tunable lasers (TLS[xx]:...) with single and repeat sweeps
+            - attenuators, amplifiers, filters, DFB lasers, switches and
+              polarimeters (ATT, AMP, FLT, DFB, SWI, POL)
+            - OSA module (OSA[xx]:...) with the DATAX and DATAY transfers
+        All the other setters are stored and returned by the corresponding queries.
+
+        The power measured by the power meters and polarimeters follows a
+        simple optical model: the output of the first TLS or DFB switched on
+        goes through the device under test (Transmission function, loss in dB
+        versus wavelength in nm) and through the attenuators.
+        The TLS sweep speed (TSWES) is considered in nm/s.
+
+    VERSION
+        1.0
+    '''
+
+    # Module command parser: FAMILY[slot]:NAME[channel]arguments
+    __Parser = re.compile(r"^([A-Za-z0-9]+?)\[(\d+)\]:([A-Za-z]+?)(?:\[(\d+)\])?([-+0-9.;,?].*|)$")
+
+    # Queries names of the setters when they differ
+    __Aliases = {("POW", "SETWAVELENGTH"): "WAV", ("POWB", "SETWAVELENGTH"): "WAV"}
+
+    # Families of the laser modules
+    __Lasers = {AP1000_TLS_CBAND: "TLS", AP1000_TLS_LBAND: "TLS", AP1000_DFB_CBAND: "DFB",
+                AP1000_DFB_LBAND: "DFB", AP1000_DFB_OBAND: "DFB"}
+
+    # Options field of the module references (PWM channels, ATT channels, switch type)
+    __Options = {AP1000_PWM: "13-", AP1000_ATT: "2-", AP1000_OSW: "1x4-"}
+
+    # Default slot population
+    __DefaultSlots = {1: AP1000_PWM, 2: AP1000_TLS_CBAND, 3: AP1000_ATT, 4: AP1000_OSW,
+                      5: AP1000_EFA, 6: AP1000_FIL, 7: AP1000_DFB_CBAND, 8: AP1000_POL}
+
+    def __init__(self, IPaddress="127.0.0.1", PortNumber=0, Slots=None, SlotNumber=8,
+                 Latency=0.0, Bandwidth=None, SweepTime=0.0, Transmission=Notch):
+        '''
+        Constructor of an AP1000 emulator.
+        IPaddress and PortNumber are the address of the emulator (see Emulator class)
+        Slots is a dictionary {slot number: module}. The module is the module
+        reference (integer, for example 3314 for a power meter) or the complete ID
+        string of the module. By default, the 8 slots are populated with a power
+        meter, a TLS, an attenuator, a switch, an amplifier, a filter, a DFB laser
+        and a polarimeter
+        SlotNumber is the number of slots of the mainframe (2, 5 or 8)
+        Latency is the processing time (float in seconds or dictionary) of the commands.
+        For example, Latency={"": 0.001, "IDN?": 0.010} sets 10 ms for the ID queries
+        and 1 ms for all other commands
+        Bandwidth is the maximum rate of the replies (bytes per second)
+        SweepTime is the duration in seconds of an OSA module sweep
+        Transmission is a function returning the loss in dB of the device under test
+        for a wavelength in nm
+        '''
+        Emulator.__init__(self, IPaddress, PortNumber, Latency, Bandwidth)
+
+        self.__SlotNumber = int(SlotNumber)
+        self.__SweepTime = float(SweepTime)
+        self.__Transmission = Transmission
+        self.__Random = np.random.RandomState(0)
+        self.__Sweeps = {}
+        self.__OSASweeps = {}
+
+        self.Slots = {}
+        if Slots is None:
+            Slots = dict((s, m) for s, m in self.__DefaultSlots.items() if s <= self.__SlotNumber)
+        for Slot, Module in Slots.items():
+            self.SetSlot(Slot, Module)
+
+        self.Parameters = {}
+        self.Defaults = {
+            ("POW", "WAV"): "1550.000",
+            ("POW", "SETAVERAGE"): "100",
+            ("POWB", "WAV"): "1550.000",
+            ("POWB", "SETAVERAGE"): "100",
+            ("TLS", "TPDB"): "0.0",
+            ("TLS", "TWL"): "1550.000",
+            ("TLS", "L"): "0",
+            ("TLS", "TSWM"): "0",
+            ("TLS", "TSTAWL"): "1530.000",
+            ("TLS", "TSTPWL"): "1560.000",
+            ("TLS", "TSWES"): "1.00",
+            ("TLS", "TLIMIT"): "0",
+            ("DFB", "TPDB"): "0.0",
+            ("DFB", "TWL"): "1550.000",
+            ("DFB", "L"): "0",
+            ("ATT", "DB"): "0.0",
+            ("AMP", "INDB"): "-10.0",
+            ("AMP", "OTDB"): "15.0",
+            ("AMP", "MODE"): "0",
+            ("AMP", "AUTOPOWER"): "10.0",
+            ("AMP", "AUTOGAIN"): "20.0",
+            ("FLT", "TWL"): "1550.000",
+            ("FLT", "TFR"): "%.3f" % (VACCUM_LIGHT_SPEED / 1550.0),
+            ("FLT", "WLMIN"): "1525.000",
+            ("FLT", "WLMAX"): "1635.000",
+            ("FLT", "FRMIN"): "%.3f" % (VACCUM_LIGHT_SPEED / 1635.0),
+            ("FLT", "FRMAX"): "%.3f" % (VACCUM_LIGHT_SPEED / 1525.0),
+            ("FLT", "TSTAWL"): "1525.000",
+            ("FLT", "TSTPWL"): "1635.000",
+            ("FLT", "TSWES"): "1.0",
+            ("SWI", "CONF"): "0",
+            ("SWx4x8", "OUT"): "1",
+            ("POL", "ACQTIME"): "100",
+            ("POL", "WL"): "1550.000",
+            ("POL", "TEMP"): "25.00",
+            ("OSA", "STARTWL"): "1530.000",
+            ("OSA", "STOPWL"): "1560.000",
+            ("OSA", "NBPTS"): "400",
+        }
+
+        self.__Handlers = {
+            ("SLT", "EMPTY"): self.__SlotEmpty,
+            ("SLT", "IDN"): self.__SlotIDN,
+            ("POW", "DBM"): self.__PowerMeter,
+            ("POW", "MW"): self.__PowerMeter,
+            ("POWB", "DBM"): self.__PowerMeter,
+            ("POWB", "MW"): self.__PowerMeter,
+            ("POL", "DBM"): self.__PowerMeter,
+            ("POL", "MW"): self.__PowerMeter,
+            ("POL", "SOP"): self.__PolSOP,
+            ("POL", "BOARDID"): self.__PolBoardID,
+            ("POL", "RAW"): self.__PolRaw,
+            ("POL", "POW"): self.__PolPower,
+            ("TLS", "TWL"): self.__TLSWavelength,
+            ("TLS", "TSGL"): self.__TLSSweep,
+            ("TLS", "TRET"): self.__TLSSweep,
+            ("TLS", "TSTO"): self.__TLSSweep,
+            ("AMP", "POWERINVALUE"): self.__AmpVoltage,
+            ("AMP", "POWEROUTVALUE"): self.__AmpVoltage,
+            ("SWx4x8", "OUTx"): self.__SwitchPath,
+            ("SWx4x8", "GETx"): self.__SwitchPath,
+            ("OSA", "SWEEP"): self.__OSASweep,
+            ("OSA", "DATAX"): self.__OSAData,
+            ("OSA", "DATAY"): self.__OSAData,
+        }
+
+
+    def SetSlot(self, SlotNumber, Module):
+        '''
+        Populates the slot SlotNumber with a module
+        Module is the module reference (integer) or the complete ID string of the module.
+        If Module is None, the slot is emptied
+        '''
+        SlotNumber = int(SlotNumber)
+        if Module is None:
+            self.Slots.pop(SlotNumber, None)
+            return
+
+        if isinstance(Module, int):
+            Name = str(Module)
+            Reference = "10-" + Name + "-A-" + self.__Options.get(Module, "")
+            Module = "APEX-TECHNOLOGIES/" + Name + "/" + Reference + str(500 + SlotNumber).zfill(6) + "/1.0"
+        self.Slots[SlotNumber] = Module.strip()
+
+
+    def GetSlots(self):
+        '''
+        Returns a dictionary {slot number: module ID} of the populated slots
+        '''
+        return dict(self.Slots)
+
+
+    def Process(self, Command):
+        '''
+        Returns the reply (bytes) of an AP1000 command or None if there is no reply
+        '''
+        if Command.startswith("*IDN?"):
+            return ("APEX-TECHNOLOGIES/AP1000-" + str(self.__SlotNumber) + "/00001/1.0\n").encode("utf-8")
+        if Command.startswith("*"):
+            return None
+
+        Match = self.__Parser.match(Command)
+        if Match is None:
+            return None
+        Family, Slot, Name, Channel, Arguments = Match.groups()
+        Slot = int(Slot)
+        Channel = "" if Channel is None else Channel
+
+        Handler = self.__Handlers.get((Family, Name))
+        if Handler is not None:
+            return Handler(Family, Slot, Name, Channel, Arguments)
+        return self.__Generic(Family, Slot, Name, Channel, Arguments)
+
+
+    def GetParameter(self, Family, Slot, Name, Channel=""):
+        '''
+        Returns the stored value (string) of a module parameter
+        '''
+        Key = (Family, int(Slot), Name, Channel)
+        if Key in self.Parameters:
+            return self.Parameters[Key]
+        return self.Defaults.get((Family, Name), "0")
+
+
+    def __Generic(self, Family, Slot, Name, Channel, Arguments):
+        if Arguments.endswith("?"):
+            Value = self.GetParameter(Family, Slot, Name + Arguments[:-1], Channel)
+            return (str(Value) + "\n").encode("utf-8")
+
+        Name = self.__Aliases.get((Family, Name), Name)
+        self.Parameters[(Family, Slot, Name, Channel)] = Arguments
+        return None
+
+
+    def __Float(self, Family, Slot, Name, Channel=""):
+        try:
+            return float(self.GetParameter(Family, Slot, Name, Channel))
+        except ValueError:
+            return 0.0
+
+
+    def __SlotEmpty(self, Family, Slot, Name, Channel, Arguments):
+        return b"1\n" if Slot in self.Slots else b"0\n"
+
+
+    def __SlotIDN(self, Family, Slot, Name, Channel, Arguments):
+        if Slot in self.Slots:
+            return (self.Slots[Slot] + "\n").encode("utf-8")
+        return b"APEX-TECHNOLOGIES/0000/00-0000-A-000000/0.0\n"
+
+
+    def __SlotType(self, Slot):
+        try:
+            return int(self.Slots[Slot].split("/")[1].split("-")[0])
+        except (KeyError, IndexError, ValueError):
+            return 0
+
+
+    def __Source(self):
+        '''
+        Returns the power (dBm) and the wavelength (nm) of the first laser switched on
+        '''
+        for Slot in sorted(self.Slots):
+            Family = self.__Lasers.get(self.__SlotType(Slot))
+            if Family is None or self.GetParameter(Family, Slot, "L") != "1":
+                continue
+            if Family == "TLS":
+                Wavelength = self.__TLSCurrentWavelength(Slot)
+            else:
+                Wavelength = self.__Float(Family, Slot, "TWL")
+            return self.__Float(Family, Slot, "TPDB"), Wavelength
+        return None, None
+
+
+    def __OpticalPower(self):
+        Power, Wavelength = self.__Source()
+        if Power is None:
+            return -70.0 + 0.5 * self.__Random.standard_normal()
+        Power -= self.__Transmission(Wavelength)
+        for Slot in self.Slots:
+            if self.__SlotType(Slot) == AP1000_ATT:
+                Power -= self.__Float("ATT", Slot, "DB", "0")
+        return Power + 0.01 * self.__Random.standard_normal()
+
+
+    def __PowerMeter(self, Family, Slot, Name, Channel, Arguments):
+        Power = self.__OpticalPower()
+        if Name == "MW":
+            return ("%.6f\n" % (10.0**(Power / 10.0))).encode("utf-8")
+        return ("%.3f\n" % Power).encode("utf-8")
+
+
+    def __PolSOP(self, Family, Slot, Name, Channel, Arguments):
+        S = self.__Random.standard_normal(3)
+        S = S / np.sqrt(np.sum(S**2))
+        return ("1.000 %.4f %.4f %.4f\n" % tuple(S)).encode("utf-8")
+
+
+    def __PolBoardID(self, Family, Slot, Name, Channel, Arguments):
+        return b"XX-AB3510-EMULAT 1.0 1.0\n"
+
+
+    def __PolRaw(self, Family, Slot, Name, Channel, Arguments):
+        Values = self.__Random.randint(0, 2**14, 4)
+        return (" ".join(str(v) for v in Values) + "\n").encode("utf-8")
+
+
+    def __PolPower(self, Family, Slot, Name, Channel, Arguments):
+        Values = self.__OpticalPower() - 6.0 + 0.01 * self.__Random.standard_normal(4)
+        return (" ".join("%.3f" % v for v in Values) + "\n").encode("utf-8")
+
+
+    def __TLSCurrentWavelength(self, Slot):
+        '''
+        Returns the wavelength of a TLS, moving with time if a sweep is running
+        '''
+        if Slot not in self.__Sweeps:
+            return self.__Float("TLS", Slot, "TWL")
+
+        StartTime, Repeat = self.__Sweeps[Slot]
+        Start = self.__Float("TLS", Slot, "TSTAWL")
+        Stop = self.__Float("TLS", Slot, "TSTPWL")
+        Speed = self.__Float("TLS", Slot, "TSWES")
+        Distance = Speed * (perf_counter() - StartTime)
+        Span = abs(Stop - Start)
+        if Span <= 0 or Speed <= 0:
+            return Start
+        if Repeat:
+            Distance = Distance % Span
+        elif Distance >= Span:
+            del self.__Sweeps[Slot]
+            self.Parameters[("TLS", Slot, "TWL", "")] = "%.3f" % Stop
+            return Stop
+        return Start + Distance if Stop >= Start else Start - Distance
+
+
+    def __TLSWavelength(self, Family, Slot, Name, Channel, Arguments):
+        if Arguments.endswith("?"):
+            return ("%.3f\n" % self.__TLSCurrentWavelength(Slot)).encode("utf-8")
+        self.__Sweeps.pop(Slot, None)
+        return self.__Generic(Family, Slot, Name, Channel, Arguments)
+
+
+    def __TLSSweep(self, Family, Slot, Name, Channel, Arguments):
+        if Name == "TSTO":
+            self.Parameters[("TLS", Slot, "TWL", "")] = "%.3f" % self.__TLSCurrentWavelength(Slot)
+            self.__Sweeps.pop(Slot, None)
+        else:
+            self.__Sweeps[Slot] = (perf_counter(), Name == "TRET")
+        return None
+
+
+    def __AmpVoltage(self, Family, Slot, Name, Channel, Arguments):
+        return b"512\n" if Name == "POWERINVALUE" else b"624\n"
+
+
+    def __SwitchPath(self, Family, Slot, Name, Channel, Arguments):
+        if Arguments.endswith("?"):
+            return ("OUT" + self.GetParameter(Family, Slot, "OUT", Channel) + "\n").encode("utf-8")
+        self.Parameters[(Family, Slot, "OUT", Channel)] = Arguments[1:]
+        return None
+
+
+    def __OSASweep(self, Family, Slot, Name, Channel, Arguments):
+        if Arguments.endswith("?"):
+            Running = Slot in self.__OSASweeps and \
+                      perf_counter() - self.__OSASweeps[Slot] < self.__SweepTime
+            return b"1\n" if Running else b"0\n"
+        if Arguments.strip() in ("1", "2"):
+            self.__OSASweeps[Slot] = perf_counter()
+        else:
+            self.__OSASweeps.pop(Slot, None)
+        return None
+
+
+    def __OSAData(self, Family, Slot, Name, Channel, Arguments):
+        NPoints = max(int(self.__Float("OSA", Slot, "NBPTS")), 1)
+        Start = self.__Float("OSA", Slot, "STARTWL")
+        Stop = self.__Float("OSA", Slot, "STOPWL")
+        Wavelength = np.linspace(Start, Stop, NPoints)
+
+        if Name == "DATAX":
+            Data = VACCUM_LIGHT_SPEED / Wavelength if Arguments.strip() == "1" else Wavelength
+            Pattern = "{:.4f}"
+        else:
+            Loss = np.array([self.__Transmission(w) for w in Wavelength.tolist()])
+            Data = -10.0 - Loss + 0.01 * self.__Random.standard_normal(NPoints)
+            Kind = Arguments.strip()
+            if Kind == "4":
+                Data = 10.0**(Data / 10.0)
+            elif Kind in ("1", "2", "3"):
+                Data = np.clip(self.__Random.standard_normal(NPoints) * 0.3, -1.0, 1.0)
+            elif Kind == "5":
+                Data = np.clip(1.0 - np.abs(0.02 * self.__Random.standard_normal(NPoints)), 0.0, 1.0)
+            Pattern = "{:.6f}" if Kind == "4" else "{:.3f}"
+        return (",".join(map(Pattern.format, Data.tolist())) + "\n").encode("utf-8")
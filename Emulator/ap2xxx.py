@@ -0,0 +1,371 @@
+import re
+from time import sleep
+
+import numpy as np
+
+from PyApex import Schema
+from PyApex.Emulator.server import Emulator
+from PyApex.Constantes import AP2XXX_TLS_COMMANDS, VACCUM_LIGHT_SPEED, SimuAP2XXX_ID
+
+
+class AP2XXXEmulator(Emulator):
+    '''
+    DESCRIPTION
+        TCP emulator of an AP2XXX equipment (OSA and OCSA)
+        The emulator answers the commands of the PyApex.AP2XXX driver:
+            - general commands (*IDN?, LSMODES?, CHMOD, ...)
+            - heterodyne OSA (SP...) with ASCII and binary trace transfers
+            - OCSA (CSP...) with ASCII spectrum transfers
+            - embedded powermeter (SPMEASDETECTOR...)
+            - tunable laser (TLS...)
+            - polarimeter (POL...), filter (FIL...) and OSA fast-sweep (OSAFS...)
+        All the other setters are stored and returned by the corresponding
+        queries, so any "XXX<value>" / "XXX?" pair is emulated.
+
+        The traces are computed once for each set of parameters and kept in
+        memory, so the transfer time can be measured without the generation time.
+
+    VERSION
+        1.0
+    '''
+
+    # Mnemonic parser: the mnemonic is the leading uppercase part of the command
+    __Parser = re.compile(r"^(\*?[A-Z]+)(.*)$")
+
+    def __init__(self, IPaddress="127.0.0.1", PortNumber=0, TraceSize=1000,
+                 Latency=0.0, Bandwidth=None, SweepTime=0.0, ID=SimuAP2XXX_ID):
+        '''
+        Constructor of an AP2XXX emulator.
+        IPaddress and PortNumber are the address of the emulator (see Emulator class)
+        TraceSize is the default number of points of the OSA and OCSA traces
+        Latency is the processing time (float in seconds or dictionary) of the commands
+        Bandwidth is the maximum rate of the replies (bytes per second)
+        SweepTime is the duration in seconds of an emulated OSA or OCSA sweep
+        ID is the string returned by the '*IDN?' command
+        '''
+        Emulator.__init__(self, IPaddress, PortNumber, Latency, Bandwidth)
+
+        self.__ID = ID if ID.endswith("\n") else ID + "\n"
+        self.__TraceSize = int(TraceSize)
+        self.__SweepTime = float(SweepTime)
+        self.__Traces = {}
+        self.__Random = np.random.RandomState(0)
+
+        self.Parameters = {}
+        self.Defaults = {
+            "CHMOD": "4",
+            "CHBAND": "1",
+            "SPSTRTWL": "1526.000",
+            "SPSTOPWL": "1566.000",
+            "SPSPANWL": "40.000",
+            "SPCTRWL": "1546.000",
+            "SPSWPRES": "0.100",
+            "SPDIVY": "2.000",
+            "SPNBPTSWP": str(self.__TraceSize),
+            "SPAUTONBPT": "0",
+            "SPAVERAGE": "0",
+            "SPPOLAR": "0",
+            "CSPSTRTWL": "1540.000",
+            "CSPSTOPWL": "1560.000",
+            "CSPSPANWL": "20.000",
+            "CSPCTRWL": "1550.000",
+            "CSPNBMODEBEFORE": str(self.__TraceSize // 2),
+            "CSPNBMODEAFTER": str(self.__TraceSize - self.__TraceSize // 2 - 1),
+            "TLSPWR": "0.0",
+            "TLSSWL": "1550.000",
+            "TLSSFR": "%.3f" % (VACCUM_LIGHT_SPEED / 1550.0),
+            "TLSOUT": "0",
+            "POLPATH": "0",
+            "POLWL": "1550.0",
+            "FILWL": "1550.0",
+            "OSAFSSTARTWL": "1526.000",
+            "OSAFSSTOPWL": "1566.000",
+            "OSAFSMODE": "0",
+        }
+        self.Defaults.update(Schema.Defaults(AP2XXX_TLS_COMMANDS))
+
+        self.__Handlers = {
+            "*IDN": self.__IDN,
+            "LSMODES": self.__ListModes,
+            "LSBANDS": self.__ListBands,
+            "SPSWP": self.__OSASweep,
+            "SPDATAD": self.__OSATrace,
+            "SPDATAL": self.__OSATrace,
+            "SPDATAWL": self.__OSATrace,
+            "SPDATAF": self.__OSATrace,
+            "SPDATADB": self.__OSATrace,
+            "SPDATALB": self.__OSATrace,
+            "SPDATAWLB": self.__OSATrace,
+            "SPDATAFB": self.__OSATrace,
+            "SPMEASDETECTORDBM": self.__Power,
+            "CSPSWP": self.__OCSASweep,
+            "CSPSPECTRD": self.__OCSATrace,
+            "CSPSPECTRL": self.__OCSATrace,
+            "CSPSPECTRPHI": self.__OCSATrace,
+            "CSPSPECTRWL": self.__OCSATrace,
+            "CSPSPECTRF": self.__OCSATrace,
+            "TLSSWL": self.__TLSWavelength,
+            "TLSSFR": self.__TLSFrequency,
+            "POLIDN": self.__PolIdentity,
+            "POLRAWPOWER": self.__PolRawPower,
+            "POLPOWER": self.__PolPower,
+            "POLTEMP": self.__PolTemperature,
+            "POLSOP": self.__PolSOP,
+            "FILIDN": self.__FilIdentity,
+            "OSAFSPOINTS": self.__OSAFSPoints,
+            "OSAFSDATAD": self.__OSAFSTrace,
+            "OSAFSDATAL": self.__OSAFSTrace,
+            "OSAFSDATAWL": self.__OSAFSTrace,
+        }
+
+
+    def SetTraceSize(self, TraceSize):
+        '''
+        Sets the number of points of the OSA and OCSA traces
+        '''
+        with self.Lock:
+            self.__TraceSize = int(TraceSize)
+            self.Parameters["SPNBPTSWP"] = str(self.__TraceSize)
+            for Key in list(self.Parameters):
+                if Key.startswith("CSPNBMODE"):
+                    del self.Parameters[Key]
+            self.Defaults["CSPNBMODEBEFORE"] = str(self.__TraceSize // 2)
+            self.Defaults["CSPNBMODEAFTER"] = str(self.__TraceSize - self.__TraceSize // 2 - 1)
+            self.__Traces = {}
+
+
+    def GetTraceSize(self):
+        '''
+        Returns the default number of points of the OSA and OCSA traces
+        '''
+        return self.__TraceSize
+
+
+    def SetSweepTime(self, SweepTime):
+        '''
+        Sets the duration in seconds of an emulated sweep
+        '''
+        self.__SweepTime = float(SweepTime)
+
+
+    def Process(self, Command):
+        '''
+        Returns the reply (bytes) of an AP2XXX command or None if there is no reply
+        '''
+        Match = self.__Parser.match(Command)
+        if Match is None:
+            return None
+        Mnemonic, Arguments = Match.groups()
+
+        if Mnemonic in self.__Handlers:
+            return self.__Handlers[Mnemonic](Mnemonic, Arguments)
+        return self.__Generic(Mnemonic, Arguments)
+
+
+    def GetParameter(self, Mnemonic, Default=None):
+        '''
+        Returns the stored value (string) of a parameter
+        '''
+        if Mnemonic in self.Parameters:
+            return self.Parameters[Mnemonic]
+        Root = self.__Parser.match(Mnemonic).group(1)
+        if Root in self.Defaults:
+            return self.Defaults[Root]
+        return Default
+
+
+    def __Generic(self, Mnemonic, Arguments):
+        if Arguments.endswith("?"):
+            Value = self.GetParameter(Mnemonic + Arguments[:-1], "0")
+            return (str(Value) + "\n").encode("utf-8")
+
+        if "," in Arguments:
+            Index = Arguments.rfind(",")
+            self.Parameters[Mnemonic + Arguments[:Index]] = Arguments[Index + 1:]
+        else:
+            self.Parameters[Mnemonic] = Arguments
+        return None
+
+
+    def __Float(self, Mnemonic, Default=0.0):
+        try:
+            return float(self.GetParameter(Mnemonic, Default))
+        except ValueError:
+            return Default
+
+
+    def __IDN(self, Mnemonic, Arguments):
+        return self.__ID.encode("utf-8")
+
+
+    def __ListModes(self, Mnemonic, Arguments):
+        return b"Apex Start, General Settings, Powermeter, T.L.S, O.S.A., O.C.S.A.\n"
+
+
+    def __ListBands(self, Mnemonic, Arguments):
+        return b"O, C&&L\n"
+
+
+    def __Spectrum(self, NPoints, Start, Stop):
+        '''
+        Computes a deterministic spectrum (noise floor with 3 peaks) in dBm
+        '''
+        Wavelength = np.linspace(Start, Stop, NPoints)
+        Power = -70.0 + 0.5 * self.__Random.standard_normal(NPoints)
+        Span = max(Stop - Start, 1e-3)
+        for Position, Level in ((0.25, 55.0), (0.5, 70.0), (0.75, 45.0)):
+            Center = Start + Position * Span
+            Power += Level * np.exp(-((Wavelength - Center) / (Span / 200.0))**2)
+        return Wavelength, Power
+
+
+    def __Trace(self, Key, NPoints, Start, Stop, Kind):
+        '''
+        Returns the trace data of a kind ("wl", "f", "d", "l", "phi") from the cache
+        '''
+        CacheKey = (Key, NPoints, Start, Stop)
+        if CacheKey not in self.__Traces:
+            # Only the last trace is kept in memory (a 5M points trace is ~100 MB)
+            self.__Traces = {}
+            Wavelength, Power = self.__Spectrum(NPoints, Start, Stop)
+            self.__Traces[CacheKey] = {"wl": Wavelength, "d": Power}
+
+        Data = self.__Traces[CacheKey]
+        if Kind not in Data:
+            if Kind == "f":
+                Data[Kind] = VACCUM_LIGHT_SPEED / Data["wl"]
+            elif Kind == "l":
+                Data[Kind] = 10.0**(Data["d"] / 10.0)
+            else:
+                Data[Kind] = np.mod(np.cumsum(self.__Random.standard_normal(NPoints)), 360.0)
+        return Data[Kind]
+
+
+    def __Encoded(self, Key, NPoints, Start, Stop, Kind, Format):
+        '''
+        Returns the encoded reply of a trace from the cache
+        Format is "ascii" (values separated by spaces, first value is the number
+        of points), "csv" (values separated by commas), "float32" or "float64"
+        '''
+        CacheKey = (Key, NPoints, Start, Stop, Kind, Format)
+        if CacheKey not in self.__Traces:
+            Data = self.__Trace(Key, NPoints, Start, Stop, Kind)
+            if Format == "float32":
+                Reply = Data.astype("<f4").tobytes()
+            elif Format == "float64":
+                Reply = Data.astype("<f8").tobytes()
+            else:
+                Pattern = "{:.4f}" if Kind in ("wl", "f") else "{:.3f}"
+                Values = map(Pattern.format, Data.tolist())
+                if Format == "csv":
+                    Reply = (",".join(Values) + "\n").encode("utf-8")
+                else:
+                    Reply = (str(NPoints) + " " + " ".join(Values) + "\n").encode("utf-8")
+            self.__Traces[CacheKey] = Reply
+        return self.__Traces[CacheKey]
+
+
+    def __OSASweep(self, Mnemonic, Arguments):
+        if Arguments.strip() == "3":
+            return None
+        if self.__SweepTime > 0:
+            sleep(self.__SweepTime)
+        return b"1\n"
+
+
+    def __OSATrace(self, Mnemonic, Arguments):
+        Kinds = {"SPDATAD": "d", "SPDATAL": "l", "SPDATAWL": "wl", "SPDATAF": "f"}
+        Binary = Mnemonic.endswith("B") and Mnemonic[:-1] in Kinds
+        Kind = Kinds[Mnemonic[:-1]] if Binary else Kinds[Mnemonic]
+        if Binary:
+            Format = "float64" if Kind in ("wl", "f") else "float32"
+        else:
+            Format = "ascii"
+
+        NPoints = int(self.__Float("SPNBPTSWP", self.__TraceSize))
+        Start = self.__Float("SPSTRTWL")
+        Stop = self.__Float("SPSTOPWL")
+        return self.__Encoded("SP" + Arguments, NPoints, Start, Stop, Kind, Format)
+
+
+    def __Power(self, Mnemonic, Arguments):
+        return ("%.3f\n" % (-10.0 + 0.01 * self.__Random.standard_normal())).encode("utf-8")
+
+
+    def __OCSASweep(self, Mnemonic, Arguments):
+        if Arguments.strip() == "3":
+            return None
+        if self.__SweepTime > 0:
+            sleep(self.__SweepTime)
+        return b"1\n"
+
+
+    def __OCSATrace(self, Mnemonic, Arguments):
+        Kinds = {"CSPSPECTRD": "d", "CSPSPECTRL": "l", "CSPSPECTRPHI": "phi",
+                 "CSPSPECTRWL": "wl", "CSPSPECTRF": "f"}
+        Trace = Arguments.split(",")[0]
+        NPoints = int(self.__Float("CSPNBMODEBEFORE" + Trace)) + \
+                  int(self.__Float("CSPNBMODEAFTER" + Trace)) + 1
+        Start = self.__Float("CSPSTRTWL")
+        Stop = self.__Float("CSPSTOPWL")
+        return self.__Encoded("CSP" + Arguments, NPoints, Start, Stop, Kinds[Mnemonic], "ascii")
+
+
+    def __TLSWavelength(self, Mnemonic, Arguments):
+        if not Arguments.endswith("?"):
+            try:
+                self.Parameters["TLSSFR"] = "%.3f" % (VACCUM_LIGHT_SPEED / float(Arguments))
+            except (ValueError, ZeroDivisionError):
+                pass
+        return self.__Generic(Mnemonic, Arguments)
+
+
+    def __TLSFrequency(self, Mnemonic, Arguments):
+        if not Arguments.endswith("?"):
+            try:
+                self.Parameters["TLSSWL"] = "%.3f" % (VACCUM_LIGHT_SPEED / float(Arguments))
+            except (ValueError, ZeroDivisionError):
+                pass
+        return self.__Generic(Mnemonic, Arguments)
+
+
+    def __PolIdentity(self, Mnemonic, Arguments):
+        return b"XX-AB3510-EMULAT 1.0 1.1\n"
+
+
+    def __PolRawPower(self, Mnemonic, Arguments):
+        Values = self.__Random.randint(0, 2**14, 4)
+        return (" ".join(str(v) for v in Values) + "\n").encode("utf-8")
+
+
+    def __PolPower(self, Mnemonic, Arguments):
+        Values = -10.0 + 0.01 * self.__Random.standard_normal(4)
+        return (" ".join("%.3f" % v for v in Values) + "\n").encode("utf-8")
+
+
+    def __PolTemperature(self, Mnemonic, Arguments):
+        return b"25.00\n"
+
+
+    def __PolSOP(self, Mnemonic, Arguments):
+        S = self.__Random.standard_normal(3)
+        S = S / np.sqrt(np.sum(S**2))
+        return ("1.000 %.4f %.4f %.4f\n" % tuple(S)).encode("utf-8")
+
+
+    def __FilIdentity(self, Mnemonic, Arguments):
+        return b"XX-3380-A-EMULAT\n"
+
+
+    def __OSAFSPoints(self, Mnemonic, Arguments):
+        return (str(min(self.__TraceSize, 500)) + "\n").encode("utf-8")
+
+
+    def __OSAFSTrace(self, Mnemonic, Arguments):
+        Kinds = {"OSAFSDATAD": "d", "OSAFSDATAL": "l", "OSAFSDATAWL": "wl"}
+        NPoints = min(self.__TraceSize, 500)
+        Start = self.__Float("OSAFSSTARTWL")
+        Stop = self.__Float("OSAFSSTOPWL")
+        Data = self.__Trace("OSAFS", NPoints, Start, Stop, Kinds[Mnemonic])
+        Pattern = "{:.4f}" if Mnemonic == "OSAFSDATAWL" else "{:.3f}"
+        return (" ".join(map(Pattern.format, Data.tolist())) + "\n").encode("utf-8")
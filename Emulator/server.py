@@ -0,0 +1,227 @@
+import socket
+import threading
+from time import sleep, time
+
+
+class Emulator():
+    '''
+    DESCRIPTION
+        Base class of the local TCP emulators of Apex equipments.
+        The emulator listens on a TCP port like the real equipment and answers
+        the commands sent by the PyApex drivers through the normal socket path.
+        Each command is a line ended by '\\n'. The child classes only have to
+        define the 'Process' method which returns the reply of a command
+        (bytes) or None if the command has no reply.
+
+        The emulator can simulate the link performances:
+            - Latency is the processing time of a command in seconds. It can be
+              a float (same latency for all commands) or a dictionary
+              {pattern: latency}. The latency of a command is the one of the
+              longest pattern found in the command. The "" pattern is the
+              default latency.
+            - Bandwidth is the maximum rate of the replies in bytes per second
+              (None for no limitation)
+
+    VERSION
+        1.0
+    '''
+
+    def __init__(self, IPaddress="127.0.0.1", PortNumber=0, Latency=0.0, Bandwidth=None):
+        '''
+        Constructor of an equipment emulator.
+        IPaddress is the IP address (string) the emulator listens on. By default, only
+        local connections are accepted
+        PortNumber is the TCP port (integer). If PortNumber is 0 (default), a free port
+        is chosen by the system. It can be read with the method 'GetPort()'
+        Latency is the processing time (float in seconds or dictionary) of the commands
+        Bandwidth is the maximum rate of the replies (bytes per second)
+        '''
+        self.__IPAddress = IPaddress
+        self.__PortNumber = PortNumber
+        self.__Server = None
+        self.__Thread = None
+        self.__Running = False
+        self.__Clients = []
+        self.Lock = threading.Lock()
+
+        self.SetLatency(Latency)
+        self.SetBandwidth(Bandwidth)
+
+
+    def __enter__(self):
+        self.Start()
+        return self
+
+
+    def __exit__(self, *args):
+        self.Stop()
+
+
+    def Start(self):
+        '''
+        Starts the emulator server in a background thread
+        '''
+        self.__Server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.__Server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__Server.bind((self.__IPAddress, self.__PortNumber))
+        self.__Server.listen(8)
+        self.__Server.settimeout(0.2)
+        self.__PortNumber = self.__Server.getsockname()[1]
+
+        self.__Running = True
+        self.__Thread = threading.Thread(target=self.__Accept, daemon=True)
+        self.__Thread.start()
+
+
+    def Stop(self):
+        '''
+        Stops the emulator server and closes all client connections
+        '''
+        self.__Running = False
+        if self.__Thread is not None:
+            self.__Thread.join()
+            self.__Thread = None
+        for Client in self.__Clients:
+            try:
+                Client.close()
+            except:
+                pass
+        self.__Clients = []
+        if self.__Server is not None:
+            self.__Server.close()
+            self.__Server = None
+
+
+    def IsRunning(self):
+        '''
+        Returns True if the emulator server is running, False otherwise
+        '''
+        return self.__Running
+
+
+    def GetAddress(self):
+        '''
+        Returns the IP address (string) of the emulator
+        '''
+        return self.__IPAddress
+
+
+    def GetPort(self):
+        '''
+        Returns the TCP port (integer) of the emulator
+        '''
+        return self.__PortNumber
+
+
+    def SetLatency(self, Latency):
+        '''
+        Sets the processing time of the commands
+        Latency is a float expressed in seconds or a dictionary {pattern: latency}
+        '''
+        if isinstance(Latency, dict):
+            self.__Latency = dict(Latency)
+        else:
+            self.__Latency = {"": float(Latency)}
+
+
+    def GetLatency(self, Command=""):
+        '''
+        Returns the processing time in seconds of the string Command
+        '''
+        Match = None
+        for Pattern in self.__Latency:
+            if Pattern in Command and (Match is None or len(Pattern) > len(Match)):
+                Match = Pattern
+        if Match is None:
+            return 0.0
+        return self.__Latency[Match]
+
+
+    def SetBandwidth(self, Bandwidth):
+        '''
+        Sets the maximum rate of the replies in bytes per second
+        If Bandwidth is None, the rate is not limited
+        '''
+        if Bandwidth is not None and Bandwidth <= 0:
+            Bandwidth = None
+        self.__Bandwidth = Bandwidth
+
+
+    def GetBandwidth(self):
+        '''
+        Returns the maximum rate of the replies in bytes per second
+        '''
+        return self.__Bandwidth
+
+
+    def Process(self, Command):
+        '''
+        Returns the reply (bytes) of a command or None if there is no reply
+        Command is a string without the ending '\\n'
+        This method has to be defined in the child classes
+        '''
+        return None
+
+
+    def __Accept(self):
+        while self.__Running:
+            try:
+                Client, Address = self.__Server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            Client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.__Clients.append(Client)
+            threading.Thread(target=self.__Serve, args=(Client,), daemon=True).start()
+
+
+    def __Serve(self, Client):
+        Buffer = bytearray()
+        while self.__Running:
+            try:
+                Data = Client.recv(65536)
+            except OSError:
+                break
+            if not Data:
+                break
+            Buffer.extend(Data)
+
+            while True:
+                Index = Buffer.find(b"\n")
+                if Index < 0:
+                    break
+                Command = Buffer[:Index].decode("utf-8", "replace").strip("\r")
+                del Buffer[:Index + 1]
+
+                Latency = self.GetLatency(Command)
+                if Latency > 0:
+                    sleep(Latency)
+                with self.Lock:
+                    Reply = self.Process(Command)
+                if Reply:
+                    try:
+                        self.__SendReply(Client, Reply)
+                    except OSError:
+                        return
+        try:
+            Client.close()
+        except OSError:
+            pass
+
+
+    def __SendReply(self, Client, Reply):
+        if self.__Bandwidth is None:
+            Client.sendall(Reply)
+            return
+
+        View = memoryview(Reply)
+        ChunkSize = max(1024, min(65536, int(self.__Bandwidth / 100)))
+        Start = time()
+        Sent = 0
+        while Sent < len(View):
+            Client.sendall(View[Sent:Sent + ChunkSize])
+            Sent += len(View[Sent:Sent + ChunkSize])
+            Delay = Sent / self.__Bandwidth - (time() - Start)
+            if Delay > 0:
+                sleep(Delay)
@@ -20,6 +20,8 @@ class ApexError(Exception):
             ErrorMsg += "Wrong argument value for '" + str(self.ErrorCause) + "'"
         elif self.ErrorCode == APXXXX_ERROR_BAD_FILENAME:
             ErrorMsg += "'" + str(self.ErrorCause) + "' is not a valid file"
+        elif self.ErrorCode == APXXXX_ERROR_REPLAY:
+            ErrorMsg += "Command '" + str(self.ErrorCause) + "' does not match the replayed session"
         elif self.ErrorCode == AP1000_ERROR_SLOT_NOT_DEFINED:
             ErrorMsg += "Slot n° " + str(self.ErrorCause) + " has not a defined type"
         elif self.ErrorCode == AP1000_ERROR_SLOT_NOT_GOOD_TYPE:
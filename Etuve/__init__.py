@@ -1,6 +1,11 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+from math import nan
+from PyApex.Constantes import ETUVE_BAUDRATE, ETUVE_ERROR_ARGUMENT_TYPE, \
+     ETUVE_ERROR_ARGUMENT_VALUE, ETUVE_ERROR_BADCOMMAND, ETUVE_ERROR_COMMUNICATION
+from PyApex.Errors import EtuveError
+
 
 class Etuve():
     '''
@@ -13,6 +18,9 @@ class Etuve():
         ComPort is the COM port number (integer) of the Laser.
         Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
         '''
+        import threading
+        from time import time
+
         self.ComPort = ComPort
         self.Simulation = Simulation
         if self.Simulation:
@@ -25,6 +33,22 @@ class Etuve():
         self.StatusIndex = 0
         self.Status = ["OFF", "ON"]
 
+        self.__WriteLock = threading.Lock()
+        self.__NewSample = threading.Condition()
+        self.__StopEvent = threading.Event()
+        self.__Thread = None
+        self.__MonitorError = None
+        self.__History = None
+        self.__Frames = bytearray()
+        self.__PollRate = 1.0
+
+        # First order thermal model of the simulation mode
+        self.__SimTemp = 25.0
+        self.__SimConsigne = 25.0
+        self.__SimTime = time()
+        self.__SimTau = 10.0
+        self.__SimData = bytearray()
+
 
     def __str__(self):
         return "Thermal Etuve on " + str(self.ComPort)
@@ -36,8 +60,6 @@ class Etuve():
         This method is called by the constructor of Etuve class
         '''
         import serial, sys
-        from PyApex.Constantes import ETUVE_BAUDRATE, ETUVE_NBITS, \
-             ETUVE_STOPBIT, ETUVE_FLOWCONTROL
         
         try:
             Connexion = serial.Serial("COM" + str(self.ComPort), ETUVE_BAUDRATE)
@@ -61,20 +83,23 @@ class Etuve():
         '''
         Send a string Command to the Etuve (ending character must be \'\n')
         '''
-        from PyApex.Constantes import ETUVE_ERROR_ARGUMENT_TYPE, ETUVE_ERROR_COMMUNICATION
-        from PyApex.Errors import EtuveError
         
         if not isinstance(Command, str):
             self.Close(True)
             raise EtuveError(ETUVE_ERROR_ARGUMENT_TYPE, "Command")
         
-        if not self.Simulation:
-            self.Connexion.flush()
-            try:
-                self.Connexion.write(Command.encode())
-            except:
-                self.Close(True)
-                raise EtuveError(ETUVE_ERROR_COMMUNICATION, "Command")
+        if self.Simulation:
+            if Command == 't':
+                with self.__WriteLock:
+                    self.__SimData += self.__SimulatedFrames()
+        else:
+            with self.__WriteLock:
+                self.Connexion.flush()
+                try:
+                    self.Connexion.write(Command.encode())
+                except:
+                    self.Close(True)
+                    raise EtuveError(ETUVE_ERROR_COMMUNICATION, "Command")
 
 
     def Receive(self, ByteNumber=56):
@@ -82,29 +107,40 @@ class Etuve():
         Receive a string from the Etuve
         ByteNumber is an integer (default to 56) representing the number of bytes to receive
         '''
-        from PyApex.Constantes import ETUVE_ERROR_ARGUMENT_TYPE, ETUVE_ERROR_BADCOMMAND
-        from PyApex.Errors import EtuveError
         
         if not isinstance(ByteNumber, int):
             self.Close(True)
             raise EtuveError(ETUVE_ERROR_ARGUMENT_TYPE, "ByteNumber")
         
-        if not self.Simulation:
+        if self.Simulation:
+            data = bytes(self.__SimData[:ByteNumber])
+            del self.__SimData[:ByteNumber]
+        else:
             try:
                 data = self.Connexion.read(size = ByteNumber)
             except:
                 self.Close(True)
                 raise EtuveError(ETUVE_ERROR_BADCOMMAND, "Last command")
-            else:
-                self.Msg = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
-                for i in range(0, len(data), 4):
-                    if data[i] == 129:
-                        if 0 <= data[i+1] <= 26:
-                            self.Msg[int(data[i+1] / 2)] = data[i+2] + 256 * data[i+3]
+
+        self.Msg = [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0]
+        for i in range(0, len(data) - 3, 4):
+            if data[i] == 129:
+                if 0 <= data[i+1] <= 26:
+                    # Signed 16-bit word (negative temperatures in two's complement)
+                    Value = data[i+2] + 256 * data[i+3]
+                    self.Msg[int(data[i+1] / 2)] = Value - 65536 if Value >= 32768 else Value
 
 
     def GetActualTemp(self):
+        '''
+        Returns the actual temperature (degree Celsius) of the Etuve
+        When the monitor is running, the last decoded temperature is returned
+        without any communication with the Etuve
+        '''
         from time import time
+        if self.IsMonitoring():
+            Latest = self.Latest()
+            return nan if Latest is None else Latest[1]
         if time() - self.LastSend > 10:
             self.Send('t')
             self.Receive()
@@ -113,7 +149,15 @@ class Etuve():
 
 
     def GetConsigneTemp(self):
+        '''
+        Returns the set point temperature (degree Celsius) of the Etuve
+        When the monitor is running, the last decoded set point is returned
+        without any communication with the Etuve
+        '''
         from time import time
+        if self.IsMonitoring():
+            Latest = self.Latest()
+            return nan if Latest is None else Latest[2]
         if time() - self.LastSend > 10:
             self.Send('t')
             self.Receive()
@@ -122,14 +166,262 @@ class Etuve():
 
 
     def SetConsigneTemp(self, Temperature):
-        t = int(Temperature * 10)
-        self.Connexion.write([b'\x81', b'\x02', t % 256, int(t / 256)])
+        '''
+        Sets the set point temperature (degree Celsius) of the Etuve
+        '''
+
+        if not isinstance(Temperature, (float, int)):
+            raise EtuveError(ETUVE_ERROR_ARGUMENT_TYPE, "Temperature")
+
+        t = int(round(Temperature * 10))
+        if self.Simulation:
+            with self.__WriteLock:
+                self.__SimulatedFrames()
+                self.__SimConsigne = t / 10.0
+            return
+        with self.__WriteLock:
+            try:
+                self.Connexion.write(bytes([0x81, 0x02, t % 256, (t // 256) % 256]))
+            except:
+                self.Close(True)
+                raise EtuveError(ETUVE_ERROR_COMMUNICATION, "Temperature")
+
+
+    def __SimulatedFrames(self):
+        from math import exp
+        from time import time
+
+        Now = time()
+        self.__SimTemp += (self.__SimConsigne - self.__SimTemp) * \
+                          (1.0 - exp(-(Now - self.__SimTime) / self.__SimTau))
+        self.__SimTime = Now
+        Frames = bytearray()
+        for Index, Value in [(0, self.__SimTemp), (2, self.__SimConsigne)]:
+            Value = int(round(Value * 10))
+            Frames += bytes([129, Index, Value % 256, (Value // 256) % 256])
+        return bytes(Frames)
+
+
+    def SetPollRate(self, Rate):
+        '''
+        Sets the rate (requests per second) at which the monitor requests the
+        temperatures to the Etuve
+        '''
+
+        if not isinstance(Rate, (float, int)):
+            raise EtuveError(ETUVE_ERROR_ARGUMENT_TYPE, "Rate")
+        if Rate <= 0:
+            raise EtuveError(ETUVE_ERROR_ARGUMENT_VALUE, "Rate")
+        self.__PollRate = float(Rate)
+
+
+    def GetPollRate(self):
+        '''
+        Returns the rate (requests per second) of the monitor
+        '''
+        return self.__PollRate
+
+
+    def StartMonitor(self, Rate=None, BufferSize=100000):
+        '''
+        Starts the monitor of the Etuve: a thread requests the temperatures at the
+        poll rate (Rate requests per second if not None, see SetPollRate) and decodes
+        the frames received on the RS232 link as they arrive. Each decoded temperature
+        dump is stored in a ring buffer of BufferSize rows [timestamp, actual temperature,
+        set point temperature] (timestamps in seconds since the epoch)
+        While the monitor is running, only the methods of this class should use the
+        connection of the Etuve.
+        This method requires the numpy module installed
+        '''
+        import threading
+        from PyApex.RingBuffer import RingBuffer
+
+        if self.IsMonitoring():
+            return
+        if Rate is not None:
+            self.SetPollRate(Rate)
+        # Cleans up a monitor stopped by an error
+        self.StopMonitor()
+
+        self.__History = RingBuffer(BufferSize, 3)
+        self.__Frames = bytearray()
+        self.__MonitorError = None
+        self.__StopEvent.clear()
+        if not self.Simulation:
+            self.__Timeout = self.Connexion.timeout
+            self.Connexion.timeout = 0.05
+        self.__Thread = threading.Thread(target=self.__Monitor, daemon=True)
+        self.__Thread.start()
+
+
+    def StopMonitor(self):
+        '''
+        Stops the monitor of the Etuve. The decoded temperatures are kept
+        '''
+        if self.__Thread is None:
+            return
+        self.__StopEvent.set()
+        self.__Thread.join()
+        self.__Thread = None
+        if not self.Simulation:
+            self.Connexion.timeout = self.__Timeout
+        with self.__NewSample:
+            self.__NewSample.notify_all()
+
+
+    def IsMonitoring(self):
+        '''
+        Returns True if the monitor is running, False otherwise (not started, stopped
+        or stopped by an error, see GetMonitorError)
+        '''
+        return self.__Thread is not None and self.__Thread.is_alive()
+
+
+    def GetMonitorError(self):
+        '''
+        Returns the exception which has stopped the monitor, or None
+        '''
+        return self.__MonitorError
+
+
+    def __Monitor(self):
+        from time import time
+
+        Next = time()
+        try:
+            while not self.__StopEvent.is_set():
+                Now = time()
+                if Now >= Next:
+                    self.Send('t')
+                    self.LastSend = Now
+                    Next = max(Next + 1.0 / self.__PollRate, Now)
+                if self.Simulation:
+                    with self.__WriteLock:
+                        Data = bytes(self.__SimData)
+                        self.__SimData.clear()
+                    self.__StopEvent.wait(min(max(Next - time(), 0.0), 0.05))
+                else:
+                    Data = self.Connexion.read(max(1, self.Connexion.in_waiting))
+                if len(Data) > 0:
+                    self.__Decode(Data, time())
+        except Exception as Error:
+            self.__MonitorError = Error
+        finally:
+            # The waiters see that the monitor is stopped
+            with self.__NewSample:
+                self.__NewSample.notify_all()
 
 
+    def __Decode(self, Data, Time):
+        self.__Frames += Data
+        while len(self.__Frames) >= 4:
+            if self.__Frames[0] != 129 or self.__Frames[1] > 26 or self.__Frames[1] % 2 != 0:
+                del self.__Frames[0]
+                continue
+            Index = self.__Frames[1] // 2
+            Value = self.__Frames[2] + 256 * self.__Frames[3]
+            self.Msg[Index] = Value - 65536 if Value >= 32768 else Value
+            del self.__Frames[:4]
+            # The set point follows the actual temperature in a dump
+            if Index == 1:
+                self.__History.Append([Time, self.Msg[0] / 10.0, self.Msg[1] / 10.0])
+                with self.__NewSample:
+                    self.__NewSample.notify_all()
 
 
+    def Latest(self):
+        '''
+        Returns the last decoded temperatures of the monitor in a tuple
+        (timestamp, actual temperature, set point temperature) or None if
+        no temperature has been decoded yet
+        '''
+        if self.__History is None:
+            return None
+        Row = self.__History.GetLatest()
+        if Row is None:
+            return None
+        return float(Row[0]), float(Row[1]), float(Row[2])
 
 
+    def GetHistory(self, Number=None):
+        '''
+        Returns the last Number rows (all the rows if Number is None) decoded by the
+        monitor in a NumPy array of shape (N, 3): timestamp, actual temperature and
+        set point temperature
+        '''
+        import numpy as np
+
+        if self.__History is None:
+            return np.zeros((0, 3))
+        return self.__History.GetData(Number)
+
+
+    def GetStableTime(self, Tolerance=0.5, Target=None, Since=None):
+        '''
+        Returns the time in seconds during which the actual temperature has stayed within
+        Tolerance (degree Celsius) of Target (by default, the last set point temperature)
+        up to the last decoded dump. Returns 0.0 if the last temperature is out of tolerance
+        If Since is not None, the dumps decoded before the timestamp Since (seconds since
+        the epoch, for example the time of the last set point) are ignored
+        '''
+        import numpy as np
 
+        Data = self.GetHistory()
+        if Since is not None:
+            Data = Data[Data[:, 0] >= Since]
+        if len(Data) == 0:
+            return 0.0
+        if Target is None:
+            Target = Data[-1, 2]
+        Out = np.flatnonzero(np.abs(Data[:, 1] - Target) > Tolerance)
+        if len(Out) == 0:
+            return float(Data[-1, 0] - Data[0, 0])
+        if Out[-1] == len(Data) - 1:
+            return 0.0
+        return float(Data[-1, 0] - Data[Out[-1] + 1, 0])
 
 
+    def WaitStable(self, Tolerance=0.5, Duration=60.0, Target=None, Timeout=None, Since=None):
+        '''
+        Waits until the actual temperature has stayed within Tolerance (degree Celsius)
+        of Target (by default, the last set point temperature) during Duration seconds.
+        If Since is not None, only the dumps decoded after the timestamp Since are used
+        (see GetStableTime)
+        The monitor must be running: the method waits on the decoded dumps without
+        any communication with the Etuve
+        Returns True when the temperature is stable, False if Timeout (seconds) has
+        elapsed or if the monitor has been stopped
+        Raises an EtuveError if the monitor is not running or if it is stopped by an
+        error (see GetMonitorError)
+        '''
+        from time import time
+
+        if not self.IsMonitoring():
+            if self.__MonitorError is not None:
+                raise EtuveError(ETUVE_ERROR_COMMUNICATION, "Monitor")
+            raise EtuveError(ETUVE_ERROR_BADCOMMAND, "WaitStable")
+
+        End = None if Timeout is None else time() + float(Timeout)
+        with self.__NewSample:
+            while self.GetStableTime(Tolerance, Target, Since) < Duration:
+                if not self.IsMonitoring():
+                    if self.__MonitorError is not None:
+                        raise EtuveError(ETUVE_ERROR_COMMUNICATION, "Monitor")
+                    return False
+                Remaining = None if End is None else End - time()
+                if Remaining is not None and Remaining <= 0:
+                    return False
+                self.__NewSample.wait(Remaining)
+        return True
+
+
+    def Campaign(self, Directory, Tolerance=0.5, Duration=300.0, Timeout=None):
+        '''
+        Return a Campaign class for the temperature campaigns of this Etuve
+        Directory is the directory of the results (resumable campaigns)
+        Tolerance (degree Celsius) and Duration (seconds) are the stability criterion
+        Timeout is the maximum time in seconds to wait for the stability of a plateau
+        '''
+        from PyApex.Campaign import Campaign
+
+        return Campaign(self, Directory, Tolerance, Duration, Timeout)
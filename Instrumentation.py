@@ -0,0 +1,212 @@
+'''
+Instrumentation of the commands sent to the Apex equipments
+
+    When the instrumentation is enabled, the functions of PyApex.Common (Send,
+    Receive, recvall, ReceiveUntilChar) record for each command:
+        - Name: command name without the slot numbers and the arguments
+          ("SPSTRTWL", "SPSTRTWL?", "POW:DBM?", ...)
+        - Command: the command string (truncated to 64 characters)
+        - BytesSent and BytesReceived
+        - Time: date of the command (seconds since the epoch)
+        - Duration: wall time in seconds from the sending of the command to the
+          end of its reply (or to the end of the sending for a command without reply)
+        - Wait: time in seconds between the end of the sending and the first
+          byte of the reply (None for a command without reply)
+    The records are stored in a ring buffer. A command is recorded when the next
+    command is sent on the same connection or when the records are read.
+
+        from PyApex import Instrumentation
+        Instrumentation.Enable()
+        ... (driver calls)
+        print(Instrumentation.Stats())
+        Instrumentation.AddHook(MyFunction)   # MyFunction(Record) is called for each record
+'''
+
+import re
+from bisect import bisect_left
+import threading
+from collections import deque
+from time import perf_counter, time
+
+# Upper bounds in seconds of the duration histogram bins (the last bin has no upper bound)
+HistogramBins = [1e-5, 2e-5, 5e-5, 1e-4, 2e-4, 5e-4, 1e-3, 2e-3, 5e-3, 1e-2,
+                 2e-2, 5e-2, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0]
+
+Enabled = False
+
+__Lock = threading.Lock()
+__Records = deque(maxlen=10000)
+__Pending = {}
+__Hooks = []
+__Counters = {}
+__NameParser = re.compile(r"\[\d*\]|[^A-Za-z:*\[\]].*")
+
+
+def Enable(Size=None):
+    '''
+    Enables the instrumentation of the commands
+    Size is the number of records of the ring buffer (10000 by default). If Size is
+    given, the buffer is cleared
+    '''
+    global Enabled, __Records
+    if Size is not None:
+        with __Lock:
+            __Records = deque(maxlen=int(Size))
+    Enabled = True
+
+
+def Disable():
+    '''
+    Disables the instrumentation of the commands
+    '''
+    global Enabled
+    Enabled = False
+    __Flush()
+
+
+def IsEnabled():
+    '''
+    Returns True if the instrumentation is enabled, False otherwise
+    '''
+    return Enabled
+
+
+def Clear():
+    '''
+    Clears the records and the statistics
+    '''
+    with __Lock:
+        __Records.clear()
+        __Pending.clear()
+        __Counters.clear()
+
+
+def AddHook(Function):
+    '''
+    Adds a function called with each record (dictionary)
+    The hooks are called in the thread of the driver: they have to be fast
+    '''
+    if Function not in __Hooks:
+        __Hooks.append(Function)
+
+
+def RemoveHook(Function):
+    '''
+    Removes a hook function
+    '''
+    if Function in __Hooks:
+        __Hooks.remove(Function)
+
+
+def CommandName(Command):
+    '''
+    Returns the name of a command without the slot numbers and the arguments
+    The character '?' is added to the name of the queries
+    For pipelined commands (several lines), the name of the first one is returned
+    '''
+    Command = Command.strip().split("\n")[0]
+    Name = __NameParser.sub("", Command)
+    if "?" in Command:
+        Name += "?"
+    return Name
+
+
+def Records():
+    '''
+    Returns the list of the records (dictionaries) of the ring buffer,
+    from the oldest to the newest
+    '''
+    __Flush()
+    with __Lock:
+        return list(__Records)
+
+
+def Stats():
+    '''
+    Returns the statistics of the recorded commands since the last 'Clear()'
+    The statistics are a dictionary {command name: statistics} where the
+    statistics of each command are a dictionary:
+        - Count, BytesSent, BytesReceived
+        - TotalTime, MeanTime, MinTime, MaxTime: durations in seconds
+        - TotalWait, MeanWait: reply waiting times in seconds
+        - Histogram: list of the number of commands in each bin of
+          the durations (see 'HistogramBins')
+    '''
+    __Flush()
+    Result = {}
+    with __Lock:
+        for Name, c in __Counters.items():
+            Stat = dict(c)
+            Stat["Histogram"] = list(c["Histogram"])
+            Stat["MeanTime"] = c["TotalTime"] / c["Count"]
+            Stat["MeanWait"] = c["TotalWait"] / c["Replies"] if c["Replies"] else None
+            Result[Name] = Stat
+    return Result
+
+
+def OnSend(Connexion, Command, Start, End):
+    '''
+    Records the sending of a command on a connection
+    Start and End are the perf_counter() times of the sending
+    This function is called by PyApex.Common.Send
+    '''
+    Key = id(Connexion)
+    Record = {"Name": CommandName(Command), "Command": Command.strip()[:64],
+              "BytesSent": len(Command), "BytesReceived": 0,
+              "Time": time() - (perf_counter() - Start),
+              "Duration": End - Start, "Wait": None}
+    with __Lock:
+        Previous = __Pending.pop(Key, None)
+        __Pending[Key] = (Record, Start, End)
+    if Previous is not None:
+        __Commit(Previous[0])
+
+
+def OnReceive(Connexion, ByteNumber, First, End):
+    '''
+    Records the reception of ByteNumber bytes of a reply
+    First is the perf_counter() time of the first received bytes and End the
+    time of the end of the reception
+    This function is called by the reception functions of PyApex.Common
+    '''
+    with __Lock:
+        Pending = __Pending.get(id(Connexion))
+        if Pending is None:
+            return
+        Record, Start, SendEnd = Pending
+        if Record["Wait"] is None:
+            Record["Wait"] = max(First - SendEnd, 0.0)
+        Record["BytesReceived"] += ByteNumber
+        Record["Duration"] = End - Start
+
+
+def __Flush():
+    with __Lock:
+        Pending = [p[0] for p in __Pending.values()]
+        __Pending.clear()
+    for Record in Pending:
+        __Commit(Record)
+
+
+def __Commit(Record):
+    with __Lock:
+        __Records.append(Record)
+        c = __Counters.get(Record["Name"])
+        if c is None:
+            c = {"Count": 0, "BytesSent": 0, "BytesReceived": 0, "TotalTime": 0.0,
+                 "MinTime": Record["Duration"], "MaxTime": 0.0, "TotalWait": 0.0,
+                 "Replies": 0, "Histogram": [0] * (len(HistogramBins) + 1)}
+            __Counters[Record["Name"]] = c
+        c["Count"] += 1
+        c["BytesSent"] += Record["BytesSent"]
+        c["BytesReceived"] += Record["BytesReceived"]
+        c["TotalTime"] += Record["Duration"]
+        c["MinTime"] = min(c["MinTime"], Record["Duration"])
+        c["MaxTime"] = max(c["MaxTime"], Record["Duration"])
+        if Record["Wait"] is not None:
+            c["TotalWait"] += Record["Wait"]
+            c["Replies"] += 1
+        c["Histogram"][bisect_left(HistogramBins, Record["Duration"])] += 1
+
+    for Hook in list(__Hooks):
+        Hook(Record)
@@ -0,0 +1,202 @@
+'''
+Pipelined replay of command files to the Apex equipments
+
+    A command file contains one raw command per line (empty lines and lines
+    starting with '#' are ignored). The commands are sent to an AP2XXX or an
+    AP1000 through the connection of the driver with a pipelining depth: up to
+    Depth queries (commands with a reply) are sent before their replies are
+    read. The latency of a query is the time from its sending to the reception
+    of its reply. The setters have no reply: their time is only the sending time,
+    their execution is accounted by the following query.
+    A command is a query if it contains '?' or if it is an AP2XXX command replying
+    without '?' (SPSWP, SPDATAD, SPMEASDETECTORDBM, CSPSPECTRD..., see
+    AP2XXX_REPLY_MNEMONICS of PyApex.Constantes). A line starting with '<' is a
+    query and a line starting with '>' a command without reply, whatever the
+    command. The replies are paired with the queries by lines (one line per
+    query, the binary traces cannot be replayed). An unexpected reply, received
+    before the last query reply or within 0.1 s after it, raises an ApexError.
+
+        from PyApex import AP2XXX, Pipeline
+
+        MyAP2XXX = AP2XXX("192.168.0.10")
+        Commands = Pipeline.Load("commands.txt")
+        Result = Pipeline.Run(MyAP2XXX, Commands, Depth=8, Repeat=100)
+        print(Pipeline.Format(Result))
+
+    The replay can also be run from the command line:
+        python -m PyApex.Pipeline commands.txt --ip 192.168.0.10 --depth 8 --repeat 100
+
+    This module requires the numpy module installed
+'''
+
+import json
+from collections import deque
+from time import perf_counter
+from PyApex.Constantes import AP2XXX_REPLY_MNEMONICS, APXXXX_ERROR_ARGUMENT_VALUE, \
+     APXXXX_ERROR_COMMUNICATION
+from PyApex.Errors import ApexError
+
+
+def Replies(Command):
+    '''
+    Returns True if the command Command (string) replies one line: the commands
+    containing '?' and the AP2XXX commands of AP2XXX_REPLY_MNEMONICS
+    '''
+    import re
+
+    Mnemonic = re.match(r"[A-Z*]*", Command.strip().upper()).group(0)
+    return "?" in Command or Mnemonic in AP2XXX_REPLY_MNEMONICS
+
+
+def Load(FileName):
+    '''
+    Returns the list of the commands of the command file FileName in tuples
+    (command ended by '\\n', True if the command replies one line)
+    A line starting with '<' replies, a line starting with '>' has no reply, the
+    other lines reply if they are queries (see Replies)
+    '''
+    Commands = []
+    with open(FileName, "r") as File:
+        for Line in File:
+            Line = Line.strip()
+            if Line == "" or Line.startswith("#"):
+                continue
+            if Line[0] in "<>":
+                Commands.append((Line[1:].strip() + "\n", Line[0] == "<"))
+            else:
+                Commands.append((Line + "\n", Replies(Line)))
+    return Commands
+
+
+def Statistics(Latencies):
+    '''
+    Returns a dictionary of the statistics of the latencies Latencies (seconds):
+    count, mean, minimum, percentiles 50, 90, 99 and maximum
+    '''
+    import numpy as np
+
+    Latencies = np.asarray(Latencies, dtype=np.float64)
+    if len(Latencies) == 0:
+        return {"Count": 0, "Unit": "s"}
+    P50, P90, P99 = np.percentile(Latencies, [50.0, 90.0, 99.0])
+    return {"Count": len(Latencies), "Mean": float(Latencies.mean()),
+            "Min": float(Latencies.min()), "P50": float(P50), "P90": float(P90),
+            "P99": float(P99), "Max": float(Latencies.max()), "Unit": "s"}
+
+
+def Run(Equipment, Commands, Depth=1, Repeat=1, Duration=None):
+    '''
+    Sends the commands Commands to Equipment (AP2XXX or AP1000 class)
+    Commands is a list of strings or of tuples (command, True if the command replies)
+    as returned by Load. The reply of a string command is given by Replies.
+    Each query must reply exactly one line, the other commands no reply: an
+    ApexError is raised when more reply lines than queries are received
+    Depth is the maximum number of queries waiting for their replies
+    The list of commands is sent Repeat times, or until Duration seconds have
+    elapsed if Duration is not None
+    Returns a dictionary of results:
+        - "Commands", "Queries": numbers of sent commands and queries
+        - "Time": total time in seconds, "Rate": commands per second
+        - "Latency": statistics of the query latencies (see Statistics)
+        - "PerCommand": statistics of the query latencies of each command
+    '''
+    from socket import timeout
+    from PyApex.Common import Send, Flush, Corked
+
+    if int(Depth) < 1:
+        raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Depth")
+    Commands = [Command if isinstance(Command, tuple) else (Command, Replies(Command))
+                for Command in Commands]
+    Commands = [(Command if Command.endswith("\n") else Command + "\n", bool(Reply))
+                for Command, Reply in Commands]
+    if len(Commands) == 0:
+        raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Commands")
+
+    Connexion = Equipment.Connexion
+    Depth = int(Depth)
+    Pending = deque()
+    Latencies = dict((Command, []) for Command, Reply in Commands if Reply)
+    Buffer = bytearray()
+
+    def Read():
+        if Corked:
+            Flush(Connexion)
+        try:
+            Packet = Connexion.recv(65536)
+        except timeout:
+            raise ApexError(APXXXX_ERROR_COMMUNICATION, "Reply")
+        if not Packet:
+            raise ApexError(APXXXX_ERROR_COMMUNICATION, "Connexion")
+        Now = perf_counter()
+        Buffer.extend(Packet)
+        if Buffer.count(b"\n") > len(Pending):
+            raise ApexError(APXXXX_ERROR_COMMUNICATION, "Unexpected reply")
+        for Line in range(Buffer.count(b"\n")):
+            Command, Sent = Pending.popleft()
+            Latencies[Command].append(Now - Sent)
+        del Buffer[:Buffer.rfind(b"\n") + 1]
+
+    Sent = 0
+    Start = perf_counter()
+    Loop = 0
+    while (Duration is None and Loop < Repeat) or \
+          (Duration is not None and perf_counter() - Start < Duration):
+        for Command, Reply in Commands:
+            if Reply:
+                while len(Pending) >= Depth:
+                    Read()
+                Pending.append((Command, perf_counter()))
+            Send(Connexion, Command)
+            Sent += 1
+        Loop += 1
+    while Pending:
+        Read()
+    Time = perf_counter() - Start
+
+    # The replies to the commands without reply after the last query are also unexpected
+    TimeOut = Connexion.gettimeout()
+    Connexion.settimeout(0.1)
+    try:
+        Buffer.extend(Connexion.recv(65536))
+    except timeout:
+        pass
+    finally:
+        Connexion.settimeout(TimeOut)
+    if Buffer:
+        raise ApexError(APXXXX_ERROR_COMMUNICATION, "Unexpected reply")
+
+    All = [Latency for Values in Latencies.values() for Latency in Values]
+    return {"Commands": Sent, "Queries": len(All), "Depth": Depth, "Time": Time,
+            "Rate": Sent / Time if Time > 0 else 0.0, "Latency": Statistics(All),
+            "PerCommand": dict((Command.strip(), Statistics(Values))
+                               for Command, Values in Latencies.items())}
+
+
+def Format(Result):
+    '''
+    Returns a printable report (string) of the results of Run
+    '''
+    def Line(Name, Stats):
+        if Stats["Count"] == 0:
+            return "%-24s %8d" % (Name, 0)
+        return "%-24s %8d %10.3f %10.3f %10.3f %10.3f" % \
+               (Name[:24], Stats["Count"], Stats["P50"] * 1e3, Stats["P90"] * 1e3,
+                Stats["P99"] * 1e3, Stats["Max"] * 1e3)
+
+    Lines = ["%d commands (%d queries) in %.3f s: %.1f commands/s, depth %d" %
+             (Result["Commands"], Result["Queries"], Result["Time"], Result["Rate"],
+              Result["Depth"]),
+             "%-24s %8s %10s %10s %10s %10s" % ("Query latency (ms)", "Count", "P50", "P90",
+                                                "P99", "Max"),
+             Line("All", Result["Latency"])]
+    for Command, Stats in Result["PerCommand"].items():
+        Lines.append(Line(Command, Stats))
+    return "\n".join(Lines)
+
+
+def Save(Result, FileName):
+    '''
+    Saves the results of Run in the JSON file FileName
+    '''
+    with open(FileName, "w") as File:
+        json.dump(Result, File, indent=2)
@@ -0,0 +1,49 @@
+'''
+Sends a command file to an Apex equipment and measures the throughput
+    python -m PyApex.Pipeline commands.txt --ip 192.168.0.10 --depth 8 --repeat 100
+    python -m PyApex.Pipeline warmup.txt --equipment ap1000 --ip 192.168.0.11 --duration 600
+'''
+
+import argparse
+import sys
+
+
+def main(Arguments=None):
+    from PyApex import Pipeline
+    from PyApex.AP1000 import AP1000
+    from PyApex.AP2XXX import AP2XXX
+
+    Parser = argparse.ArgumentParser(prog="python -m PyApex.Pipeline",
+                                     description="Pipelined replay of a command file")
+    Parser.add_argument("file", help="command file (one command per line, '#' for comments, "
+                             "'<' or '>' before a command with or without reply)")
+    Parser.add_argument("--equipment", choices=["ap2xxx", "ap1000"], default="ap2xxx",
+                        help="type of the equipment (default ap2xxx)")
+    Parser.add_argument("--ip", default="127.0.0.1", help="IP address of the equipment")
+    Parser.add_argument("--port", type=int, default=5900, help="TCP port (default 5900)")
+    Parser.add_argument("--depth", type=int, default=1,
+                        help="maximum number of queries waiting for their replies (default 1)")
+    Parser.add_argument("--repeat", type=int, default=1, help="number of replays of the file")
+    Parser.add_argument("--duration", type=float, default=None,
+                        help="replays the file during this time in s (instead of --repeat)")
+    Parser.add_argument("--timeout", type=float, default=10.0, help="reply timeout in s")
+    Parser.add_argument("--output", default=None, help="JSON file of the results")
+    Args = Parser.parse_args(Arguments)
+
+    Commands = Pipeline.Load(Args.file)
+    Class = AP1000 if Args.equipment == "ap1000" else AP2XXX
+    Equipment = Class(Args.ip, Args.port)
+    Equipment.SetTimeOut(Args.timeout)
+    try:
+        Result = Pipeline.Run(Equipment, Commands, Args.depth, Args.repeat, Args.duration)
+    finally:
+        Equipment.Close()
+
+    print(Pipeline.Format(Result))
+    if Args.output is not None:
+        Pipeline.Save(Result, Args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
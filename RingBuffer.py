@@ -0,0 +1,143 @@
+import threading
+
+import numpy as np
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_VALUE
+from PyApex.Errors import ApexError
+
+
+class RingBuffer():
+    '''
+    DESCRIPTION
+        Fixed-size ring buffer of rows stored in a NumPy array
+        Each row has 'Width' values of type 'DType'. When the buffer is full,
+        the new rows replace the oldest ones. The buffer can be filled by a
+        thread and read by another one.
+        This class requires the numpy module installed
+
+    VERSION
+        1.0
+    '''
+
+    def __init__(self, Size, Width=1, DType=np.float64):
+        '''
+        Constructor of a ring buffer
+        Size is the maximum number of rows (integer)
+        Width is the number of values of each row (integer)
+        DType is the NumPy type of the values (float64 by default)
+        '''
+
+        if int(Size) <= 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Size")
+        if int(Width) <= 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Width")
+
+        self.__Data = np.zeros((int(Size), int(Width)), dtype=DType)
+        self.__Size = int(Size)
+        self.__Index = 0
+        self.__Count = 0
+        self.__Lock = threading.Lock()
+
+
+    def __len__(self):
+        return min(self.__Count, self.__Size)
+
+
+    def GetSize(self):
+        '''
+        Returns the maximum number of rows of the buffer
+        '''
+        return self.__Size
+
+
+    def GetWidth(self):
+        '''
+        Returns the number of values of each row
+        '''
+        return self.__Data.shape[1]
+
+
+    def GetCount(self):
+        '''
+        Returns the total number of rows written in the buffer since its creation
+        or its last clear (including the overwritten rows)
+        '''
+        return self.__Count
+
+
+    def Clear(self):
+        '''
+        Removes all the rows of the buffer
+        '''
+        with self.__Lock:
+            self.__Index = 0
+            self.__Count = 0
+
+
+    def Append(self, Row):
+        '''
+        Adds a row at the end of the buffer
+        Row is a sequence of 'Width' values
+        '''
+        with self.__Lock:
+            self.__Data[self.__Index] = Row
+            self.__Index = (self.__Index + 1) % self.__Size
+            self.__Count += 1
+
+
+    def Extend(self, Rows):
+        '''
+        Adds several rows at the end of the buffer
+        Rows is an array of shape (N, Width)
+        '''
+        Rows = np.asarray(Rows, dtype=self.__Data.dtype).reshape(-1, self.__Data.shape[1])
+        Number = len(Rows)
+        if Number == 0:
+            return
+
+        with self.__Lock:
+            self.__Count += Number
+            if Number >= self.__Size:
+                self.__Data[:] = Rows[-self.__Size:]
+                self.__Index = 0
+                return
+            First = min(Number, self.__Size - self.__Index)
+            self.__Data[self.__Index:self.__Index + First] = Rows[:First]
+            self.__Data[:Number - First] = Rows[First:]
+            self.__Index = (self.__Index + Number) % self.__Size
+
+
+    def GetData(self, Number=None):
+        '''
+        Returns a copy of the last 'Number' rows (all the rows if Number is None),
+        from the oldest to the newest, in an array of shape (N, Width)
+        '''
+        with self.__Lock:
+            Available = min(self.__Count, self.__Size)
+            if Number is None or Number > Available:
+                Number = Available
+            Start = (self.__Index - Number) % self.__Size
+            if Start + Number <= self.__Size:
+                return self.__Data[Start:Start + Number].copy()
+            return np.concatenate((self.__Data[Start:], self.__Data[:self.__Index]))
+
+
+    def GetLatest(self):
+        '''
+        Returns a copy of the last row or None if the buffer is empty
+        '''
+        with self.__Lock:
+            if self.__Count == 0:
+                return None
+            return self.__Data[(self.__Index - 1) % self.__Size].copy()
+
+
+    def GetOldest(self):
+        '''
+        Returns a copy of the oldest row or None if the buffer is empty
+        '''
+        with self.__Lock:
+            if self.__Count == 0:
+                return None
+            if self.__Count < self.__Size:
+                return self.__Data[0].copy()
+            return self.__Data[self.__Index].copy()
@@ -0,0 +1,276 @@
+from PyApex.Common import Send, ReceiveLines, Cork, Flush, Uncork
+from time import perf_counter, sleep
+from math import nan
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
+from PyApex.Errors import ApexError
+
+
+class Scan():
+    '''
+    DESCRIPTION
+        N-dimensional step and measure scan engine
+        Each axis is a list of values and a setter. Each measure is a getter.
+        At each step of the grid, the setters of the changed axes are called,
+        the settle time of these axes is waited and all the getters are read.
+        Setters and getters can be:
+            - methods of the AP1000 and AP2XXX modules, for example
+              MyAttenuator.SetAttenuation or MyPowerMeter.GetPower
+            - commands: a setter command contains '{}' replaced by the value
+              (for example "ATT[03]:DB[0]{:.1f}\\n") and a getter command is a query
+              (for example "POW[01]:DBM[1]?\\n")
+        The commands of a step are pipelined: the setters of the changed axes and
+        the following query are sent in one write, and all the getter commands are
+        sent at once and read in one exchange.
+        The results are stored in a NumPy grid of shape (axis 1 size, ...,
+        axis N size, number of measures). If a file name is given, the grid is a
+        .npy file mapped in memory and flushed periodically with the progress of the
+        scan (in the file name + ".json"), so that an interrupted scan can be resumed.
+        This class requires the numpy module installed
+
+    VERSION
+        1.0
+    '''
+
+    def __init__(self, Equipment=None, FileName=None, FlushInterval=1.0, Simulation=False):
+        '''
+        Constructor of a scan.
+        Equipment is the AP1000 or AP2XXX class used for the commands (optional if the
+        setters and getters are methods)
+        FileName is the optional .npy file of the results
+        FlushInterval is the time in seconds between the flushes of the results on the disk
+        Simulation is a boolean to indicate to the program if it has to run in simulation mode or not
+        '''
+        self.__Connexion = Equipment.Connexion if Equipment is not None else None
+        self.__Simulation = Simulation
+        self.__FileName = FileName
+        self.__FlushInterval = float(FlushInterval)
+        self.__Axes = []
+        self.__Measures = []
+        self.__Data = None
+        self.__Done = 0
+        self.__Running = False
+
+
+    def __str__(self):
+        '''
+        Return the scan description when the 'print()' function is used
+        '''
+        return "Scan of " + str(len(self.__Measures)) + " measures on the grid " + \
+               str(self.GetShape())
+
+
+    def AddAxis(self, Name, Values, Setter, Settle=0.0):
+        '''
+        Adds an axis to the scan. The first axis is the slowest one
+        Name is the name of the axis
+        Values is the list of the values of the axis
+        Setter is a function called with a value or a command containing '{}'
+        Settle is the time in seconds to wait after a change of this axis
+        '''
+        import numpy as np
+
+        if not callable(Setter) and not isinstance(Setter, str):
+            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Setter")
+        if isinstance(Setter, str) and self.__Connexion is None:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Equipment")
+        Values = np.asarray(Values, dtype=np.float64).ravel()
+        if len(Values) == 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Values")
+        if Settle < 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Settle")
+
+        self.__Axes.append((str(Name), Values, Setter, float(Settle)))
+        self.__Data = None
+
+
+    def AddMeasure(self, Name, Getter):
+        '''
+        Adds a measure to the scan
+        Name is the name of the measure
+        Getter is a function returning a number or a query command
+        '''
+
+        if not callable(Getter) and not isinstance(Getter, str):
+            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, "Getter")
+        if isinstance(Getter, str) and self.__Connexion is None:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Equipment")
+
+        self.__Measures.append((str(Name), Getter))
+        self.__Data = None
+
+
+    def GetShape(self):
+        '''
+        Returns the shape of the results grid
+        (axis 1 size, ..., axis N size, number of measures)
+        '''
+        return tuple(len(Axis[1]) for Axis in self.__Axes) + (len(self.__Measures),)
+
+
+    def GetAxes(self):
+        '''
+        Returns a dictionary of the axes values {name: NumPy array}
+        '''
+        return dict((Axis[0], Axis[1].copy()) for Axis in self.__Axes)
+
+
+    def GetMeasures(self):
+        '''
+        Returns the list of the names of the measures (last dimension of the results)
+        '''
+        return [Measure[0] for Measure in self.__Measures]
+
+
+    def GetProgress(self):
+        '''
+        Returns the tuple (number of done steps, total number of steps)
+        '''
+        Total = 1
+        for Axis in self.__Axes:
+            Total *= len(Axis[1])
+        return self.__Done, Total
+
+
+    def GetData(self):
+        '''
+        Returns the results grid (NaN for the steps not done yet)
+        '''
+        return self.__Data
+
+
+    def Stop(self):
+        '''
+        Stops a running scan (from another thread) after the current step
+        The scan can be continued with Run(Resume=True)
+        '''
+        self.__Running = False
+
+
+    def __Description(self):
+        return {"Axes": [[Axis[0], Axis[1].tolist()] for Axis in self.__Axes],
+                "Measures": self.GetMeasures(), "Done": self.__Done}
+
+
+    def __Open(self, Resume):
+        import json
+        import os
+        import numpy as np
+
+        Shape = self.GetShape()
+        if self.__FileName is None:
+            if not Resume or self.__Data is None:
+                self.__Data = np.full(Shape, nan)
+                self.__Done = 0
+            return
+
+        Progress = self.__FileName + ".json"
+        if Resume and os.path.isfile(self.__FileName) and os.path.isfile(Progress):
+            with open(Progress, "r") as File:
+                Description = json.load(File)
+            self.__Done = int(Description["Done"])
+            Description["Done"] = self.__Done
+            if Description != self.__Description():
+                raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "FileName")
+            self.__Data = np.lib.format.open_memmap(self.__FileName, mode="r+")
+            if self.__Data.shape != Shape:
+                raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "FileName")
+        else:
+            self.__Done = 0
+            self.__Data = np.lib.format.open_memmap(self.__FileName, mode="w+",
+                                                    dtype=np.float64, shape=Shape)
+            self.__Data[...] = nan
+        self.__Save()
+
+
+    def __Save(self):
+        import json
+        import os
+
+        if self.__FileName is None:
+            return
+        self.__Data.flush()
+        Progress = self.__FileName + ".json"
+        with open(Progress + ".tmp", "w") as File:
+            json.dump(self.__Description(), File)
+        os.replace(Progress + ".tmp", Progress)
+
+
+    def __Step(self, Index, Previous):
+        from random import random
+
+        Settle = 0.0
+        for Axis, (Name, Values, Setter, AxisSettle) in enumerate(self.__Axes):
+            if Previous is not None and Previous[Axis] == Index[Axis]:
+                continue
+            Value = Values[Index[Axis]]
+            if callable(Setter):
+                Setter(Value)
+            elif not self.__Simulation:
+                Send(self.__Connexion, Setter.format(Value))
+            Settle = max(Settle, AxisSettle)
+
+        if Settle > 0:
+            if self.__Connexion is not None:
+                Flush(self.__Connexion)
+            sleep(Settle)
+
+        Results = [nan] * len(self.__Measures)
+        Queries = [(i, Measure[1]) for i, Measure in enumerate(self.__Measures)
+                   if isinstance(Measure[1], str)]
+        if Queries:
+            if self.__Simulation:
+                Replies = [str(random()) for Query in Queries]
+            else:
+                Send(self.__Connexion, "".join(Query[1] for Query in Queries))
+                Replies = ReceiveLines(self.__Connexion, len(Queries))
+            for (i, Query), Reply in zip(Queries, Replies):
+                try:
+                    Results[i] = float(Reply)
+                except:
+                    pass
+        for i, (Name, Getter) in enumerate(self.__Measures):
+            if callable(Getter):
+                try:
+                    Results[i] = float(Getter())
+                except (TypeError, ValueError):
+                    pass
+        return Results
+
+
+    def Run(self, Resume=False):
+        '''
+        Runs the scan and returns the results grid of shape (axis 1 size, ...,
+        axis N size, number of measures)
+        If Resume is True, the scan continues from the last saved step (from the file
+        if a file name is given)
+        '''
+        import numpy as np
+
+        if len(self.__Axes) == 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Axes")
+        if len(self.__Measures) == 0:
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, "Measures")
+
+        self.__Open(Resume)
+        Shape = self.GetShape()[:-1]
+        Total = self.GetProgress()[1]
+        Previous = None
+        LastFlush = perf_counter()
+        self.__Running = True
+        if self.__Connexion is not None:
+            Cork(self.__Connexion)
+        try:
+            while self.__Running and self.__Done < Total:
+                Index = np.unravel_index(self.__Done, Shape)
+                self.__Data[Index] = self.__Step(Index, Previous)
+                Previous = Index
+                self.__Done += 1
+                if perf_counter() - LastFlush >= self.__FlushInterval:
+                    self.__Save()
+                    LastFlush = perf_counter()
+        finally:
+            self.__Running = False
+            if self.__Connexion is not None:
+                Uncork(self.__Connexion)
+            self.__Save()
+        return self.__Data
@@ -0,0 +1,216 @@
+'''
+Table-driven command layer of the Apex drivers
+
+    The simple setters and getters of a driver are described by a command table
+    (see AP2XXX_TLS_COMMANDS in PyApex.Constantes). Each entry of a table is a tuple:
+        (name, mnemonic, type, minimum, maximum, default, description,
+         setter name, getter name, argument name)
+    The type is float, int or bool (any integer is accepted, sent as 1 or 0). The
+    setter sends mnemonic + value and the getter sends the query mnemonic + '?' and
+    parses the reply with the type. The setter and getter names are by default
+    "Set" + name and "Get" + name. A name set to False is not generated. The argument
+    name is the name of the value in the signature of the setter (by default the
+    name), so that the value can also be given by keyword.
+
+    Generate(Class, Table) adds to the driver class the accessors of the table. The
+    command strings and the checks of each accessor are prepared once, when the
+    class is generated. The class also gets the methods:
+        - GetValues(*Names): queries several values in one exchange (pipelined)
+        - SetValues(**Values): sends several values in one write
+        - SetCache(Enable) and ClearCache(): when the cache is enabled, the getters
+          return the last value set or read without any communication
+    In simulation mode, the getters return the last value set or the default value
+    of the table. The default values also initialize the emulators (see Defaults).
+
+    The driver class must have the private attributes __Connexion and __Simulation
+    and call Schema.Init(self, Class) in its constructor.
+'''
+
+from PyApex.Common import Send, ReceiveLines
+from PyApex.Constantes import APXXXX_ERROR_ARGUMENT_TYPE, APXXXX_ERROR_ARGUMENT_VALUE
+from PyApex.Errors import ApexError
+
+
+def Entries(Table):
+    '''
+    Returns the list of the entries of the command table Table as dictionaries
+    '''
+    Keys = ["Name", "Mnemonic", "Type", "Minimum", "Maximum", "Default", "Description",
+            "Setter", "Getter", "Argument"]
+    Result = []
+    for Entry in Table:
+        Entry = dict(zip(Keys, Entry))
+        if Entry.get("Argument") is None:
+            Entry["Argument"] = Entry["Name"]
+        if not Entry["Argument"].isidentifier():
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, Entry["Name"])
+        if Entry["Setter"] is None:
+            Entry["Setter"] = "Set" + Entry["Name"]
+        if Entry["Getter"] is None:
+            Entry["Getter"] = "Get" + Entry["Name"]
+        if Entry["Type"] is bool:
+            Entry["Format"] = lambda Value: str(int(Value))
+            Entry["Parse"] = lambda Reply: bool(int(Reply))
+        else:
+            Entry["Format"] = str
+            Entry["Parse"] = Entry["Type"]
+        Result.append(Entry)
+    return Result
+
+
+def Defaults(Table):
+    '''
+    Returns the dictionary {mnemonic: default value (string)} of the command table Table
+    '''
+    return dict((Entry["Mnemonic"], Entry["Format"](Entry["Default"])) for Entry in Entries(Table)
+                if Entry["Default"] is not None)
+
+
+def Init(Driver, Class):
+    '''
+    Initializes the values and the cache of the accessors generated for Class in the
+    driver object Driver
+    '''
+    Prefix = "_" + Class.__name__.lstrip("_") + "__"
+    setattr(Driver, Prefix + "Values", {})
+    setattr(Driver, Prefix + "Cache", False)
+
+
+def __Check(Entry):
+    Name = Entry["Name"]
+    Type = Entry["Type"]
+    Types = (int, float) if Type is float else int
+    Minimum = Entry["Minimum"]
+    Maximum = Entry["Maximum"]
+
+    def Check(Value):
+        if not isinstance(Value, Types) or (isinstance(Value, bool) and Type is not bool):
+            raise ApexError(APXXXX_ERROR_ARGUMENT_TYPE, Name)
+        Value = Type(Value)
+        if (Minimum is not None and Value < Minimum) or (Maximum is not None and Value > Maximum):
+            raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, Name)
+        return Value
+
+    return Check
+
+
+def __Setter(Entry, Check, Connexion, Simulation, Values):
+    Name = Entry["Name"]
+    Mnemonic = Entry["Mnemonic"]
+    Format = Entry["Format"]
+    Argument = Entry["Argument"]
+
+    def Set(self, Value):
+        Value = Check(Value)
+        if not getattr(self, Simulation):
+            Send(getattr(self, Connexion), Mnemonic + Format(Value) + "\n")
+        getattr(self, Values)[Name] = Value
+
+    # The setter is compiled with the argument name of the table (keyword callers)
+    Namespace = {"Set": Set}
+    exec("def Setter(self, %s):\n    Set(self, %s)\n" % (Argument, Argument), Namespace)
+    Setter = Namespace["Setter"]
+    Setter.__name__ = Entry["Setter"]
+    Setter.__doc__ = "\n        Set the " + Entry["Description"] + "\n        "
+    return Setter
+
+
+def __Getter(Entry, Connexion, Simulation, Values, Cache):
+    Name = Entry["Name"]
+    Query = Entry["Mnemonic"] + "?\n"
+    Parse = Entry["Parse"]
+    Default = Entry["Default"]
+
+    def Getter(self):
+        Known = getattr(self, Values)
+        if getattr(self, Simulation):
+            return Known.get(Name, Default)
+        if getattr(self, Cache) and Name in Known:
+            return Known[Name]
+        Send(getattr(self, Connexion), Query)
+        Value = Parse(ReceiveLines(getattr(self, Connexion), 1)[0])
+        Known[Name] = Value
+        return Value
+
+    Getter.__name__ = Entry["Getter"]
+    Getter.__doc__ = "\n        Get the " + Entry["Description"] + "\n        "
+    return Getter
+
+
+def Generate(Class, Table):
+    '''
+    Adds to the driver class Class the accessors of the command table Table and the
+    methods GetValues, SetValues, SetCache and ClearCache
+    '''
+    Prefix = "_" + Class.__name__.lstrip("_") + "__"
+    Connexion = Prefix + "Connexion"
+    Simulation = Prefix + "Simulation"
+    Values = Prefix + "Values"
+    Cache = Prefix + "Cache"
+    Commands = dict((Entry["Name"], Entry) for Entry in Entries(Table))
+    Checks = {}
+    Methods = []
+
+    for Name, Entry in Commands.items():
+        if Entry["Setter"] is not False:
+            Checks[Name] = __Check(Entry)
+            Methods.append(__Setter(Entry, Checks[Name], Connexion, Simulation, Values))
+        if Entry["Getter"] is not False:
+            Methods.append(__Getter(Entry, Connexion, Simulation, Values, Cache))
+
+    def GetValues(self, *Names):
+        '''
+        Returns a dictionary of the values of the commands Names (for example
+        GetValues("StartWL", "StopWL")). All the queries are sent at once and their
+        replies are read in one exchange
+        '''
+        for Name in Names:
+            if Name not in Commands or Commands[Name]["Getter"] is False:
+                raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, Name)
+        Known = getattr(self, Values)
+        if getattr(self, Simulation):
+            return dict((Name, Known.get(Name, Commands[Name]["Default"])) for Name in Names)
+
+        Queries = [Name for Name in Names if not (getattr(self, Cache) and Name in Known)]
+        if Queries:
+            Send(getattr(self, Connexion), "".join(Commands[Name]["Mnemonic"] + "?\n"
+                                                   for Name in Queries))
+            Replies = ReceiveLines(getattr(self, Connexion), len(Queries))
+            for Name, Reply in zip(Queries, Replies):
+                Known[Name] = Commands[Name]["Parse"](Reply)
+        return dict((Name, Known[Name]) for Name in Names)
+
+    def SetValues(self, **Arguments):
+        '''
+        Sets the values of several commands (for example SetValues(StartWL=1530.0,
+        StopWL=1560.0)). All the values are checked before the commands are sent
+        in one write
+        '''
+        for Name in Arguments:
+            if Name not in Checks:
+                raise ApexError(APXXXX_ERROR_ARGUMENT_VALUE, Name)
+        Arguments = dict((Name, Checks[Name](Value)) for Name, Value in Arguments.items())
+        if not getattr(self, Simulation) and Arguments:
+            Send(getattr(self, Connexion), "".join(Commands[Name]["Mnemonic"] +
+                                                   Commands[Name]["Format"](Value) + "\n"
+                                                   for Name, Value in Arguments.items()))
+        getattr(self, Values).update(Arguments)
+
+    def SetCache(self, Enable=True):
+        '''
+        Enables or disables the cache of the values. When the cache is enabled, the
+        getters return the last value set or read without any communication
+        '''
+        setattr(self, Cache, bool(Enable))
+
+    def ClearCache(self):
+        '''
+        Forgets the values set or read, so that the next getters query the equipment
+        '''
+        getattr(self, Values).clear()
+
+    for Method in Methods + [GetValues, SetValues, SetCache, ClearCache]:
+        Method.__qualname__ = Class.__qualname__ + "." + Method.__name__
+        Method.__module__ = Class.__module__
+        setattr(Class, Method.__name__, Method)
+    return Class
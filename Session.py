@@ -0,0 +1,236 @@
+'''
+Wire-level record and replay of the sessions with the Apex equipments
+
+    RecordingConnexion wraps the socket of an equipment and writes every sent
+    command and every received reply, with its date, in a binary log file.
+    ReplayConnexion reads a log file and behaves like the socket of the
+    equipment: the drivers get the recorded replies at the original speed or
+    faster, without any equipment.
+
+        MyAP2XXX = AP2XXX("192.168.0.10", Record="session.log")
+        ...
+        MyAP2XXX.Close()
+
+        MyAP2XXX = AP2XXX("192.168.0.10", Replay="session.log", ReplaySpeed=10.0)
+
+    Log file format (little endian):
+        - header: b"PYAPEXSESSION" followed by the version (1 byte)
+        - entries: type (1 byte), time in seconds since the beginning of the
+          session (double), size of the data (unsigned int 32 bits), data
+    The entry types are SEND, RECEIVE, TIMEOUT (reception timeout) and CLOSE
+'''
+
+import struct
+import socket
+from time import perf_counter, sleep
+from PyApex.Constantes import APXXXX_ERROR_BAD_FILENAME, APXXXX_ERROR_REPLAY
+from PyApex.Errors import ApexError
+
+SEND = 0
+RECEIVE = 1
+TIMEOUT = 2
+CLOSE = 3
+
+LOG_HEADER = b"PYAPEXSESSION"
+LOG_VERSION = 1
+LOG_ENTRY = struct.Struct("<BdI")
+
+
+def ReadLog(FileName):
+    '''
+    Reads a session log file
+    Returns a list of entries (type, time, data) where time is expressed in
+    seconds since the beginning of the session and data is a bytes string
+    '''
+
+    Entries = []
+    with open(FileName, "rb") as File:
+        Content = File.read()
+
+    if not Content.startswith(LOG_HEADER) or len(Content) <= len(LOG_HEADER):
+        raise ApexError(APXXXX_ERROR_BAD_FILENAME, FileName)
+
+    Index = len(LOG_HEADER) + 1
+    while Index + LOG_ENTRY.size <= len(Content):
+        Type, Time, Size = LOG_ENTRY.unpack_from(Content, Index)
+        Index += LOG_ENTRY.size
+        Entries.append((Type, Time, bytes(Content[Index:Index + Size])))
+        Index += Size
+    return Entries
+
+
+class RecordingConnexion():
+    '''
+    DESCRIPTION
+        Socket wrapper writing every command and reply in a session log file
+        It is installed by the 'Record' argument of the AP2XXX and AP1000
+        constructors
+
+    VERSION
+        1.0
+    '''
+
+    def __init__(self, Connexion, FileName):
+        '''
+        Constructor of a recording connection
+        Connexion is the connected socket of the equipment
+        FileName is the path of the session log file
+        '''
+        self.__Connexion = Connexion
+        self.__File = open(FileName, "wb")
+        self.__File.write(LOG_HEADER + bytes([LOG_VERSION]))
+        self.__Start = perf_counter()
+
+
+    def __Write(self, Type, Data=b""):
+        self.__File.write(LOG_ENTRY.pack(Type, perf_counter() - self.__Start, len(Data)))
+        self.__File.write(Data)
+
+
+    def send(self, Data):
+        Sent = self.__Connexion.send(Data)
+        self.__Write(SEND, bytes(Data[:Sent]))
+        return Sent
+
+
+    def sendall(self, Data):
+        self.__Connexion.sendall(Data)
+        self.__Write(SEND, bytes(Data))
+
+
+    def recv(self, ByteNumber):
+        try:
+            Data = self.__Connexion.recv(ByteNumber)
+        except socket.timeout:
+            self.__Write(TIMEOUT)
+            raise
+        self.__Write(RECEIVE, Data)
+        return Data
+
+
+    def close(self):
+        if not self.__File.closed:
+            self.__Write(CLOSE)
+            self.__File.close()
+        self.__Connexion.close()
+
+
+    def settimeout(self, TimeOut):
+        self.__Connexion.settimeout(TimeOut)
+
+
+    def gettimeout(self):
+        return self.__Connexion.gettimeout()
+
+
+    def getsockname(self):
+        return self.__Connexion.getsockname()
+
+
+    def fileno(self):
+        return self.__Connexion.fileno()
+
+
+class ReplayConnexion():
+    '''
+    DESCRIPTION
+        Socket-like object feeding the drivers with the replies of a session log file
+        The commands sent by the drivers are compared with the recorded commands.
+        Each reply is given after the recorded delay from its command divided by
+        Speed, so that the timings of the equipment are reproduced.
+        It is installed by the 'Replay' argument of the AP2XXX and AP1000
+        constructors
+
+    VERSION
+        1.0
+    '''
+
+    def __init__(self, FileName, Speed=1.0, Check=True):
+        '''
+        Constructor of a replay connection
+        FileName is the path of the session log file
+        Speed is the replay speed factor (1.0 for the original speed). If Speed
+        is 0 or None, the replies are given without any delay
+        Check is a boolean. If True, a command different from the recorded one
+        raises an error
+        '''
+        self.__Entries = [e for e in ReadLog(FileName) if e[0] != CLOSE]
+        self.__Index = 0
+        self.__Speed = Speed
+        self.__Check = Check
+        self.__Buffer = b""
+        self.__TimeOut = None
+        self.__SendTime = (0.0, perf_counter())
+
+
+    def __Wait(self, Time):
+        if not self.__Speed:
+            return
+        Delay = self.__SendTime[1] + (Time - self.__SendTime[0]) / self.__Speed - perf_counter()
+        if Delay > 0:
+            sleep(Delay)
+
+
+    def send(self, Data):
+        Data = bytes(Data)
+        while self.__Index < len(self.__Entries) and self.__Entries[self.__Index][0] != SEND:
+            self.__Index += 1
+
+        Command = b""
+        Time = None
+        while len(Command) < len(Data) and self.__Index < len(self.__Entries) and \
+              self.__Entries[self.__Index][0] == SEND:
+            Time = self.__Entries[self.__Index][1]
+            Command += self.__Entries[self.__Index][2]
+            self.__Index += 1
+
+        if self.__Check and Command != Data:
+            raise ApexError(APXXXX_ERROR_REPLAY, Data.decode("utf-8", "replace").strip())
+        if Time is not None:
+            self.__SendTime = (Time, perf_counter())
+        self.__Buffer = b""
+        return len(Data)
+
+
+    def sendall(self, Data):
+        self.send(Data)
+
+
+    def recv(self, ByteNumber):
+        if not self.__Buffer:
+            if self.__Index >= len(self.__Entries) or self.__Entries[self.__Index][0] == SEND:
+                raise socket.timeout("no recorded reply")
+            Type, Time, Data = self.__Entries[self.__Index]
+            self.__Index += 1
+            self.__Wait(Time)
+            if Type == TIMEOUT:
+                raise socket.timeout("recorded timeout")
+            self.__Buffer = Data
+
+        Data = self.__Buffer[:ByteNumber]
+        self.__Buffer = self.__Buffer[ByteNumber:]
+        return Data
+
+
+    def close(self):
+        pass
+
+
+    def settimeout(self, TimeOut):
+        self.__TimeOut = TimeOut
+
+
+    def gettimeout(self):
+        return self.__TimeOut
+
+
+    def getsockname(self):
+        return ("replay", 0)
+
+
+    def GetProgress(self):
+        '''
+        Returns the number of replayed entries and the total number of entries
+        '''
+        return self.__Index, len(self.__Entries)
+
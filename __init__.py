@@ -21,27 +21,83 @@ Python 3 package for controlling Apex Technologies equipments
     PyApex.Etuve allows to control a XU Thermal Etuve via RS232 protocol
     this class requires PySerial module installed
     "help(PyApex.Etuve)" for more details
+
+    PyApex.Emulator allows to emulate AP2XXX and AP1000 equipments on a local
+    TCP port for testing and benchmarking the drivers without any equipment
+    this module requires numpy module installed
+    "help(PyApex.Emulator)" for more details
+
+    PyApex.Benchmark measures the transport and data paths of the drivers
+    against the emulators and saves the results in a JSON file
+    "help(PyApex.Benchmark)" for more details
+
+    PyApex.Instrumentation records the name, the sizes and the durations of
+    the commands sent to the equipments and gives their statistics
+    "help(PyApex.Instrumentation)" for more details
+
+    PyApex.Session records the sessions with the AP2XXX and AP1000 equipments
+    in a binary log file and replays them without any equipment
+    "help(PyApex.Session)" for more details
 '''
 
-from PyApex.AP1000 import AP1000
-from PyApex.AP2XXX import AP2XXX
-from PyApex.Console import Terminal
-try:
-    from PyApex.AB3510 import AB3510
-    from PyApex.AB3380 import AB3380
-    __UsbModule = True
-except ImportError:
-    __UsbModule = False
-try:
-    from PyApex.Etuve import Etuve
-    __SerialModule = True
-except ImportError:
-    __SerialModule = False
-
-from PyApex.Constantes import Celerity
+import sys
+from types import ModuleType
+
+# Attributes of the package loaded on their first use: name -> (module, attribute)
+# The subpackages are imported only when one of their classes is used, so that
+# 'from PyApex import AP2XXX' does not import the USB, serial and terminal modules
+__Exports = {"AP1000": ("PyApex.AP1000", "AP1000"),
+             "AP2XXX": ("PyApex.AP2XXX", "AP2XXX"),
+             "Terminal": ("PyApex.Console", "Terminal"),
+             "AB3510": ("PyApex.AB3510", "AB3510"),
+             "AB3380": ("PyApex.AB3380", "AB3380"),
+             "Etuve": ("PyApex.Etuve", "Etuve"),
+             "Celerity": ("PyApex.Constantes", "Celerity")}
+
+
+def __getattr__(Name):
+    '''
+    Loads the attribute Name of the package on its first use
+    '''
+    from importlib import import_module
+
+    if Name not in __Exports:
+        raise AttributeError("module 'PyApex' has no attribute '" + Name + "'")
+    Module, Attribute = __Exports[Name]
+    try:
+        Value = getattr(import_module(Module), Attribute)
+    except ImportError as Error:
+        raise AttributeError("PyApex." + Name + " requires the module '" +
+                             str(Error.name) + "' installed") from Error
+    globals()[Name] = Value
+    return Value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__Exports))
+
+
+class __Package(ModuleType):
+    '''
+    Module class of the PyApex package
+    When a subpackage is imported (for example by 'import PyApex.AP2XXX.sweep'),
+    Python binds it to the attribute of the package which has its name. For the
+    subpackages named as their class, the class is bound instead, as if the
+    package had imported it
+    '''
+
+    def __setattr__(self, Name, Value):
+        Export = self.Exports.get(Name)
+        if Export is not None and isinstance(Value, ModuleType) and Value.__name__ == Export[0]:
+            Value = getattr(Value, Export[1], Value)
+        ModuleType.__setattr__(self, Name, Value)
+
+
+__Package.Exports = __Exports
+sys.modules[__name__].__class__ = __Package
 
 __Version = 1.01
-__PythonVersion = 3.4
+__PythonVersion = 3.7
 
 __ExpertMode = True
 
@@ -88,14 +144,15 @@ def GetModule(ModName):
     '''
     Gets the installed modules.
     ModName is a string:
-        - "usb":      returns True if the usb module has been
-                      imported, False otherwise
-        - "serial" :  returns True if the serial module has been
-                      imported, False otherwise
+        - "usb":      returns True if the usb module is
+                      installed, False otherwise
+        - "serial" :  returns True if the serial module is
+                      installed, False otherwise
     '''
+    from importlib.util import find_spec
+
     if isinstance(ModName, str):
         if ModName.lower() == "usb":
-            return __UsbModule
+            return find_spec("usb") is not None
         elif ModName.lower() == "serial":
-            return __SerialModule
-
+            return find_spec("serial") is not None